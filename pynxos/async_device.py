@@ -0,0 +1,158 @@
+import asyncio
+import time
+
+import aiohttp
+
+from .base_device import BaseDevice
+from .lib.async_rpc_client import AsyncRPCClient
+from .lib.rpc_client import chunk_commands
+from pynxos.errors import NXOSError, ReloadTimeoutError
+
+
+class AsyncDevice(BaseDevice):
+    """An asyncio twin of ``Device`` for ``show``, ``show_list``,
+    ``config``, ``config_list``, ``facts``, ``reboot`` and ``wait_for_reload``.
+
+    Command error checking and output parsing are shared with ``Device``
+    through ``BaseDevice``. Use it as an async context manager, or await
+    ``close()``, to release the underlying HTTP session.
+    """
+    def __init__(self, host, username, password, transport=u'http', port=None, timeout=30, verify=True,
+                 max_concurrency=4, keep_alive=True, max_commands=None, max_bytes=None):
+        self.host = host
+        self.username = username
+        self.password = password
+        self.transport = transport
+        self.timeout = timeout
+        self.verify = verify
+        self.max_commands = max_commands
+        self.max_bytes = max_bytes
+
+        self.rpc = AsyncRPCClient(host, username, password, transport=transport, port=port, verify=verify,
+                                  max_concurrency=max_concurrency, keep_alive=keep_alive)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        await self.rpc.close()
+
+    async def _cli_command(self, commands, method=u'cli', timeout=None, raw_responses=False):
+        if not isinstance(commands, list):
+            commands = [commands]
+        if timeout is None:
+            timeout = self.timeout
+
+        text_response_list = []
+        for chunk in chunk_commands(commands, method, self.max_commands, self.max_bytes):
+            rpc_response = await self.rpc.send_request(chunk, method=method, timeout=timeout)
+            if raw_responses:
+                text_response_list.extend(rpc_response)
+            else:
+                text_response_list.extend(self._process_cli_response(rpc_response))
+
+        return text_response_list
+
+    def _invalidate_cache(self):
+        # There is no response cache or feature state here; cached facts
+        # are the only state that ``Device._invalidate_cache`` also clears.
+        if hasattr(self, '_facts'):
+            del self._facts
+
+    async def show(self, command, raw_text=False, timeout=None):
+        """Send a non-configuration command. See ``Device.show``.
+        """
+        list_result = await self.show_list([command], raw_text, timeout=timeout)
+        if list_result:
+            return list_result[0]
+        else:
+            return {}
+
+    async def show_list(self, commands, raw_text=False, timeout=None):
+        """Send a list of non-configuration commands. See ``Device.show_list``.
+        """
+        if raw_text:
+            response_list = await self._cli_command(commands, method=u'cli_ascii', timeout=timeout)
+        else:
+            response_list = await self._cli_command(commands, timeout=timeout)
+
+        return self._show_output_list(response_list, raw_text)
+
+    async def config(self, command):
+        """Send a configuration command. See ``Device.config``.
+        """
+        list_result = await self.config_list([command])
+        return list_result[0]
+
+    async def config_list(self, commands):
+        """Send a list of configuration commands. See ``Device.config_list``.
+        """
+        self._invalidate_cache()
+        try:
+            return await self._cli_command(commands)
+        finally:
+            self._invalidate_cache()
+
+    async def facts(self, fields=None):
+        """Return a dictionary of facts about the device. See ``Device.get_facts``.
+        """
+        if hasattr(self, '_facts'):
+            self._facts_commands(fields)
+            return self._select_facts(self._facts, fields)
+
+        commands = self._facts_commands(fields)
+        rpc_response = []
+        if commands:
+            rpc_response = await self._cli_command(commands, raw_responses=True)
+
+        facts = self._facts_from_response(rpc_response)
+        if fields is None:
+            self._facts = facts
+
+        return self._select_facts(facts, fields)
+
+    async def reboot(self, confirm=False, wait_for_reload=False, request_timeout=5, reload_timeout=900):
+        """Reboot the device. See ``Device.reboot``.
+        """
+        if not confirm:
+            print('Need to confirm reboot with confirm=True')
+            return
+
+        self._invalidate_cache()
+        await self.show('terminal dont-ask')
+
+        reload_start = time.time()
+        try:
+            await self.show('reload', timeout=request_timeout)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass
+        await self.rpc.close()
+
+        if wait_for_reload:
+            await self.wait_for_reload(since=reload_start, timeout=reload_timeout)
+
+    async def wait_for_reload(self, since=None, timeout=900, interval=5, max_interval=60, backoff=2,
+                              request_timeout=10):
+        """Poll NX-API until the device has reloaded and answers again. See ``Device.wait_for_reload``.
+        """
+        if since is None:
+            since = time.time()
+        deadline = time.time() + timeout
+
+        while True:
+            try:
+                show_version_result = await self.show(u'show version', timeout=request_timeout)
+                if self._reloaded_since(show_version_result, since):
+                    return time.time() - since
+            except (aiohttp.ClientError, asyncio.TimeoutError, NXOSError, KeyError, TypeError, ValueError):
+                pass
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise ReloadTimeoutError(self.host, timeout)
+
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * backoff, max_interval)
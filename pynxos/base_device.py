@@ -0,0 +1,131 @@
+import time
+
+from .lib import convert_dict_by_key, converted_list_from_table, strip_unicode
+from .lib.data_model import key_maps
+from pynxos.errors import CLIError, NXOSError
+
+
+FACTS_COMMANDS = [
+    (u'show version', ['uptime', 'uptime_string', 'os_version', 'hostname', 'serial_number', 'model']),
+    (u'show interface status', ['interfaces']),
+    (u'show vlan', ['vlans']),
+]
+
+FACTS_FIELDS = set(['fqdn']).union(*(fields for command, fields in FACTS_COMMANDS))
+
+
+class BaseDevice(object):
+    """Response checking and parsing shared by ``Device`` and ``AsyncDevice``.
+
+    None of these methods talk to the device, so they work the same
+    whichever transport fetched the responses.
+    """
+    def _cli_error_check(self, command_response):
+        error = command_response.get(u'error')
+        if error:
+            command = command_response.get(u'command')
+            if u'data' in error:
+                raise CLIError(command, error[u'data'][u'msg'])
+            else:
+                raise CLIError(command, 'Invalid command.')
+
+    def _process_cli_response(self, rpc_response):
+        text_response_list = []
+        for command_response in rpc_response:
+            self._cli_error_check(command_response)
+            text_response_list.append(command_response[u'result'])
+
+        return strip_unicode(text_response_list)
+
+    def _show_output_list(self, response_list, raw_text=False):
+        output_key = u'msg' if raw_text else u'body'
+
+        return_list = []
+        for response in response_list:
+            if response:
+                return_list.append(response[output_key])
+
+        return return_list
+
+    def _reloaded_since(self, show_version_result, since):
+        uptime = self._show_version_facts_from_result(show_version_result)['uptime']
+        return uptime < time.time() - since
+
+    def _convert_uptime_to_string(self, up_days, up_hours, up_mins, up_secs):
+        return '%02d:%02d:%02d:%02d' % (up_days, up_hours, up_mins, up_secs)
+
+    def _convert_uptime_to_seconds(self, up_days, up_hours, up_mins, up_secs):
+        seconds = up_days * 24 * 60 * 60
+        seconds += up_hours * 60 * 60
+        seconds += up_mins * 60
+        seconds += up_secs
+
+        return seconds
+
+    def _interface_detailed_list_from_table(self, interface_table):
+        return converted_list_from_table(interface_table, u'interface', key_maps.INTERFACE_KEY_MAP, fill_in=True,
+                                         host=self.host)
+
+    def _vlan_list_from_table(self, vlan_table):
+        vlan_list = converted_list_from_table(vlan_table, u'vlanbrief', key_maps.VLAN_KEY_MAP, host=self.host)
+        return list(str(x['id']) for x in vlan_list)
+
+    def _show_version_facts_from_result(self, show_version_result):
+        uptime_facts = convert_dict_by_key(show_version_result, key_maps.UPTIME_KEY_MAP)
+
+        up_days = uptime_facts['up_days']
+        up_hours = uptime_facts['up_hours']
+        up_mins = uptime_facts['up_mins']
+        up_secs = uptime_facts['up_secs']
+
+        uptime_string = self._convert_uptime_to_string(up_days, up_hours, up_mins, up_secs)
+        uptime_seconds = self._convert_uptime_to_seconds(up_days, up_hours, up_mins, up_secs)
+
+        show_version_facts = convert_dict_by_key(show_version_result, key_maps.BASIC_FACTS_KEY_MAP)
+
+        show_version_facts['uptime'] = uptime_seconds
+        show_version_facts['uptime_string'] = uptime_string
+
+        return show_version_facts
+
+    def _facts_commands(self, fields=None):
+        if fields is not None:
+            unknown_fields = set(fields) - FACTS_FIELDS
+            if unknown_fields:
+                raise NXOSError('Unknown facts: %s' % ', '.join(sorted(unknown_fields)))
+
+        return list(command for command, command_fields in FACTS_COMMANDS
+                    if fields is None or set(fields) & set(command_fields))
+
+    def _facts_from_response(self, rpc_response):
+        facts = {}
+        for command_response in rpc_response:
+            command = command_response.get(u'command')
+            try:
+                self._cli_error_check(command_response)
+            except CLIError:
+                if command == u'show interface status':
+                    facts['interfaces'] = []
+                    continue
+                raise
+
+            result = strip_unicode(command_response[u'result'])
+            body = result[u'body'] if result else None
+
+            if command == u'show version':
+                facts.update(self._show_version_facts_from_result(body or {}))
+            elif command == u'show interface status':
+                iface_detailed_list = self._interface_detailed_list_from_table(body)
+                facts['interfaces'] = list(x['interface'] for x in iface_detailed_list)
+            elif command == u'show vlan':
+                facts['vlans'] = self._vlan_list_from_table(body)
+
+        facts['fqdn'] = 'N/A'
+
+        return facts
+
+    def _select_facts(self, facts, fields=None):
+        if fields is None:
+            return facts
+
+        return dict((field, facts[field]) for field in fields if field in facts)
@@ -1,51 +1,94 @@
-import signal
+import gzip
+import hashlib
+import os
 import re
-from .lib.rpc_client import RPCClient
-from .lib import convert_dict_by_key, converted_list_from_table, strip_unicode
-from .lib.data_model import key_maps
-from pynxos.features.file_copy import FileCopy
-from pynxos.features.vlans import Vlans
-from pynxos.errors import CLIError, NXOSError
+import threading
+import time
+
+import requests
+from .base_device import BaseDevice
+from .lib.rpc_client import RPCClient, chunk_commands
+from .lib import instrumentation, parsers
+from .lib.config_store import BackupResult
+from .install import INSTALL_STATUS_COMMAND, InstallJob, install_command
+from .lib import iter_list_from_stream, iter_text_from_stream, strip_unicode
+from pynxos.features import get_feature_class
+from pynxos.errors import CLIError, NXOSError, ReloadTimeoutError
+
+
+SHOW_COMMAND_RE = re.compile(r'^\s*sh(o(w)?)?\s', re.IGNORECASE)
+
+RUNNING_CONFIG_MARKER_COMMAND = u'show running-config | include last.done.at'
+RUNNING_CONFIG_MARKER_RE = re.compile(r'Running configuration last done at:\s*(.+?)\s*$', re.MULTILINE)
 
 
 class RebootSignal(NXOSError):
     pass
 
 
-class Device(object):
-    def __init__(self, host, username, password, transport=u'http', port=None, timeout=30, verify=True):
+class Device(BaseDevice):
+    def __init__(self, host, username, password, transport=u'http', port=None, timeout=30, verify=True,
+                 pool_maxsize=10, max_retries=0, keep_alive=True, max_commands=None, max_bytes=None,
+                 cache=None):
         self.host = host
         self.username = username
         self.password = password
         self.transport = transport
         self.timeout = timeout
         self.verify = verify
+        self.max_commands = max_commands
+        self.max_bytes = max_bytes
+        self.cache = cache
+        self._features = {}
+
+        self.rpc = RPCClient(host, username, password, transport=transport, port=port, verify=self.verify,
+                             pool_maxsize=pool_maxsize, max_retries=max_retries, keep_alive=keep_alive)
 
-        self.rpc = RPCClient(host, username, password, transport=transport, port=port, verify=self.verify)
+    def __enter__(self):
+        return self
 
-    def _cli_error_check(self, command_response):
-        error = command_response.get(u'error')
-        if error:
-            command = command_response.get(u'command')
-            if u'data' in error:
-                raise CLIError(command, error[u'data'][u'msg'])
-            else:
-                raise CLIError(command, 'Invalid command.')
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
-    def _cli_command(self, commands, method=u'cli'):
+    def close(self):
+        """Close the persistent NX-API session and release its connection pool.
+        """
+        self.rpc.close()
+
+    def _cli_command(self, commands, method=u'cli', timeout=None, raw_responses=False):
+        """Send commands in as few requests as the payload limits allow.
+
+        Keyword Args:
+            raw_responses (bool): Return the JSON-RPC responses, including
+                errors, instead of checking them and returning the results.
+        """
         if not isinstance(commands, list):
             commands = [commands]
+        if timeout is None:
+            timeout = self.timeout
 
-        rpc_response = self.rpc.send_request(commands, method=method, timeout=self.timeout)
+        with instrumentation.span('device.cli_command', host=self.host, method=method, commands=len(commands)):
+            text_response_list = []
+            for chunk in chunk_commands(commands, method, self.max_commands, self.max_bytes):
+                rpc_response = self.rpc.send_request(chunk, method=method, timeout=timeout)
+                if raw_responses:
+                    text_response_list.extend(rpc_response)
+                else:
+                    text_response_list.extend(self._process_cli_response(rpc_response))
 
-        text_response_list = []
-        for command_response in rpc_response:
-            self._cli_error_check(command_response)
-            text_response_list.append(command_response[u'result'])
+        return text_response_list
 
-        return strip_unicode(text_response_list)
+    def _invalidate_cache(self):
+        if self.cache is not None:
+            self.cache.invalidate(self.host)
 
-    def show(self, command, raw_text=False):
+        if hasattr(self, '_facts'):
+            del self._facts
+
+        for feature in self._features.values():
+            feature.invalidate()
+
+    def show(self, command, raw_text=False, use_cache=True, timeout=None):
         """Send a non-configuration command.
 
         Args:
@@ -53,42 +96,118 @@ class Device(object):
 
         Keyword Args:
             raw_text (bool): Whether to return raw text or structured data.
+            use_cache (bool): Whether to use the device's response cache, if it has one.
+                Only ``show`` commands are ever cached, and only through this
+                method; ``show_list`` always sends its commands. If False, the
+                command is always sent and the cache is left untouched.
+            timeout (int): Seconds to wait for the response, instead of the device's ``timeout``.
 
         Returns:
             The output of the show command, which could be raw text or structured data.
         """
+        use_cache = use_cache and self.cache is not None and SHOW_COMMAND_RE.match(command) is not None
+        cache_key = (self.host, command, raw_text)
+        if use_cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+            generation = self.cache.generation(self.host)
+
         commands = [command]
-        list_result = self.show_list(commands, raw_text)
+        list_result = self.show_list(commands, raw_text, timeout=timeout)
         if list_result:
-            return list_result[0]
+            result = list_result[0]
         else:
-            return {}
+            result = {}
+
+        if use_cache:
+            self.cache.set(cache_key, result, generation=generation)
 
-    def show_list(self, commands, raw_text=False):
+        return result
+
+    def show_list(self, commands, raw_text=False, timeout=None):
         """Send a list of non-configuration commands.
 
+        The device's response cache is never used here; only ``show`` reads
+        and fills it.
+
         Args:
             commands (list): A list of commands to send to the device.
 
         Keyword Args:
             raw_text (bool): Whether to return raw text or structured data.
+            timeout (int): Seconds to wait for each response, instead of the device's ``timeout``.
 
         Returns:
             A list of outputs for each show command
         """
-        return_list = []
         if raw_text:
-            response_list = self._cli_command(commands, method=u'cli_ascii')
-            for response in response_list:
-                if response:
-                    return_list.append(response[u'msg'])
+            response_list = self._cli_command(commands, method=u'cli_ascii', timeout=timeout)
+        else:
+            response_list = self._cli_command(commands, timeout=timeout)
+
+        return self._show_output_list(response_list, raw_text)
+
+    def show_parsed(self, commands, timeout=None):
+        """Send a list of show commands as raw text in one request, and parse each output.
+
+        Each output is parsed by the parser registered for its command in
+        ``pynxos.lib.parsers``, e.g. ``show boot``, ``dir bootflash:``,
+        ``show file bootflash:image.bin md5sum`` or ``show install all status``.
+
+        Args:
+            commands (list): A list of commands to send to the device.
+
+        Keyword Args:
+            timeout (int): Seconds to wait for the response, instead of the device's ``timeout``.
+
+        Returns:
+            A list of parsed outputs, in the order of the commands.
+
+        Raises:
+            ParserNotFoundError: If no parser is registered for one of the commands.
+        """
+        command_parsers = list(parsers.get_parser(command) for command in commands)
+        outputs = self._show_outputs(commands, raw_text=True, timeout=timeout)
+
+        return list(parser(output) for parser, output in zip(command_parsers, outputs))
+
+    def _show_outputs(self, commands, raw_text=False, timeout=None):
+        """Like ``show_list``, but with exactly one output per command.
+
+        Empty responses become ``u''`` or ``{}`` instead of being dropped,
+        so outputs can be zipped with their commands.
+        """
+        if raw_text:
+            response_list = self._cli_command(commands, method=u'cli_ascii', timeout=timeout)
         else:
-            response_list = self._cli_command(commands)
-            for response in response_list:
-                if response:
-                    return_list.append(response[u'body'])
+            response_list = self._cli_command(commands, timeout=timeout)
+
+        output_key, empty = (u'msg', u'') if raw_text else (u'body', {})
+        return list(response[output_key] if response else empty for response in response_list)
+
+    def show_iter(self, command, list_name):
+        """Send a structured show command and yield its table rows as they arrive.
+
+        The response is parsed incrementally from the socket, so peak memory
+        stays proportional to one row rather than the whole output. Useful for
+        large tables such as ``show mac address-table`` or ``show ip route``.
+        Requires the optional ``ijson`` package. The response cache is not used.
+
+        Args:
+            command (str): The command to send to the device.
+            list_name (str): The table to yield rows from, e.g. ``'interface'``
+                for ``TABLE_interface``. A list of names selects a nested table.
 
-        return return_list
+        Raises:
+            CLIError: If there is a problem with the supplied command.
+        """
+        response = self.rpc.send_request_stream([command], timeout=self.timeout)
+        try:
+            for row in iter_list_from_stream(response.raw, list_name, command=command):
+                yield strip_unicode(row)
+        finally:
+            response.close()
 
     def config(self, command):
         """Send a configuration command.
@@ -106,13 +225,26 @@ class Device(object):
     def config_list(self, commands):
         """Send a list of configuration commands.
 
+        If ``max_commands`` or ``max_bytes`` is set on the device, the list is
+        sent in several requests, one after another, stopping at the first
+        error. Batches are never split inside a sub-mode block, so commands
+        under e.g. ``interface`` are sent in the same request as their parent.
+
         Args:
             commands (list): A list of commands to send to the device.
 
         Raises:
             CLIError: If there is a problem with one of the commands in the list.
         """
-        return self._cli_command(commands)
+        # A ``show`` sent before the commands were applied may still get its
+        # answer after this returns. Invalidating both before and after moves
+        # the cache to a new generation either side of the change, so that
+        # output is dropped when ``show`` tries to cache it.
+        self._invalidate_cache()
+        try:
+            return self._cli_command(commands)
+        finally:
+            self._invalidate_cache()
 
     def save(self, filename='startup-config'):
         """Save a device's running configuration.
@@ -148,6 +280,7 @@ class Device(object):
         Returns:
             True if the remote file exists, False if it doesn't.
         """
+        FileCopy = get_feature_class('file_copy')
         fc = FileCopy(self, src, dst=dest, file_system=file_system)
         if fc.file_already_exists():
             return True
@@ -166,35 +299,176 @@ class Device(object):
             file_system (str): The file system for the
                 remote fle. Defaults to bootflash:'.
         """
+        FileCopy = get_feature_class('file_copy')
         fc = FileCopy(self, src, dst=dest, file_system=file_system)
         fc.send()
 
+    def sync_files(self, files, file_system='bootflash:', **kwargs):
+        """Send the local files that are missing from the device or differ from its copies.
+
+        The remote file system is listed once and md5 sums are only
+        requested for files whose sizes match, so an up-to-date device
+        costs two requests however many files there are.
+
+        Args:
+            files: A local directory, a list of local paths, or a dictionary
+                mapping remote file names to local paths. See ``FileSync``.
+
+        Keyword Args:
+            file_system (str): The remote file system. Defaults to 'bootflash:'.
+            **kwargs: Passed to ``FileSync``, e.g. ``window_size`` or ``progress``.
+
+        Returns:
+            SyncResult
+        """
+        FileSync = get_feature_class('file_sync')
+        return FileSync(self, files, file_system=file_system, **kwargs).sync()
+
+    def collect_files(self, files, directory='.', file_system='bootflash:', **kwargs):
+        """Pull remote files, e.g. core dumps or tech-support bundles, over one SSH connection.
+
+        Each file is streamed to disk and verified against the device's
+        md5 sum. See ``FileCollector``.
+
+        Args:
+            files: Remote file names relative to ``file_system``, or a
+                dictionary mapping remote file names to local paths.
+
+        Keyword Args:
+            directory (str): The local directory to save files given as a list into.
+            file_system (str): The remote file system. Defaults to 'bootflash:'.
+            **kwargs: Passed to ``FileCollector``, e.g. ``window_size`` or ``progress``.
+
+        Returns:
+            CollectResult
+        """
+        FileCollector = get_feature_class('file_collector')
+        return FileCollector(self, files, directory=directory, file_system=file_system, **kwargs).collect()
+
+    def feature(self, feature_name):
+        """Return this device's instance of a feature, creating it on first use.
+
+        Args:
+            feature_name (str): A registered feature name, e.g. ``'vlans'``.
+
+        Raises:
+            FeatureNotFoundError: If no feature has that name.
+        """
+        if feature_name not in self._features:
+            feature_class = get_feature_class(feature_name)
+            self._features[feature_name] = feature_class(self)
+
+        return self._features[feature_name]
+
+    def load_features(self, feature_names):
+        """Fetch the show commands of several features in a single request.
+
+        Each feature's next read of those commands is served from the
+        prefetched output.
+
+        Args:
+            feature_names (list): Registered feature names.
+
+        Returns:
+            A list of the feature instances, in the same order.
+        """
+        features = list(self.feature(name) for name in feature_names)
+
+        commands = []
+        for feature in features:
+            for command in feature.show_commands:
+                if command not in commands:
+                    commands.append(command)
+
+        if commands:
+            outputs = dict(zip(commands, self._show_outputs(commands)))
+            for feature in features:
+                feature.load(dict((command, outputs[command]) for command in feature.show_commands))
+
+        return features
+
     def _disable_confirmation(self):
         self.show('terminal dont-ask')
 
-    def reboot(self, confirm=False):
+    def reboot(self, confirm=False, wait_for_reload=False, request_timeout=5, reload_timeout=900):
         """Reboot the device.
 
+        The reload command is sent with a short timeout of its own, because
+        the device usually drops the connection instead of answering. No
+        signals are used, so this can be called from any thread.
+
         Args:
             confirm(bool): if False, this method has no effect.
+
+        Keyword Args:
+            wait_for_reload (bool): Block until the device is back. See ``wait_for_reload``.
+            request_timeout (int): Seconds to wait for an answer to the reload command.
+            reload_timeout (int): Seconds to wait for the device to come back,
+                if ``wait_for_reload`` is True.
+
+        Raises:
+            ReloadTimeoutError: If the device isn't back within ``reload_timeout``.
         """
         if confirm:
-            def handler(signum, frame):
-                raise RebootSignal('Interupting after reload')
-
-            signal.signal(signal.SIGALRM, handler)
-            signal.alarm(5)
+            self._invalidate_cache()
+            self._disable_confirmation()
 
+            reload_start = time.time()
             try:
-                self._disable_confirmation()
-                self.show('reload')
-            except RebootSignal:
-                signal.alarm(0)
+                self.show('reload', timeout=request_timeout)
+            except requests.exceptions.RequestException:
+                pass
+            self.rpc.close()
 
-            signal.alarm(0)
+            if wait_for_reload:
+                self.wait_for_reload(since=reload_start, timeout=reload_timeout)
         else:
             print('Need to confirm reboot with confirm=True')
 
+    def wait_for_reload(self, since=None, timeout=900, interval=5, max_interval=60, backoff=2,
+                        request_timeout=10):
+        """Poll NX-API until the device has reloaded and answers again.
+
+        The device counts as back once ``show version`` answers with an
+        uptime shorter than the time since the reload, so a device that is
+        still shutting down isn't mistaken for one that is back. Polls
+        start ``interval`` seconds apart and back off to ``max_interval``.
+
+        Keyword Args:
+            since (float): When the reload was requested, as seconds since the
+                epoch. Defaults to now.
+            timeout (int): Seconds to wait before giving up.
+            interval (float): Seconds before the second poll.
+            max_interval (float): The longest wait between polls.
+            backoff (float): What the wait is multiplied by after each poll.
+            request_timeout (int): Seconds to wait for each poll's response.
+
+        Returns:
+            The seconds from ``since`` until the device was back.
+
+        Raises:
+            ReloadTimeoutError: If the device isn't back within ``timeout``.
+        """
+        if since is None:
+            since = time.time()
+        deadline = time.time() + timeout
+
+        while True:
+            try:
+                show_version_result = self.show(u'show version', use_cache=False, timeout=request_timeout)
+                if self._reloaded_since(show_version_result, since):
+                    self._invalidate_cache()
+                    return time.time() - since
+            except (requests.exceptions.RequestException, NXOSError, KeyError, TypeError, ValueError):
+                pass
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise ReloadTimeoutError(self.host, timeout)
+
+            time.sleep(min(interval, remaining))
+            interval = min(interval * backoff, max_interval)
+
     def set_boot_options(self, image_name, kickstart=None):
         """Set boot variables
         like system image and kickstart image.
@@ -205,37 +479,51 @@ class Device(object):
         Keyword Args: many implementors may choose
             to supply a kickstart parameter to specicify a kickstart image.
         """
+        self._invalidate_cache()
         self._disable_confirmation()
         try:
-            if kickstart is None:
-                self.show('install all nxos %s' % image_name, raw_text=True)
-            else:
-                self.show('install all system %s kickstart %s' % (image_name, kickstart), raw_text=True)
+            self.show(install_command(image_name, kickstart=kickstart), raw_text=True)
         except CLIError:
             pass
+        finally:
+            self._invalidate_cache()
+
+    def start_install(self, image_name, kickstart=None, request_timeout=10):
+        """Start installing a system image without waiting for the install to finish.
+
+        Unlike ``set_boot_options``, errors from the install command are
+        raised, and the install's progress can be followed through the
+        returned job. See ``InstallJob``.
+
+        Args:
+            image_name (str): The system image file name.
+
+        Keyword Args:
+            kickstart (str): The kickstart image file name, for platforms that use one.
+            request_timeout (int): Seconds to wait for the install command
+                to be rejected before assuming it is running.
+
+        Returns:
+            InstallJob
+
+        Raises:
+            CLIError: If the device rejects the install command.
+        """
+        return InstallJob(self, image_name, kickstart=kickstart).start(request_timeout=request_timeout)
 
     def get_boot_options(self):
         """Get current boot variables
         like system image and kickstart image.
 
+        Both ``show boot`` and ``show install all status`` are fetched in one request.
+
         Returns:
-            A dictionary, e.g. { 'kick': router_kick.img, 'sys': 'router_sys.img'}
+            A dictionary, e.g. { 'kick': router_kick.img, 'sys': 'router_sys.img', 'status': '...'}
         """
-        boot_options_raw_text = self.show('show boot', raw_text=True).split('Boot Variables on next reload')[1]
-        if 'kickstart' in boot_options_raw_text:
-            kick_regex = r'kickstart variable = bootflash:/(\S+)'
-            sys_regex = r'system variable = bootflash:/(\S+)'
-
-            kick = re.search(kick_regex, boot_options_raw_text).group(1)
-            sys = re.search(sys_regex, boot_options_raw_text).group(1)
-            retdict = dict(kick=kick, sys=sys)
-        else:
-            nxos_regex = r'NXOS variable = bootflash:/(\S+)'
-            nxos = re.search(nxos_regex, boot_options_raw_text).group(1)
-            retdict = dict(sys=nxos)
+        boot_variables, install_status = self.show_parsed(['show boot', INSTALL_STATUS_COMMAND])
 
-        install_status = self.show('show install all status', raw_text=True)
-        retdict['status'] = install_status
+        retdict = dict(boot_variables.next_reload)
+        retdict['status'] = install_status.text
 
         return retdict
 
@@ -245,7 +533,11 @@ class Device(object):
         Args:
             filename (str): The filename of the checkpoint file to load into the running configuration.
         """
-        self.show('rollback running-config file %s' % filename, raw_text=True)
+        self._invalidate_cache()
+        try:
+            self.show('rollback running-config file %s' % filename, raw_text=True)
+        finally:
+            self._invalidate_cache()
 
     def checkpoint(self, filename):
         """Save a checkpoint of the running configuration to the device.
@@ -264,6 +556,87 @@ class Device(object):
         with open(filename, 'w') as f:
             f.write(self.running_config)
 
+    def download_running_config(self, filename, compress=False, hash_name='sha256', chunk_size=65536):
+        """Stream the running config straight to a local file.
+
+        Unlike ``backup_running_config``, the configuration is never held in
+        memory as a whole: the NX-API response is decoded and written in
+        chunks as it arrives, so peak memory stays flat however large the
+        config is and however many devices are backed up at once. The file
+        is written under a temporary name and renamed when complete.
+
+        Args:
+            filename (str): The local file path on which to save the running config.
+
+        Keyword Args:
+            compress (bool): Write the file gzip-compressed.
+            hash_name (str): A ``hashlib`` algorithm, computed over the
+                uncompressed config as it is written.
+            chunk_size (int): The number of bytes read from the response at a time.
+
+        Returns:
+            The hex digest of the config.
+
+        Raises:
+            CLIError: If the device returns an error.
+        """
+        command = u'show running-config'
+        digest = hashlib.new(hash_name)
+        tmp_filename = '%s.%d.%d' % (filename, os.getpid(), threading.current_thread().ident)
+        size = 0
+
+        with instrumentation.span('device.download_running_config', host=self.host, compress=compress) as span:
+            response = self.rpc.send_request_stream([command], method=u'cli_ascii', timeout=self.timeout)
+            try:
+                with (gzip.open if compress else open)(tmp_filename, 'wb') as f:
+                    for text in iter_text_from_stream(response.raw, command=command, chunk_size=chunk_size):
+                        data = text.encode('utf-8')
+                        digest.update(data)
+                        f.write(data)
+                        size += len(data)
+                os.rename(tmp_filename, filename)
+            finally:
+                response.close()
+                if os.path.exists(tmp_filename):
+                    os.remove(tmp_filename)
+
+            span.set('bytes_received', size)
+
+        return digest.hexdigest()
+
+    def _running_config_marker(self):
+        try:
+            output = self.show(RUNNING_CONFIG_MARKER_COMMAND, raw_text=True, use_cache=False)
+        except CLIError:
+            return None
+
+        match = RUNNING_CONFIG_MARKER_RE.search(output or '')
+        return match.group(1) if match else None
+
+    def incremental_backup(self, store):
+        """Back up the running config into a ``ConfigStore``, skipping unchanged configs.
+
+        The device is first asked when its running configuration last
+        changed, which only returns one line. If that matches the latest
+        snapshot in the store, nothing is downloaded. Otherwise the config
+        is downloaded and stored only if its content changed, along with a
+        line diff against the previous snapshot. Software versions that don't
+        report a change time are always downloaded.
+
+        Args:
+            store (ConfigStore): Where snapshots are kept.
+
+        Returns:
+            BackupResult
+        """
+        marker = self._running_config_marker()
+        latest = store.latest(self.host)
+        if marker is not None and latest is not None and latest['marker'] == marker:
+            return BackupResult(self.host, latest['digest'], changed=False, downloaded=False)
+
+        config = self.show(u'show running-config', raw_text=True, use_cache=False)
+        return store.save(self.host, config, marker=marker)
+
     @property
     def running_config(self):
         """Return the running configuration of the device.
@@ -271,25 +644,13 @@ class Device(object):
         response = self.show(u'show running-config', raw_text=True)
         return response
 
-    def _convert_uptime_to_string(self, up_days, up_hours, up_mins, up_secs):
-        return '%02d:%02d:%02d:%02d' % (up_days, up_hours, up_mins, up_secs)
-
-    def _convert_uptime_to_seconds(self, up_days, up_hours, up_mins, up_secs):
-        seconds = up_days * 24 * 60 * 60
-        seconds += up_hours * 60 * 60
-        seconds += up_mins * 60
-        seconds += up_secs
-
-        return seconds
-
     def _get_interface_detailed_list(self):
         try:
             interface_table = self.show(u'show interface status')
-            interface_list = converted_list_from_table(interface_table, u'interface', key_maps.INTERFACE_KEY_MAP, fill_in=True)
         except CLIError:
             return []
 
-        return interface_list
+        return self._interface_detailed_list_from_table(interface_table)
 
     def _get_interface_list(self):
         iface_detailed_list = self._get_interface_detailed_list()
@@ -298,29 +659,44 @@ class Device(object):
         return iface_list
 
     def _get_vlan_list(self):
-        vlans = Vlans(self)
-        vlan_list = vlans.get_list()
+        vlan_list = self.feature('vlans').get_list()
 
         return vlan_list
 
     def _get_show_version_facts(self):
         show_version_result = self.show(u'show version')
-        uptime_facts = convert_dict_by_key(show_version_result, key_maps.UPTIME_KEY_MAP)
 
-        up_days = uptime_facts['up_days']
-        up_hours = uptime_facts['up_hours']
-        up_mins = uptime_facts['up_mins']
-        up_secs = uptime_facts['up_secs']
+        return self._show_version_facts_from_result(show_version_result)
+
+    def get_facts(self, fields=None):
+        """Return a dictionary of facts about the device.
+
+        All the show commands needed are sent in a single request.
+        See ``facts`` for the available keys.
 
-        uptime_string = self._convert_uptime_to_string(up_days, up_hours, up_mins, up_secs)
-        uptime_seconds = self._convert_uptime_to_seconds(up_days, up_hours, up_mins, up_secs)
+        Keyword Args:
+            fields (list): Only gather and return these facts, e.g.
+                ``['hostname', 'os_version']``. Commands not needed for the
+                requested facts are not sent. If None, all facts are gathered
+                and cached on the device.
+
+        Raises:
+            NXOSError: If an unknown fact is requested.
+        """
+        if hasattr(self, '_facts'):
+            self._facts_commands(fields)
+            return self._select_facts(self._facts, fields)
 
-        show_version_facts = convert_dict_by_key(show_version_result, key_maps.BASIC_FACTS_KEY_MAP)
+        commands = self._facts_commands(fields)
+        rpc_response = []
+        if commands:
+            rpc_response = self._cli_command(commands, raw_responses=True)
 
-        show_version_facts['uptime'] = uptime_seconds
-        show_version_facts['uptime_string'] = uptime_string
+        facts = self._facts_from_response(rpc_response)
+        if fields is None:
+            self._facts = facts
 
-        return show_version_facts
+        return self._select_facts(facts, fields)
 
     @property
     def facts(self):
@@ -368,29 +744,4 @@ class Device(object):
                 ]
             }
         """
-        if hasattr(self, '_facts'):
-            return self._facts
-
-        facts = {}
-
-        show_version_facts = self._get_show_version_facts()
-        facts.update(show_version_facts)
-
-        iface_list = self._get_interface_list()
-        facts['interfaces'] = iface_list
-
-        vlan_list = self._get_vlan_list()
-        facts['vlans'] = vlan_list
-
-        facts['fqdn'] = 'N/A'
-
-        self._facts = facts
-        return facts
-
-#    def feature(self, feature_name):
-#        try:
-#            feature_module = importlib.import_module(
-#                'pynxos.features.%s' % (feature_name))
-#            return feature_module.instance(self)
-#        except ImportError:
-#            raise FeatureNotFoundError(feature_name, self.device_type)
+        return self.get_facts()
@@ -15,4 +15,26 @@ class CLIError(NXOSError):
     def __repr__(self):
         return 'The command "%s" gave the error "%s".' % (self.command, self.message)
 
-    __str__ = __repr__
\ No newline at end of file
+    __str__ = __repr__
+
+class FeatureNotFoundError(NXOSError):
+    def __init__(self, feature_name):
+        self.feature_name = feature_name
+        self.message = 'No feature named "%s" is registered.' % feature_name
+
+class ReloadTimeoutError(NXOSError):
+    def __init__(self, host, timeout):
+        self.host = host
+        self.timeout = timeout
+        self.message = '%s did not come back within %s seconds of reloading.' % (host, timeout)
+
+class InstallError(NXOSError):
+    def __init__(self, host, message, result=None):
+        self.host = host
+        self.result = result
+        self.message = 'Install on %s failed: %s' % (host, message)
+
+class ParserNotFoundError(NXOSError):
+    def __init__(self, command):
+        self.command = command
+        self.message = 'No parser is registered for "%s".' % command
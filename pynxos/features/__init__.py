@@ -0,0 +1,90 @@
+import importlib
+
+ENTRY_POINT_GROUP = 'pynxos.features'
+
+# Maps feature names to ``'module:Class'`` paths or to feature classes.
+# Paths are only imported on first use, so ``file_copy`` and its paramiko
+# and scp imports cost nothing until a file is transferred. The file
+# transfer classes take more arguments than a device and are used by
+# ``Device`` and ``Fleet`` methods rather than by ``Device.feature``.
+FEATURES = {
+    'file_collector': 'pynxos.features.file_copy:FileCollector',
+    'file_copy': 'pynxos.features.file_copy:FileCopy',
+    'file_sync': 'pynxos.features.file_copy:FileSync',
+    'interfaces': 'pynxos.features.interfaces:Interfaces',
+    'vlans': 'pynxos.features.vlans:Vlans',
+}
+
+_entry_points_loaded = False
+
+# Entry points found but not loaded yet. Each is moved into ``FEATURES``
+# the first time its name is looked up.
+_entry_points = {}
+
+
+def _iter_entry_points():
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        import pkg_resources
+        return list(pkg_resources.iter_entry_points(ENTRY_POINT_GROUP))
+
+    eps = entry_points()
+    if hasattr(eps, 'select'):
+        return list(eps.select(group=ENTRY_POINT_GROUP))
+
+    return list(eps.get(ENTRY_POINT_GROUP, []))
+
+
+def _load_entry_points():
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+
+    for entry_point in _iter_entry_points():
+        _entry_points.setdefault(entry_point.name, entry_point)
+    _entry_points_loaded = True
+
+
+def register_feature(name, feature):
+    """Register a feature under a name.
+
+    Features can also be registered by other packages through the
+    ``pynxos.features`` entry point group.
+
+    Args:
+        name (str): The name passed to ``Device.feature``.
+        feature: A ``BaseFeature`` subclass, or a ``'module:Class'`` path
+            imported on first use.
+    """
+    FEATURES[name] = feature
+
+
+def get_feature_class(name):
+    """Return the feature class registered under ``name``.
+
+    This is the only lookup for feature classes, including the file
+    transfer classes ``Device`` and ``Fleet`` use, so anything registered
+    with ``register_feature`` or an entry point replaces the built-in class.
+
+    Raises:
+        FeatureNotFoundError: If no feature has that name.
+    """
+    from pynxos.errors import FeatureNotFoundError
+
+    if name not in FEATURES:
+        _load_entry_points()
+        if name in _entry_points:
+            FEATURES[name] = _entry_points.pop(name).load()
+
+    try:
+        feature = FEATURES[name]
+    except KeyError:
+        raise FeatureNotFoundError(name)
+
+    if isinstance(feature, str):
+        module_name, class_name = feature.split(':')
+        feature = getattr(importlib.import_module(module_name), class_name)
+        FEATURES[name] = feature
+
+    return feature
@@ -1,7 +1,28 @@
 class BaseFeature(object):
+    # Structured show commands this feature reads. ``Device.load_features``
+    # sends the commands of several features in one request and hands each
+    # feature its outputs through ``load``.
+    show_commands = []
 
     def __init__(self, device):
         self.device = device
+        self._outputs = {}
+
+    def load(self, outputs):
+        """Store prefetched show command outputs, keyed by command.
+
+        Each output is used once, by the next read of that command.
+        """
+        self._outputs.update(outputs)
+
+    def invalidate(self):
+        self._outputs.clear()
+
+    def _show(self, command):
+        if command in self._outputs:
+            return self._outputs.pop(command)
+
+        return self.device.show(command)
 
     def get(self, vlan_id):
         raise NotImplementedError
@@ -16,4 +37,4 @@ class BaseFeature(object):
         raise NotImplementedError
 
     def remove(self, vlan_id):
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
@@ -1,33 +1,89 @@
 from scp import SCPClient
 from pynxos.errors import CLIError, NXOSError
+from pynxos.lib import instrumentation
+from pynxos.lib.file_hash import md5sum
+from pynxos.lib.parsers import parse_dir, parse_md5sum
 
 import paramiko
 import hashlib
 import os
-import re
 
 class FileTransferError(NXOSError):
     pass
 
+def _ssh_connect(device, hostname, username, password, port, window_size=None):
+    """Open an SSH connection for file transfers, defaulting to the device's credentials.
+    """
+    ssh = paramiko.SSHClient()
+    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    try:
+        ssh.connect(
+            hostname=hostname or device.host,
+            username=username or device.username,
+            password=password or device.password,
+            port=port,
+            allow_agent=False,
+            look_for_keys=False)
+    except paramiko.SSHException as e:
+        raise FileTransferError('Could not transfer file. SSH connection failed: %s' % e)
+
+    if window_size:
+        ssh.get_transport().default_window_size = window_size
+
+    return ssh
+
+def _scp_client(transport, buffer_size=None, progress=None):
+    scp_kwargs = {}
+    if buffer_size:
+        scp_kwargs['buff_size'] = buffer_size
+    if progress is not None:
+        scp_kwargs['progress'] = progress
+
+    return SCPClient(transport, **scp_kwargs)
+
+def _remote_md5s(device, file_system, names):
+    """Return the md5 sums of remote files, keyed by name, fetched in one request.
+    """
+    if not names:
+        return {}
+
+    commands = list('show file {}{} md5sum'.format(file_system, name) for name in names)
+    return dict(zip(names, device.show_parsed(commands)))
+
 class FileCopy(object):
     """This class is used to copy local files to a NXOS device.
+
+    Args:
+        device (Device): The device to copy to or from.
+        src (str): The local file path.
+
+    Keyword Args:
+        dst (str): The remote file name. Defaults to the basename of ``src``.
+        port (int): The SSH port of the device.
+        file_system (str): The remote file system.
+        window_size (int): The SSH channel window size in bytes. Larger windows
+            improve throughput on high-latency links.
+        buffer_size (int): The size in bytes of each read/write during transfer.
+        progress (callable): Called as ``progress(filename, size, sent)`` as the
+            transfer progresses.
     """
-    def __init__(self, device, src, dst=None, port=22, file_system='bootflash:'):
+    def __init__(self, device, src, dst=None, port=22, file_system='bootflash:',
+                 window_size=None, buffer_size=None, progress=None):
         self.device = device
         self.src = src
         self.dst = dst or os.path.basename(src)
         self.port = port
         self.file_system = file_system
+        self.window_size = window_size
+        self.buffer_size = buffer_size
+        self.progress = progress
 
     def get_flash_size(self):
         """Return the available space in the remote directory.
         """
         dir_out = self.device.show('dir {}'.format(self.file_system), raw_text=True)
 
-        match = re.search(r'(\d+) bytes free', dir_out)
-        bytes_free = match.group(1)
-
-        return int(bytes_free)
+        return parse_dir(dir_out).bytes_free
 
     def get_remote_size(self):
         return self.get_flash_size()
@@ -68,33 +124,78 @@ class FileCopy(object):
     def remote_file_exists(self):
         dir_body = self.device.show(
             'dir {0}/{1}'.format(self.file_system, self.dst), raw_text=True)
-        if 'No such file' in dir_body:
-            return False
 
-        return True
+        return not parse_dir(dir_body).missing
 
     def get_remote_md5(self):
         """Return the md5 sum of the remote file,
         if it exists.
         """
         md5_body = self.device.show(
-            'show file {0}{1} md5sum'.format(self.file_system, self.dst), raw_text=True)
-        return md5_body.strip()
+            'show file {0}{1} md5sum'.format(self.file_system, self.dst), raw_text=False)
+        return parse_md5sum(md5_body)
 
     def get_local_md5(self, blocksize=2**20):
         """Get the md5 sum of the local file,
         if it exists.
+
+        The sum is cached per file version and shared by every
+        ``FileCopy`` instance, see ``pynxos.lib.file_hash.md5sum``.
         """
         if self.local_file_exists():
-            m = hashlib.md5()
-            with open(self.src, "rb") as f:
-                buf = f.read(blocksize)
+            return md5sum(self.src, blocksize=blocksize)
+
+    def _resume_put(self, ssh, full_remote_path):
+        """Push the local file over SFTP, appending to any partial remote copy.
+
+        A partial copy is only known to be a prefix of the local file once
+        the md5 sum of the result matches. If it doesn't, the remote file
+        is overwritten with one full upload before giving up.
+        """
+        local_size = os.path.getsize(self.src)
+
+        sftp = ssh.open_sftp()
+        try:
+            try:
+                offset = sftp.stat(full_remote_path).st_size
+            except IOError:
+                offset = 0
+
+            if offset > local_size:
+                offset = 0
+
+            self._sftp_put(sftp, full_remote_path, offset, local_size)
+            verified = self.file_already_exists()
+            if not verified and offset:
+                self._sftp_put(sftp, full_remote_path, 0, local_size)
+                verified = self.file_already_exists()
+        finally:
+            sftp.close()
+
+        if not verified:
+            raise FileTransferError(
+                'Could not transfer file. The md5 sum of the resumed file does not match.')
+
+    def _sftp_put(self, sftp, full_remote_path, offset, local_size):
+        buffer_size = self.buffer_size or 2**15
+
+        with open(self.src, 'rb') as local_file:
+            local_file.seek(offset)
+            remote_file = sftp.open(full_remote_path, 'ab' if offset else 'wb')
+            try:
+                remote_file.set_pipelined(True)
+                sent = offset
+                buf = local_file.read(buffer_size)
                 while buf:
-                    m.update(buf)
-                    buf = f.read(blocksize)
-            return m.hexdigest()
+                    remote_file.write(buf)
+                    sent += len(buf)
+                    if self.progress is not None:
+                        self.progress(self.dst, local_size, sent)
+                    buf = local_file.read(buffer_size)
+            finally:
+                remote_file.close()
 
-    def transfer_file(self, hostname=None, username=None, password=None, pull=False):
+    def transfer_file(self, hostname=None, username=None, password=None, pull=False, resume=False):
         """Transfer the file to the remote device over SCP.
 
         Note:
@@ -108,6 +209,10 @@ class FileCopy(object):
                 for the remote device.
             password (str): OPTIONAL - The SSH password
                 for the remote device.
+            pull (bool): Copy the remote file to ``src`` instead of pushing it.
+            resume (bool): Push over SFTP, continuing from the bytes already
+                on the remote side, then verify the md5 sum. The device needs
+                ``feature sftp-server`` enabled.
 
         Returns:
             True if successful.
@@ -115,6 +220,19 @@ class FileCopy(object):
         Raises:
             FileTransferError: if the transfer isn't successful.
         """
+        with instrumentation.span('file_copy.transfer_file', host=hostname or self.device.host,
+                                  dst=self.dst, pull=pull, resume=resume) as span:
+            if span.recording and not pull and self.local_file_exists():
+                span.set('bytes_sent', os.path.getsize(self.src))
+
+            result = self._transfer_file(hostname, username, password, pull, resume)
+
+            if span.recording and pull and self.local_file_exists():
+                span.set('bytes_received', os.path.getsize(self.src))
+
+        return result
+
+    def _transfer_file(self, hostname, username, password, pull, resume):
         if pull is False:
             if not self.local_file_exists():
                 raise FileTransferError(
@@ -124,22 +242,25 @@ class FileCopy(object):
                 raise FileTransferError(
                     'Could not transfer file. Not enough space on device.')
 
-        hostname = hostname or self.device.host
-        username = username or self.device.username
-        password = password or self.device.password
-
-        ssh = paramiko.SSHClient()
-        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        ssh.connect(
-            hostname=hostname,
-            username=username,
-            password=password,
-            port=self.port,
-            allow_agent=False,
-            look_for_keys=False)
+        ssh = _ssh_connect(self.device, hostname, username, password, self.port, self.window_size)
+        transport = ssh.get_transport()
 
         full_remote_path = '{}{}'.format(self.file_system, self.dst)
-        scp = SCPClient(ssh.get_transport())
+
+        if resume and not pull:
+            try:
+                self._resume_put(ssh, full_remote_path)
+            except FileTransferError:
+                raise
+            except Exception:
+                raise FileTransferError(
+                    'Could not transfer file. There was an error during transfer. Please make sure the SFTP server is enabled.')
+            finally:
+                ssh.close()
+
+            return True
+
+        scp = _scp_client(transport, self.buffer_size, self.progress)
         try:
             if pull:
                 scp.get(full_remote_path, self.src)
@@ -150,11 +271,312 @@ class FileCopy(object):
                 'Could not transfer file. There was an error during transfer. Please make sure remote permissions are set.')
         finally:
             scp.close()
+            ssh.close()
 
         return True
 
-    def send(self):
-        self.transfer_file()
+    def send(self, resume=False):
+        self.transfer_file(resume=resume)
 
     def get(self):
-        self.transfer_file(pull=True)
\ No newline at end of file
+        self.transfer_file(pull=True)
+
+
+class SyncResult(object):
+    """The outcome of syncing local files to one device.
+
+    Attributes:
+        host (str): The device the files were synced to.
+        transferred (list): Remote file names that were missing or differed, and were sent.
+        up_to_date (list): Remote file names that already matched the local files.
+    """
+    def __init__(self, host, transferred, up_to_date):
+        self.host = host
+        self.transferred = transferred
+        self.up_to_date = up_to_date
+
+    def __repr__(self):
+        return '<SyncResult %s %d transferred, %d up to date>' % (
+            self.host, len(self.transferred), len(self.up_to_date))
+
+
+class FileSync(object):
+    """Bring a set of local files onto a remote file system with few requests.
+
+    The file system is listed once with ``dir``. Only files whose remote
+    size matches the local size have their md5 sums checked, all in one
+    batched request; the rest are missing or different without asking.
+    Files that differ are sent over a single SSH connection and their md5
+    sums verified in one more request.
+
+    Args:
+        device (Device): The device to sync to.
+        files: The local manifest. A directory, whose regular files are
+            synced under their own names; a list of local paths, synced
+            under their basenames; or a dictionary mapping remote file
+            names to local paths.
+
+    Keyword Args:
+        port (int): The SSH port of the device.
+        file_system (str): The remote file system.
+        window_size (int): The SSH channel window size in bytes.
+        buffer_size (int): The size in bytes of each read/write during transfer.
+        progress (callable): Called as ``progress(filename, size, sent)`` as
+            each transfer progresses.
+    """
+    def __init__(self, device, files, port=22, file_system='bootflash:',
+                 window_size=None, buffer_size=None, progress=None):
+        self.device = device
+        self.manifest = self._manifest(files)
+        self.port = port
+        self.file_system = file_system
+        self.window_size = window_size
+        self.buffer_size = buffer_size
+        self.progress = progress
+        self._listing = None
+
+    def _manifest(self, files):
+        if isinstance(files, dict):
+            return dict(files)
+
+        if isinstance(files, str):
+            files = list(os.path.join(files, name) for name in sorted(os.listdir(files))
+                         if os.path.isfile(os.path.join(files, name)))
+
+        return dict((os.path.basename(path), path) for path in files)
+
+    def _remote_path(self, name):
+        return '{}{}'.format(self.file_system, name)
+
+    def _remote_md5s(self, names):
+        return _remote_md5s(self.device, self.file_system, names)
+
+    def diff(self):
+        """Return the remote file names that are missing or differ from the local files.
+
+        Returns:
+            A sorted list, empty if every file is up to date.
+
+        Raises:
+            FileTransferError: If a local file doesn't exist.
+        """
+        missing_local = sorted(path for path in self.manifest.values() if not os.path.isfile(path))
+        if missing_local:
+            raise FileTransferError(
+                'Could not sync files. Local files don\'t exist: %s' % ', '.join(missing_local))
+
+        self._listing = listing = self.device.show_parsed(['dir {}'.format(self.file_system)])[0]
+
+        same_size = sorted(name for name, path in self.manifest.items()
+                           if name in listing and listing.entries[name].size == os.path.getsize(path))
+        remote_md5s = self._remote_md5s(same_size)
+
+        return sorted(name for name, path in self.manifest.items()
+                      if name not in remote_md5s or remote_md5s[name] != md5sum(path))
+
+    def _check_space(self, names):
+        if self._listing.bytes_free is None:
+            return
+
+        needed = 0
+        for name in names:
+            needed += os.path.getsize(self.manifest[name])
+            if name in self._listing:
+                needed -= self._listing.entries[name].size
+
+        if needed > self._listing.bytes_free:
+            raise FileTransferError(
+                'Could not sync files. Not enough space on device.')
+
+    def sync(self, hostname=None, username=None, password=None):
+        """Send the files that are missing or differ, then verify their md5 sums.
+
+        Note:
+            If any arguments are omitted, the corresponding attributes
+            of ``self.device`` will be used.
+
+        Returns:
+            SyncResult
+
+        Raises:
+            FileTransferError: If a local file doesn't exist, there isn't
+                enough space, or a transfer or verification fails.
+        """
+        with instrumentation.span('file_copy.sync', host=hostname or self.device.host,
+                                  files=len(self.manifest)) as span:
+            names = self.diff()
+            if names:
+                self._check_space(names)
+                self._send(names, hostname, username, password)
+
+                remote_md5s = self._remote_md5s(names)
+                mismatched = list(name for name in names if remote_md5s[name] != md5sum(self.manifest[name]))
+                if mismatched:
+                    raise FileTransferError(
+                        'Could not sync files. The md5 sums of these files do not match: %s' % ', '.join(mismatched))
+
+            if span.recording:
+                span.set('transferred', len(names))
+
+        up_to_date = sorted(name for name in self.manifest if name not in names)
+        return SyncResult(hostname or self.device.host, names, up_to_date)
+
+    def _send(self, names, hostname, username, password):
+        ssh = _ssh_connect(self.device, hostname, username, password, self.port, self.window_size)
+        scp = _scp_client(ssh.get_transport(), self.buffer_size, self.progress)
+        try:
+            for name in names:
+                scp.put(self.manifest[name], self._remote_path(name))
+        except:
+            raise FileTransferError(
+                'Could not transfer file. There was an error during transfer. Please make sure remote permissions are set.')
+        finally:
+            scp.close()
+            ssh.close()
+
+
+class CollectResult(object):
+    """The outcome of pulling files from one device.
+
+    Attributes:
+        host (str): The device the files were pulled from.
+        files (dict): Local paths of the pulled files, keyed by remote file name.
+        bytes_received (int): The total size of the pulled files.
+    """
+    def __init__(self, host, files, bytes_received):
+        self.host = host
+        self.files = files
+        self.bytes_received = bytes_received
+
+    def __repr__(self):
+        return '<CollectResult %s %d files, %d bytes>' % (self.host, len(self.files), self.bytes_received)
+
+
+class FileCollector(object):
+    """Pull many files from one device over a single SSH connection.
+
+    The md5 sums of all the files are requested from the device in one
+    batched request. Each file is then streamed over SFTP into a partial
+    file next to its destination, hashed as it is written, and renamed
+    into place only if its md5 sum matches. The device needs
+    ``feature sftp-server`` enabled.
+
+    Args:
+        device (Device): The device to pull from.
+        files: The remote file names to pull, relative to ``file_system``,
+            or a dictionary mapping remote file names to local paths.
+        directory (str): The local directory that files given as a list
+            are saved into, under their basenames. Created if missing.
+
+    Keyword Args:
+        port (int): The SSH port of the device.
+        file_system (str): The remote file system, e.g. ``'logflash:'``.
+        window_size (int): The SSH channel window size in bytes.
+        buffer_size (int): The size in bytes of each read/write during transfer.
+        progress (callable): Called as ``progress(filename, size, received)``
+            as each transfer progresses.
+    """
+    def __init__(self, device, files, directory='.', port=22, file_system='bootflash:',
+                 window_size=None, buffer_size=None, progress=None):
+        self.device = device
+        self.directory = directory
+        self.manifest = self._manifest(files)
+        self.port = port
+        self.file_system = file_system
+        self.window_size = window_size
+        self.buffer_size = buffer_size
+        self.progress = progress
+
+    def _manifest(self, files):
+        if isinstance(files, dict):
+            return dict(files)
+
+        return dict((name, os.path.join(self.directory, os.path.basename(name))) for name in files)
+
+    def _remote_path(self, name):
+        return '{}{}'.format(self.file_system, name)
+
+    def collect(self, hostname=None, username=None, password=None):
+        """Pull and verify every file.
+
+        Note:
+            If any arguments are omitted, the corresponding attributes
+            of ``self.device`` will be used.
+
+        Returns:
+            CollectResult
+
+        Raises:
+            CLIError: If a remote file doesn't exist.
+            FileTransferError: If a transfer fails or a file's md5 sum doesn't match.
+        """
+        names = sorted(self.manifest)
+        with instrumentation.span('file_copy.collect', host=hostname or self.device.host,
+                                  files=len(names)) as span:
+            remote_md5s = _remote_md5s(self.device, self.file_system, names)
+
+            for local_path in self.manifest.values():
+                directory = os.path.dirname(local_path)
+                if directory and not os.path.isdir(directory):
+                    os.makedirs(directory)
+
+            bytes_received = 0
+            ssh = _ssh_connect(self.device, hostname, username, password, self.port, self.window_size)
+            try:
+                sftp = ssh.open_sftp()
+                try:
+                    for name in names:
+                        bytes_received += self._pull(sftp, name, remote_md5s[name])
+                finally:
+                    sftp.close()
+            except FileTransferError:
+                raise
+            except Exception:
+                raise FileTransferError(
+                    'Could not transfer file. There was an error during transfer. Please make sure the SFTP server is enabled.')
+            finally:
+                ssh.close()
+
+            if span.recording:
+                span.set('bytes_received', bytes_received)
+
+        return CollectResult(hostname or self.device.host, dict(self.manifest), bytes_received)
+
+    def _pull(self, sftp, name, expected_md5):
+        local_path = self.manifest[name]
+        partial_path = local_path + '.part'
+        remote_path = self._remote_path(name)
+        buffer_size = self.buffer_size or 2**15
+        digest = hashlib.md5()
+
+        try:
+            size = sftp.stat(remote_path).st_size
+            remote_file = sftp.open(remote_path, 'rb')
+            try:
+                remote_file.prefetch(size)
+                with open(partial_path, 'wb') as local_file:
+                    received = 0
+                    buf = remote_file.read(buffer_size)
+                    while buf:
+                        local_file.write(buf)
+                        digest.update(buf)
+                        received += len(buf)
+                        if self.progress is not None:
+                            self.progress(name, size, received)
+                        buf = remote_file.read(buffer_size)
+            finally:
+                remote_file.close()
+
+            if digest.hexdigest() != expected_md5:
+                raise FileTransferError(
+                    'Could not transfer file. The md5 sum of %s does not match.' % name)
+        except:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+
+        if os.path.exists(local_path):
+            os.remove(local_path)
+        os.rename(partial_path, local_path)
+
+        return received
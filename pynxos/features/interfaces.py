@@ -0,0 +1,195 @@
+import re
+
+from pynxos.lib import instrumentation
+from pynxos.lib.data_model.converters import list_from_table
+from pynxos.lib.data_model.key_maps import INTERFACE_KEY_MAP
+from pynxos.errors import CLIError, NXOSError
+
+from .base_feature import BaseFeature
+
+# Fields are renamed like ``INTERFACE_KEY_MAP`` does, but fields a view
+# doesn't have are left out rather than filled with None, so that merging
+# several views doesn't overwrite them.
+INTERFACE_NAMES = dict((value, key) for key, value in INTERFACE_KEY_MAP.items())
+
+INTERFACE_NUMBER_RE = re.compile(r'^(.*?)(\d+)$')
+
+# Maps each view to the ``show interface`` keyword selecting it, and the
+# tables of its output as (list name, interface name key) pairs.
+INTERFACE_VIEWS = {
+    'detail': ('', [('interface', 'interface')]),
+    'status': ('status', [('interface', 'interface')]),
+    'brief': ('brief', [('interface', 'interface')]),
+    'counters': ('counters', [('rx_counters', 'interface_rx'), ('tx_counters', 'interface_tx')]),
+}
+
+
+def compress_interface_names(interface_names):
+    """Return an NX-OS interface range for a list of interface names,
+    e.g. ``'Ethernet1/1-4,Ethernet1/7,mgmt0'``.
+    """
+    ranges = []
+    for name in interface_names:
+        match = INTERFACE_NUMBER_RE.match(name)
+        if match is None:
+            ranges.append([name, None, None])
+            continue
+
+        prefix, number = match.group(1), int(match.group(2))
+        if ranges and ranges[-1][0] == prefix and ranges[-1][2] == number - 1:
+            ranges[-1][2] = number
+        else:
+            ranges.append([prefix, number, number])
+
+    range_strings = []
+    for prefix, start, end in ranges:
+        if start is None:
+            range_strings.append(prefix)
+        elif start == end:
+            range_strings.append('%s%d' % (prefix, start))
+        else:
+            range_strings.append('%s%d-%d' % (prefix, start, end))
+
+    return ','.join(range_strings)
+
+
+class Interfaces(BaseFeature):
+    show_commands = ['show interface status']
+
+    # Seconds the index is reused for. Its rows include operational state,
+    # such as link status, which changes without any configuration change.
+    # ``None`` keeps it until the next configuration change.
+    index_ttl = 30
+
+    def __init__(self, device):
+        super(Interfaces, self).__init__(device)
+        self._index = None
+        self._index_expires = None
+
+    def invalidate(self):
+        super(Interfaces, self).invalidate()
+        self._index = None
+
+    def _index_is_fresh(self):
+        if self._index is None:
+            return False
+
+        return self._index_expires is None or instrumentation._monotonic() < self._index_expires
+
+    def _command(self, view, interfaces=None):
+        try:
+            keyword = INTERFACE_VIEWS[view][0]
+        except KeyError:
+            raise NXOSError('Unknown interface view: %s' % view)
+
+        command = 'show interface'
+        if interfaces:
+            if not isinstance(interfaces, str):
+                interfaces = compress_interface_names(interfaces)
+            command += ' %s' % interfaces
+        if keyword:
+            command += ' %s' % keyword
+
+        return command
+
+    def _rows(self, view, output):
+        rows = []
+        for list_name, name_key in INTERFACE_VIEWS[view][1]:
+            try:
+                table_rows = list_from_table(output, list_name)
+            except (KeyError, TypeError):
+                continue
+
+            for table_row in table_rows:
+                row = dict((INTERFACE_NAMES.get(key, key), value) for key, value in table_row.items())
+                row['interface'] = row.pop(name_key, row.get('interface'))
+                rows.append(row)
+
+        return rows
+
+    def get(self, interface, refresh=False):
+        """Return the ``show interface status`` row of one interface.
+
+        The index is used if it has been built within ``index_ttl``
+        seconds. Otherwise only this interface is queried.
+
+        Keyword Args:
+            refresh (bool): Always query the device, ignoring the index.
+
+        Returns:
+            A dictionary, empty if the interface doesn't exist.
+        """
+        if not refresh and self._index_is_fresh():
+            return self._index.get(interface, {})
+
+        try:
+            output = self.device.show(self._command('status', [interface]))
+        except CLIError:
+            return {}
+
+        rows = self._rows('status', output)
+        return rows[0] if rows else {}
+
+    def get_list(self):
+        return list(self.get_index())
+
+    def get_all(self):
+        all_interface_list = self._rows('status', self._show('show interface status'))
+        self._index = dict((x['interface'], x) for x in all_interface_list)
+        if self.index_ttl is None:
+            self._index_expires = None
+        else:
+            self._index_expires = instrumentation._monotonic() + self.index_ttl
+
+        return all_interface_list
+
+    def get_index(self, refresh=False):
+        """Return a dictionary of ``show interface status`` rows, keyed by interface name.
+
+        The index is built on first use and reused for ``index_ttl``
+        seconds, or until the device's configuration changes.
+
+        Keyword Args:
+            refresh (bool): Rebuild the index even if it is still fresh.
+        """
+        if refresh or not self._index_is_fresh():
+            self.get_all()
+
+        return self._index
+
+    def query(self, interfaces=None, views=('status',)):
+        """Fetch several views of many interfaces in a single request.
+
+        Args:
+            interfaces: A list of interface names, or an NX-OS interface range
+                such as ``'Ethernet1/1-48'``. If None, every interface is returned.
+                Lists are compressed into ranges, so thousands of ports stay
+                a short command.
+            views (list): Any of ``'status'``, ``'brief'``, ``'counters'``
+                and ``'detail'``.
+
+        Returns:
+            A dictionary keyed by interface name, merging each interface's
+            fields from all the views.
+
+        Raises:
+            CLIError: If an interface or range is invalid.
+        """
+        commands = list(self._command(view, interfaces) for view in views)
+        outputs = self.device._show_outputs(commands)
+
+        interface_index = {}
+        for view, output in zip(views, outputs):
+            for row in self._rows(view, output):
+                interface_index.setdefault(row['interface'], {}).update(row)
+
+        return interface_index
+
+    def get_counters(self, interfaces=None):
+        """Return the ``show interface counters`` of some or all interfaces, keyed by interface name.
+        """
+        return self.query(interfaces, views=['counters'])
+
+
+def instance(device):
+    return Interfaces(device)
@@ -4,31 +4,67 @@ from pynxos.errors import NXOSError
 
 from .base_feature import BaseFeature
 
-#class VlanNotInRangeError(NXOSError):
-#    def __init__(self):
-#        super(VlanNotInRangeError, self).__init__(
-#            'Vlan Id must be in range 1-3967')
-#
-#def vlan_not_in_range_error(vlan_id):
-#    vlan_id = int(vlan_id)
-#
-#    if vlan_id < 1 or vlan_id > 3967:
-#        raise VlanNotInRangeError
+class VlanNotInRangeError(NXOSError):
+    def __init__(self):
+        super(VlanNotInRangeError, self).__init__(
+            'Vlan Id must be in range 1-3967')
+
+def vlan_not_in_range_error(vlan_id):
+    vlan_id = int(vlan_id)
+
+    if vlan_id < 1 or vlan_id > 3967:
+        raise VlanNotInRangeError
+
+def expand_vlan_ids(vlan_ids):
+    """Return a sorted list of VLAN ids from a range string like ``'10-12,20'``,
+    a single id, or an iterable of ids and range strings.
+    """
+    if isinstance(vlan_ids, int):
+        vlan_ids = [vlan_ids]
+    elif isinstance(vlan_ids, str):
+        vlan_ids = vlan_ids.split(',')
+
+    expanded = set()
+    for item in vlan_ids:
+        item = str(item).strip()
+        if '-' in item:
+            start, end = item.split('-')
+            expanded.update(range(int(start), int(end) + 1))
+        elif item:
+            expanded.add(int(item))
+
+    for vlan_id in expanded:
+        vlan_not_in_range_error(vlan_id)
+
+    return sorted(expanded)
+
+def compress_vlan_ids(vlan_ids):
+    """Return NX-OS range syntax for a set of VLAN ids, e.g. ``'10-200,300'``.
+    """
+    ranges = []
+    for vlan_id in expand_vlan_ids(vlan_ids):
+        if ranges and vlan_id == ranges[-1][1] + 1:
+            ranges[-1][1] = vlan_id
+        else:
+            ranges.append([vlan_id, vlan_id])
+
+    return ','.join(str(start) if start == end else '%d-%d' % (start, end) for start, end in ranges)
 
 class Vlans(BaseFeature):
+    show_commands = ['show vlan']
 
     def __init__(self, device):
         super(Vlans, self).__init__(device)
 
-#    def get(self, vlan_id):
-#        vlan_not_in_range_error(vlan_id)
-#
-#        vlan_id_table = self.device.show('show vlan id %s' % vlan_id)
-#        try:
-#            return converted_list_from_table(
-#                vlan_id_table, 'vlanbriefid', VLAN_KEY_MAP)[0]
-#        except IndexError:
-#            return {}
+    def get(self, vlan_id):
+        vlan_not_in_range_error(vlan_id)
+
+        vlan_id_table = self.device.show('show vlan id %s' % vlan_id)
+        try:
+            return converted_list_from_table(
+                vlan_id_table, 'vlanbriefid', VLAN_KEY_MAP, host=self.device.host)[0]
+        except (IndexError, KeyError):
+            return {}
 
     def get_list(self):
         all_vlan_list = self.get_all()
@@ -37,42 +73,122 @@ class Vlans(BaseFeature):
         return vlan_id_list
 
     def get_all(self):
-        all_vlan_table = self.device.show('show vlan')
+        all_vlan_table = self._show('show vlan')
         all_vlan_list = converted_list_from_table(
-            all_vlan_table, 'vlanbrief', VLAN_KEY_MAP)
+            all_vlan_table, 'vlanbrief', VLAN_KEY_MAP, host=self.device.host)
 
         return all_vlan_list
 
-#    def config(self, vlan_id, **params):
-#        vlan_not_in_range_error(vlan_id)
-#
-#        vlan_config_commands = ['vlan %s' % vlan_id]
-#        vlan_name = params.get('name')
-#        if vlan_name:
-#            vlan_config_commands.append('name %s' % vlan_name)
-#
-#        self.device.config_list(vlan_config_commands)
-#
-#    def set_name(self, vlan_id, vlan_name=None, default=False, disable=False):
-#        vlan_not_in_range_error(vlan_id)
-#
-#        vlan_config_commands = ['vlan %s' % vlan_id]
-#        if vlan_name is None:
-#            if default or disable:
-#                name_command = 'no name'
-#            else:
-#                raise NXOSError('vlan_name must be supplied, or default or disable set to True')
-#        else:
-#            name_command = 'name %s' % vlan_name
-#
-#        vlan_config_commands.append(name_command)
-#        self.device.config_list(vlan_config_commands)
-#
-#    def remove(self, vlan_id):
-#        vlan_not_in_range_error(vlan_id)
-#
-#        vlan_remove_command = 'no vlan %s' % vlan_id
-#        self.device.config(vlan_remove_command)
-#
-#def instance(device):
-#    return Vlans(device)
\ No newline at end of file
+    def _vlan_commands(self, vlan_ids, **params):
+        vlan_config_commands = ['vlan %s' % compress_vlan_ids(vlan_ids)]
+        vlan_name = params.get('name')
+        if vlan_name:
+            vlan_config_commands.append('name %s' % vlan_name)
+
+        vlan_state = params.get('state')
+        if vlan_state:
+            vlan_config_commands.append('state %s' % vlan_state)
+
+        return vlan_config_commands
+
+    def config(self, vlan_id, **params):
+        """Create or update one or more VLANs.
+
+        Args:
+            vlan_id: A VLAN id, a range string such as ``'10-20,30'``,
+                or a list of ids.
+
+        Keyword Args:
+            name (str): The VLAN name.
+            state (str): ``'active'`` or ``'suspend'``.
+        """
+        self.device.config_list(self._vlan_commands(vlan_id, **params))
+
+    def set_name(self, vlan_id, vlan_name=None, default=False, disable=False):
+        vlan_not_in_range_error(vlan_id)
+
+        vlan_config_commands = ['vlan %s' % vlan_id]
+        if vlan_name is None:
+            if default or disable:
+                name_command = 'no name'
+            else:
+                raise NXOSError('vlan_name must be supplied, or default or disable set to True')
+        else:
+            name_command = 'name %s' % vlan_name
+
+        vlan_config_commands.append(name_command)
+        self.device.config_list(vlan_config_commands)
+
+    def remove(self, vlan_id):
+        """Remove one or more VLANs.
+
+        Args:
+            vlan_id: A VLAN id, a range string such as ``'10-20,30'``,
+                or a list of ids.
+        """
+        vlan_remove_command = 'no vlan %s' % compress_vlan_ids(vlan_id)
+        self.device.config(vlan_remove_command)
+
+    def diff(self, desired, purge=False):
+        """Return the configuration commands that bring the device's VLANs to a desired state.
+
+        VLANs without parameters, or whose parameters already match, are
+        created together with a single range command; VLANs that need a
+        name or state change get their own ``vlan`` block.
+
+        Args:
+            desired (dict): Maps VLAN ids to dictionaries of ``config``
+                parameters (``name``, ``state``), or to None. A list of ids
+                or a range string is treated as VLANs without parameters.
+
+        Keyword Args:
+            purge (bool): Also remove existing VLANs that aren't in ``desired``.
+                VLAN 1 is never removed.
+
+        Returns:
+            A list of configuration commands, empty if nothing needs to change.
+        """
+        if not isinstance(desired, dict):
+            desired = dict((vlan_id, None) for vlan_id in expand_vlan_ids(desired))
+
+        existing = dict((int(x['id']), x) for x in self.get_all())
+
+        new_vlan_ids = []
+        vlan_config_commands = []
+        for vlan_id in sorted(int(v) for v in desired):
+            params = desired.get(vlan_id, desired.get(str(vlan_id))) or {}
+            current = existing.get(vlan_id)
+
+            changed_params = dict((key, value) for key, value in params.items()
+                                  if value is not None and (current is None or current.get(key) != value))
+            if changed_params:
+                vlan_config_commands.extend(self._vlan_commands(vlan_id, **changed_params))
+            elif current is None:
+                new_vlan_ids.append(vlan_id)
+
+        if new_vlan_ids:
+            vlan_config_commands = self._vlan_commands(new_vlan_ids) + vlan_config_commands
+
+        if purge:
+            desired_ids = set(int(v) for v in desired)
+            removed_vlan_ids = list(vlan_id for vlan_id in existing
+                                    if vlan_id not in desired_ids and vlan_id != 1)
+            if removed_vlan_ids:
+                vlan_config_commands.append('no vlan %s' % compress_vlan_ids(removed_vlan_ids))
+
+        return vlan_config_commands
+
+    def sync(self, desired, purge=False):
+        """Apply the changes from ``diff`` in a single ``config_list`` request.
+
+        Returns:
+            The list of configuration commands sent, empty if nothing changed.
+        """
+        vlan_config_commands = self.diff(desired, purge=purge)
+        if vlan_config_commands:
+            self.device.config_list(vlan_config_commands)
+
+        return vlan_config_commands
+
+def instance(device):
+    return Vlans(device)
@@ -0,0 +1,299 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import functools
+import os
+import threading
+import time
+
+from pynxos.device import Device
+from pynxos.features import get_feature_class
+
+
+class FleetResult(object):
+    """The outcome of running one operation against one device.
+
+    Attributes:
+        host (str): The host the operation ran against.
+        result: The return value of the operation, or ``None`` if it failed.
+        error (Exception): The error raised by the operation, or ``None``.
+        elapsed (float): Wall-clock seconds spent on this device.
+    """
+    def __init__(self, host, result=None, error=None, elapsed=0.0):
+        self.host = host
+        self.result = result
+        self.error = error
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        if self.ok:
+            return '<FleetResult %s ok %.3fs>' % (self.host, self.elapsed)
+        return '<FleetResult %s failed %.3fs: %r>' % (self.host, self.elapsed, self.error)
+
+
+class Fleet(object):
+    """Run the same operation against many devices on a bounded thread pool.
+
+    Args:
+        inventory (list): Hosts to manage. Each entry can be a hostname,
+            a dictionary of ``Device`` keyword arguments (which must
+            include ``host``), or an existing ``Device`` instance.
+
+    Keyword Args:
+        username (str): Default username for inventory entries that don't supply one.
+        password (str): Default password for inventory entries that don't supply one.
+        max_workers (int): The maximum number of devices talked to at once.
+        **device_kwargs: Default keyword arguments passed to every ``Device``.
+    """
+    def __init__(self, inventory, username=None, password=None, max_workers=10, **device_kwargs):
+        self.max_workers = max_workers
+        self.devices = []
+
+        for entry in inventory:
+            if isinstance(entry, Device):
+                self.devices.append(entry)
+                continue
+
+            if not isinstance(entry, dict):
+                entry = dict(host=entry)
+
+            kwargs = dict(device_kwargs)
+            kwargs.update(entry)
+            kwargs.setdefault('username', username)
+            kwargs.setdefault('password', password)
+
+            self.devices.append(Device(**kwargs))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the NX-API session of every device in the fleet.
+        """
+        for device in self.devices:
+            device.close()
+
+    def _call(self, device, operation, args, kwargs, semaphore=None):
+        if semaphore is not None:
+            semaphore.acquire()
+        try:
+            start = time.time()
+            try:
+                if callable(operation):
+                    result = operation(device, *args, **kwargs)
+                else:
+                    result = getattr(device, operation)
+                    if callable(result):
+                        result = result(*args, **kwargs)
+            except Exception as e:
+                return FleetResult(device.host, error=e, elapsed=time.time() - start)
+
+            return FleetResult(device.host, result=result, elapsed=time.time() - start)
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+
+    def _run(self, operation, args, kwargs, max_concurrency=None):
+        semaphore = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = [executor.submit(self._call, device, operation, args, kwargs, semaphore)
+                       for device in self.devices]
+        finally:
+            # Lets the submitted calls run to completion without waiting here.
+            executor.shutdown(wait=False)
+
+        return (future.result() for future in as_completed(futures))
+
+    def run(self, operation, *args, **kwargs):
+        """Run an operation against every device, yielding results as each device finishes.
+
+        The operation is started on every device before this returns, so it
+        runs even if the results are never iterated. Any exception raised by
+        one device is collected on its ``FleetResult`` and doesn't stop the
+        rest of the batch.
+
+        Args:
+            operation: The name of a ``Device`` method or property
+                (e.g. ``'show_list'`` or ``'facts'``), or a callable
+                taking the device as its first argument.
+            *args: Positional arguments passed to the operation.
+            **kwargs: Keyword arguments passed to the operation.
+
+        Yields:
+            FleetResult: One per device, in completion order.
+        """
+        return self._run(operation, args, kwargs)
+
+    def show(self, command, raw_text=False):
+        return self.run('show', command, raw_text=raw_text)
+
+    def show_list(self, commands, raw_text=False):
+        return self.run('show_list', commands, raw_text=raw_text)
+
+    def config_list(self, commands):
+        return self.run('config_list', commands)
+
+    def facts(self):
+        return self.run('facts')
+
+    def reboot(self, confirm=False, wait_for_reload=True, **kwargs):
+        """Reboot every device, at most ``max_workers`` at a time.
+
+        With ``wait_for_reload``, each worker moves on to the next device as
+        soon as its current one is back, so a rolling reboot finishes as
+        fast as the devices allow. See ``Device.reboot``.
+
+        Yields:
+            FleetResult: One per device, in completion order.
+        """
+        return self.run('reboot', confirm=confirm, wait_for_reload=wait_for_reload, **kwargs)
+
+    def upgrade(self, image_name, kickstart=None, max_concurrency=None, timeout=3600, interval=10,
+                progress=None):
+        """Install a system image on every device and wait for each install to finish.
+
+        Args:
+            image_name (str): The system image file name.
+
+        Keyword Args:
+            kickstart (str): The kickstart image file name, for platforms that use one.
+            max_concurrency (int): The maximum number of devices upgrading at
+                once, if lower than ``max_workers``.
+            timeout (int): Seconds to wait for each device's install.
+            interval (float): Seconds between status polls.
+            progress (callable): Called as ``progress(host, status)`` with
+                each ``InstallStatus`` polled.
+
+        Yields:
+            FleetResult: One per device, whose result is an ``InstallResult``.
+                Failed installs carry an ``InstallError`` whose ``result``
+                is the ``InstallResult``.
+        """
+        def upgrade(device):
+            device_progress = None
+            if progress is not None:
+                device_progress = functools.partial(progress, device.host)
+
+            job = device.start_install(image_name, kickstart=kickstart)
+            result = job.wait(timeout=timeout, interval=interval, progress=device_progress)
+
+            if result.error is not None:
+                raise result.error
+            return result
+
+        return self._run(upgrade, (), {}, max_concurrency=max_concurrency)
+
+    def incremental_backup(self, store):
+        """Back up every device's running config into a ``ConfigStore``.
+
+        See ``Device.incremental_backup``.
+
+        Yields:
+            FleetResult: One per device, whose result is a ``BackupResult``.
+        """
+        return self.run('incremental_backup', store)
+
+    def file_copy_remote_exists(self, src, dest=None, file_system='bootflash:'):
+        """Check every device, in parallel, for a remote copy of a local file with the same md5 sum.
+
+        The local md5 sum is computed once and shared by all devices.
+
+        Yields:
+            FleetResult: One per device, whose result is True or False.
+        """
+        return self.run('file_copy_remote_exists', src, dest=dest, file_system=file_system)
+
+    def file_copy(self, src, dest=None, file_system='bootflash:', resume=False, progress=None, **kwargs):
+        """Push the same local file to every device, at most ``max_workers`` at a time.
+
+        Args:
+            src (str): Path to the local file to send.
+
+        Keyword Args:
+            dest (str): The remote file name. Defaults to the basename of ``src``.
+            file_system (str): The remote file system.
+            resume (bool): Continue partial transfers. See ``FileCopy.transfer_file``.
+            progress (callable): Called as ``progress(host, filename, size, sent)``.
+            **kwargs: Passed to ``FileCopy``, e.g. ``window_size`` or ``buffer_size``.
+
+        Yields:
+            FleetResult: One per device, in completion order.
+        """
+        FileCopy = get_feature_class('file_copy')
+
+        def send(device):
+            device_progress = None
+            if progress is not None:
+                device_progress = functools.partial(progress, device.host)
+
+            fc = FileCopy(device, src, dst=dest, file_system=file_system, progress=device_progress, **kwargs)
+            return fc.transfer_file(resume=resume)
+
+        return self.run(send)
+
+    def sync_files(self, files, file_system='bootflash:', progress=None, **kwargs):
+        """Sync the same local files to every device, at most ``max_workers`` at a time.
+
+        See ``Device.sync_files``. Local md5 sums are computed once and
+        shared by all devices.
+
+        Keyword Args:
+            file_system (str): The remote file system.
+            progress (callable): Called as ``progress(host, filename, size, sent)``.
+            **kwargs: Passed to ``FileSync``, e.g. ``window_size`` or ``buffer_size``.
+
+        Yields:
+            FleetResult: One per device, whose result is a ``SyncResult``.
+        """
+        FileSync = get_feature_class('file_sync')
+
+        def sync(device):
+            device_progress = None
+            if progress is not None:
+                device_progress = functools.partial(progress, device.host)
+
+            return FileSync(device, files, file_system=file_system, progress=device_progress, **kwargs).sync()
+
+        return self.run(sync)
+
+    def collect_files(self, files, directory='.', file_system='bootflash:', max_concurrency=None,
+                      progress=None, **kwargs):
+        """Pull the same remote files from every device into a directory per host.
+
+        Each device's files are pulled over one SSH connection and verified
+        against its md5 sums. See ``Device.collect_files``.
+
+        Args:
+            files (list): Remote file names relative to ``file_system``.
+
+        Keyword Args:
+            directory (str): The local directory. Each device's files are
+                saved under ``<directory>/<host>/``.
+            file_system (str): The remote file system.
+            max_concurrency (int): The maximum number of devices transferring
+                at once, if lower than ``max_workers``.
+            progress (callable): Called as ``progress(host, filename, size, received)``.
+            **kwargs: Passed to ``FileCollector``, e.g. ``window_size`` or ``buffer_size``.
+
+        Yields:
+            FleetResult: One per device, whose result is a ``CollectResult``.
+        """
+        FileCollector = get_feature_class('file_collector')
+
+        def collect(device):
+            device_progress = None
+            if progress is not None:
+                device_progress = functools.partial(progress, device.host)
+
+            collector = FileCollector(device, files, directory=os.path.join(directory, device.host),
+                                      file_system=file_system, progress=device_progress, **kwargs)
+            return collector.collect()
+
+        return self._run(collect, (), {}, max_concurrency=max_concurrency)
@@ -0,0 +1,161 @@
+import time
+
+import requests
+
+from pynxos.errors import InstallError, NXOSError
+from pynxos.lib.parsers import (InstallStatus, parse_install_status, INSTALL_FAILED, INSTALL_PENDING,
+                                INSTALL_SUCCESS, INSTALL_UNREACHABLE)
+
+INSTALL_STATUS_COMMAND = u'show install all status'
+
+
+def install_command(image_name, kickstart=None):
+    if kickstart is None:
+        return u'install all nxos %s' % image_name
+
+    return u'install all system %s kickstart %s' % (image_name, kickstart)
+
+
+class InstallResult(object):
+    """The outcome of an ``install all`` job.
+
+    Attributes:
+        host (str): The device the image was installed on.
+        status (InstallStatus): The last status read from the device.
+        elapsed (float): Seconds from starting the install to its outcome.
+        error (InstallError): Why the install failed or timed out, or None.
+    """
+    def __init__(self, host, status, elapsed, error=None):
+        self.host = host
+        self.status = status
+        self.elapsed = elapsed
+        self.error = error
+
+    @property
+    def success(self):
+        return self.error is None and self.status.state == INSTALL_SUCCESS
+
+    def __repr__(self):
+        return '<InstallResult %s %s %.0fs>' % (self.host, self.status.state, self.elapsed)
+
+
+class InstallJob(object):
+    """An ``install all`` run on one device, started without waiting for it to finish.
+
+    ``start`` sends the install command with a short request timeout and
+    returns as soon as the device has accepted it; ``poll`` reads and parses
+    ``show install all status``; ``wait`` polls until the install succeeds,
+    fails or times out. The device is expected to drop off NX-API while a
+    disruptive install reloads it.
+
+    Args:
+        device (Device): The device to install on.
+        image_name (str): The system image file name.
+
+    Keyword Args:
+        kickstart (str): The kickstart image file name, for platforms that use one.
+    """
+    def __init__(self, device, image_name, kickstart=None):
+        self.device = device
+        self.image_name = image_name
+        self.kickstart = kickstart
+        self.started = None
+        self.status = None
+        self._previous_text = None
+
+    @property
+    def command(self):
+        return install_command(self.image_name, kickstart=self.kickstart)
+
+    def _read_status(self, request_timeout):
+        return self.device.show(INSTALL_STATUS_COMMAND, raw_text=True, use_cache=False, timeout=request_timeout)
+
+    def start(self, request_timeout=10):
+        """Start the install.
+
+        Keyword Args:
+            request_timeout (int): Seconds to wait for the install command
+                to be rejected before assuming it is running.
+
+        Returns:
+            The job itself.
+
+        Raises:
+            CLIError: If the device rejects the install command, e.g.
+                because the image doesn't exist.
+        """
+        try:
+            self._previous_text = self._read_status(request_timeout)
+        except (requests.exceptions.RequestException, NXOSError):
+            self._previous_text = None
+
+        self.device._invalidate_cache()
+        self.device._disable_confirmation()
+
+        self.started = time.time()
+        try:
+            self.device.show(self.command, raw_text=True, timeout=request_timeout)
+        except requests.exceptions.RequestException:
+            pass
+
+        return self
+
+    def poll(self, request_timeout=10):
+        """Read and parse the install status once.
+
+        The status is ``'pending'`` while the device still shows the log
+        of the previous install, and ``'unreachable'`` while it doesn't
+        answer, e.g. during a reload.
+
+        Returns:
+            InstallStatus
+        """
+        try:
+            text = self._read_status(request_timeout)
+        except (requests.exceptions.RequestException, NXOSError):
+            self.status = InstallStatus(u'', INSTALL_UNREACHABLE)
+            return self.status
+
+        if text == self._previous_text:
+            self.status = InstallStatus(text, INSTALL_PENDING)
+        else:
+            self.status = parse_install_status(text)
+
+        return self.status
+
+    def wait(self, timeout=3600, interval=10, progress=None, request_timeout=10):
+        """Poll the install status until the install succeeds, fails or times out.
+
+        Keyword Args:
+            timeout (int): Seconds from ``start`` to give up after.
+            interval (float): Seconds between polls.
+            progress (callable): Called with each ``InstallStatus`` polled.
+            request_timeout (int): Seconds to wait for each poll's response.
+
+        Returns:
+            InstallResult
+        """
+        if self.started is None:
+            self.start(request_timeout=request_timeout)
+        deadline = self.started + timeout
+
+        while True:
+            status = self.poll(request_timeout=request_timeout)
+            if progress is not None:
+                progress(status)
+
+            error = None
+            if status.state == INSTALL_FAILED:
+                error = InstallError(self.device.host, status.message)
+            elif not status.done and time.time() >= deadline:
+                error = InstallError(self.device.host, 'timed out after %s seconds (%s)' % (timeout, status.state))
+
+            if status.done or error is not None:
+                if status.state == INSTALL_SUCCESS:
+                    self.device._invalidate_cache()
+                result = InstallResult(self.device.host, status, time.time() - self.started, error=error)
+                if error is not None:
+                    error.result = result
+                return result
+
+            time.sleep(max(0, min(interval, deadline - time.time())))
@@ -1 +1 @@
-from .data_model.converters import convert_dict_by_key, convert_list_by_key, converted_list_from_table, list_from_table, strip_unicode
\ No newline at end of file
+from .data_model.converters import KeyMapConverter, convert_dict_by_key, convert_list_by_key, converted_list_from_table, list_from_table, iter_list_from_stream, iter_text_from_stream, strip_unicode
\ No newline at end of file
@@ -0,0 +1,96 @@
+import asyncio
+import base64
+import ssl
+
+import aiohttp
+
+from pynxos.lib import instrumentation
+from pynxos.lib.rpc_client import RPCClient
+
+
+class AsyncRPCClient(RPCClient):
+    """An asyncio twin of ``RPCClient`` built on ``aiohttp``.
+
+    Payloads are built and responses processed exactly as in ``RPCClient``;
+    only the transport differs. ``max_concurrency`` bounds how many NX-API
+    requests to this host may be in flight at once, so a single event loop
+    can drive thousands of devices without overloading any one of them.
+    """
+    def __init__(self, host, username, password, transport=u'http', port=None, verify=True,
+                 max_concurrency=4, keep_alive=True, codec=None):
+        super(AsyncRPCClient, self).__init__(host, username, password, transport=transport, port=port,
+                                             verify=verify, pool_maxsize=max_concurrency,
+                                             keep_alive=keep_alive, codec=codec)
+        self.max_concurrency = max_concurrency
+        self._semaphore = None
+
+    def _ssl(self):
+        # ``verify`` follows ``requests``: True, False, or a CA bundle path.
+        if isinstance(self.verify, str):
+            return ssl.create_default_context(cafile=self.verify)
+        if self.verify:
+            return None
+        return False
+
+    @property
+    def session(self):
+        """Return the ``aiohttp.ClientSession`` for this host, creating it on first use.
+
+        Must be accessed from within a running event loop.
+        """
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit_per_host=self.pool_maxsize,
+                                             force_close=not self.keep_alive,
+                                             ssl=self._ssl())
+            credentials = u'%s:%s' % (self.username, self.password)
+            headers = dict(self.headers)
+            headers[u'authorization'] = u'Basic %s' % base64.b64encode(credentials.encode('utf-8')).decode('ascii')
+            if not self.keep_alive:
+                headers[u'connection'] = u'close'
+
+            self._session = aiohttp.ClientSession(connector=connector, headers=headers)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        return self._session
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def send_request(self, commands, method=u'cli', timeout=30):
+        timeout = aiohttp.ClientTimeout(total=int(timeout))
+        with instrumentation.span('rpc.send_request', host=self.host, method=method,
+                                  commands=len(commands)) as span:
+            payload_list = self._build_payload(commands, method)
+            data = self.codec.dumps(payload_list)
+            session = self.session
+
+            async with self._semaphore:
+                request_start = instrumentation._monotonic()
+                async with session.post(self.url, timeout=timeout, data=data) as response:
+                    response_body = await response.read()
+
+            decode_start = instrumentation._monotonic()
+            response_list = self.codec.loads(response_body)
+
+            if span.recording:
+                span.set('status_code', response.status)
+                span.set('bytes_sent', len(data))
+                span.set('bytes_received', len(response_body))
+                span.set('request_time', decode_start - request_start)
+                span.set('decode_time', instrumentation._monotonic() - decode_start)
+
+        return self._process_response(commands, response_list)
+
+    def send_request_stream(self, commands, method=u'cli', timeout=30):
+        """Not supported: streaming relies on the ``requests`` response of ``RPCClient``.
+        """
+        raise NotImplementedError('AsyncRPCClient does not support send_request_stream; '
+                                  'use send_request, or RPCClient for streamed responses.')
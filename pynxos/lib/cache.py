@@ -0,0 +1,95 @@
+from collections import OrderedDict
+import copy
+import threading
+import time
+
+
+class ResponseCache(object):
+    """A thread-safe LRU cache of show command output with per-command TTLs.
+
+    Entries are keyed by ``(host, command, raw_text)``, so one cache can be
+    shared by many ``Device`` objects. Any object providing ``get``, ``set``,
+    ``invalidate`` and ``generation`` with the same signatures can be used
+    in its place.
+
+    Every ``invalidate`` moves the affected hosts to a new generation. A
+    ``set`` made with the generation read before the command was sent is
+    dropped if the host has been invalidated since, so output fetched
+    before a configuration change is never cached after it.
+
+    Keyword Args:
+        maxsize (int): The maximum number of entries kept before the least
+            recently used one is evicted.
+        default_ttl (float): Seconds an entry stays valid unless its command
+            has its own TTL. ``None`` means entries never expire.
+        ttls (dict): Per-command TTLs in seconds, e.g. ``{'show version': 3600}``.
+    """
+    def __init__(self, maxsize=256, default_ttl=60, ttls=None):
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self.ttls = ttls or {}
+
+        self._entries = OrderedDict()
+        self._generation = 0
+        self._host_generations = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return the cached value for ``key``, or ``None`` if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires, value = entry
+            if expires is not None and expires <= time.time():
+                del self._entries[key]
+                return None
+
+            self._entries[key] = self._entries.pop(key)
+
+        return copy.deepcopy(value)
+
+    def generation(self, host):
+        """Return the current generation of ``host``'s entries, to pass to ``set``.
+        """
+        with self._lock:
+            return self._generation, self._host_generations.get(host, 0)
+
+    def set(self, key, value, generation=None):
+        """Cache ``value`` under ``key``.
+
+        Keyword Args:
+            generation: The value ``generation`` returned for the key's host
+                before the command was sent. If the host has been invalidated
+                since, nothing is cached.
+        """
+        host, command, raw_text = key
+        ttl = self.ttls.get(command, self.default_ttl)
+        expires = None if ttl is None else time.time() + ttl
+
+        with self._lock:
+            if generation is not None and generation != (self._generation, self._host_generations.get(host, 0)):
+                return
+
+            self._entries.pop(key, None)
+            self._entries[key] = (expires, copy.deepcopy(value))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, host=None):
+        """Drop cached entries for ``host``, or every entry if no host is given.
+        """
+        with self._lock:
+            if host is None:
+                self._generation += 1
+                self._entries.clear()
+                return
+
+            self._host_generations[host] = self._host_generations.get(host, 0) + 1
+            for key in [k for k in self._entries if k[0] == host]:
+                del self._entries[key]
@@ -0,0 +1,178 @@
+import difflib
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+# Header lines that change on every ``show running-config`` without the
+# configuration changing. They are left out when hashing and diffing.
+VOLATILE_LINE_RE = re.compile(r'^!Time:')
+
+_HOST_UNSAFE_RE = re.compile(r'[^A-Za-z0-9_.-]')
+
+
+class BackupResult(object):
+    """The outcome of backing up one device's running configuration.
+
+    Attributes:
+        host (str): The device the configuration came from.
+        digest (str): The SHA-256 of the stored snapshot.
+        changed (bool): Whether the configuration differs from the previous snapshot.
+        downloaded (bool): Whether the configuration was downloaded, or the
+            download was skipped because the change marker hadn't moved.
+        diff (list): Unified diff lines against the previous snapshot, or
+            None if nothing changed or there was no previous snapshot.
+    """
+    def __init__(self, host, digest, changed, downloaded, diff=None):
+        self.host = host
+        self.digest = digest
+        self.changed = changed
+        self.downloaded = downloaded
+        self.diff = diff
+
+    def __repr__(self):
+        state = 'changed' if self.changed else 'unchanged'
+        return '<BackupResult %s %s %s>' % (self.host, state, self.digest[:12])
+
+
+def config_lines(config):
+    """Return the lines of a running configuration, without volatile header lines.
+    """
+    return list(line for line in config.splitlines() if not VOLATILE_LINE_RE.match(line))
+
+
+def config_digest(config):
+    """Return the SHA-256 of a running configuration, ignoring volatile header lines.
+    """
+    return hashlib.sha256('\n'.join(config_lines(config)).encode('utf-8')).hexdigest()
+
+
+class ConfigStore(object):
+    """A directory of compressed, content-addressed running-config snapshots.
+
+    Snapshots are stored once per distinct content under ``objects/``,
+    gzip-compressed and named by their SHA-256, so unchanged devices and
+    devices sharing a configuration cost no extra space. Each host has a
+    version history under ``hosts/<host>.json`` and the line diff of every
+    change under ``hosts/<host>/<digest>.diff.gz``.
+
+    Different hosts can be backed up from different threads at once.
+
+    Args:
+        directory (str): The root directory of the store. Created if missing.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        self._host_locks = {}
+        self._lock = threading.Lock()
+
+    def _host_name(self, host):
+        return _HOST_UNSAFE_RE.sub('_', host)
+
+    def _host_lock(self, host):
+        with self._lock:
+            return self._host_locks.setdefault(host, threading.Lock())
+
+    def _index_path(self, host):
+        return os.path.join(self.directory, 'hosts', self._host_name(host) + '.json')
+
+    def _object_path(self, digest):
+        return os.path.join(self.directory, 'objects', digest[:2], digest + '.gz')
+
+    def _diff_path(self, host, digest):
+        return os.path.join(self.directory, 'hosts', self._host_name(host), digest + '.diff.gz')
+
+    def _write(self, path, data, compress=True):
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                if not os.path.isdir(directory):
+                    raise
+
+        tmp_path = '%s.%d.%d' % (path, os.getpid(), threading.current_thread().ident)
+        opener = gzip.open if compress else open
+        with opener(tmp_path, 'wb') as f:
+            f.write(data.encode('utf-8'))
+        os.rename(tmp_path, path)
+
+    def versions(self, host):
+        """Return the version history of a host, oldest first.
+
+        Each version is a dictionary with ``digest``, ``marker``, ``time``
+        (when the snapshot was first stored) and ``checked`` (when it was
+        last downloaded from the device) keys.
+        """
+        try:
+            with open(self._index_path(host)) as f:
+                return json.load(f)['versions']
+        except (IOError, OSError):
+            return []
+
+    def latest(self, host):
+        """Return the newest version of a host, or None if it has never been backed up.
+        """
+        versions = self.versions(host)
+        return versions[-1] if versions else None
+
+    def get(self, digest):
+        """Return the content of a snapshot.
+        """
+        with gzip.open(self._object_path(digest), 'rb') as f:
+            return f.read().decode('utf-8')
+
+    def get_diff(self, host, digest):
+        """Return the diff lines stored for a host's version, or None if it has no diff.
+        """
+        try:
+            with gzip.open(self._diff_path(host, digest), 'rb') as f:
+                return f.read().decode('utf-8').splitlines()
+        except (IOError, OSError):
+            return None
+
+    def save(self, host, config, marker=None):
+        """Store a host's running configuration if it changed since the last snapshot.
+
+        Args:
+            host (str): The device the configuration came from.
+            config (str): The ``show running-config`` output.
+
+        Keyword Args:
+            marker (str): A change indicator read from the device, stored so
+                the next backup can be skipped if it is unchanged.
+
+        Returns:
+            BackupResult
+        """
+        digest = config_digest(config)
+
+        with self._host_lock(host):
+            versions = self.versions(host)
+            previous = versions[-1] if versions else None
+            if previous is not None and previous['digest'] == digest:
+                changed = False
+                diff = None
+            else:
+                changed = True
+                if not os.path.exists(self._object_path(digest)):
+                    self._write(self._object_path(digest), config)
+
+                diff = None
+                if previous is not None:
+                    diff = list(difflib.unified_diff(
+                        config_lines(self.get(previous['digest'])), config_lines(config),
+                        fromfile=previous['digest'], tofile=digest, lineterm=''))
+                    self._write(self._diff_path(host, digest), '\n'.join(diff))
+
+            now = time.time()
+            if changed:
+                versions.append(dict(digest=digest, marker=marker, time=now, checked=now))
+            else:
+                previous.update(marker=marker, checked=now)
+            self._write(self._index_path(host), json.dumps(dict(versions=versions)), compress=False)
+
+        return BackupResult(host, digest, changed=changed, downloaded=True, diff=diff)
@@ -1,5 +1,13 @@
 import sys
+import re
+import codecs
 import collections
+import json
+
+from builtins import chr
+
+from pynxos.errors import CLIError
+from pynxos.lib import instrumentation
 
 def strip_unicode(data):
     if sys.version_info.major >= 3:
@@ -37,17 +45,75 @@ def convert_dict_by_key(original, key_map, fill_in=False, whitelist=[], blacklis
 
     return converted
 
-def convert_list_by_key(original_list, key_map, fill_in=False, whitelist=[], blacklist=[]):
-    converted_list = []
-    for original in original_list:
-        converted_list.append(
-            convert_dict_by_key(original,
-                                key_map,
-                                fill_in=fill_in,
-                                whitelist=whitelist,
-                                blacklist=blacklist))
+class KeyMapConverter(object):
+    """A key map compiled once for converting many rows.
+
+    Produces the same output as ``convert_dict_by_key`` with the same
+    arguments, but the key map items and the key sets used by ``fill_in``
+    are computed once rather than for every row.
+
+    Args:
+        key_map (dict): Maps converted keys to original keys.
+
+    Keyword Args:
+        fill_in (bool): Whether to copy unmapped keys from the original rows.
+        whitelist (list): If given with ``fill_in``, only these unmapped keys are copied.
+        blacklist (list): Unmapped keys never to copy with ``fill_in``.
+    """
+    def __init__(self, key_map, fill_in=False, whitelist=[], blacklist=[]):
+        self.items = list(key_map.items())
+        self.fill_in = fill_in
+
+        mapped_keys = set(key_map.values())
+        self.whitelist = list(set(whitelist) - mapped_keys)
+        self.excluded = set(blacklist) | mapped_keys
+
+    def convert(self, original):
+        return self.convert_list([original])[0]
+
+    def convert_list(self, original_list):
+        items = self.items
+        fill_in = self.fill_in
+        whitelist = self.whitelist
+        excluded = self.excluded
+
+        converted_list = []
+        for original in original_list:
+            converted = {}
+            for converted_key, original_key in items:
+                converted[converted_key] = original[original_key] if original_key in original else None
+
+            if fill_in:
+                if whitelist:
+                    for original_key in whitelist:
+                        if original_key in original:
+                            converted[original_key] = original[original_key]
+                else:
+                    for original_key in original:
+                        if original_key not in excluded:
+                            converted[original_key] = original[original_key]
+
+            converted_list.append(converted)
+
+        return converted_list
+
+    def convert_columns(self, original_list):
+        """Convert rows into a column-oriented dictionary of lists.
+
+        Only the mapped keys, plus the whitelisted keys when ``fill_in`` is
+        set, become columns; missing values are ``None``.
+        """
+        columns = list(self.items)
+        if self.fill_in:
+            columns.extend((key, key) for key in self.whitelist)
+
+        return {converted_key: [original.get(original_key) for original in original_list]
+                for converted_key, original_key in columns}
 
-    return converted_list
+
+def convert_list_by_key(original_list, key_map, fill_in=False, whitelist=[], blacklist=[]):
+    converter = KeyMapConverter(key_map, fill_in=fill_in, whitelist=whitelist, blacklist=blacklist)
+    return converter.convert_list(original_list)
 
 def list_from_table(table, list_name):
     if table is None:
@@ -63,12 +129,246 @@ def list_from_table(table, list_name):
 
     return the_list
 
-def converted_list_from_table(table, list_name, key_map, fill_in=False, whitelist=[], blacklist=[]):
-    from_table_list = list_from_table(table, list_name)
-    converted_list = convert_list_by_key(from_table_list,
-                                         key_map,
-                                         fill_in=fill_in,
-                                         whitelist=whitelist,
-                                         blacklist=blacklist)
+def iter_list_from_stream(stream, list_name, command=None):
+    """Yield the ``ROW_`` entries of a ``TABLE_`` from an NX-API JSON response
+    as they are parsed, without loading the whole response into memory.
+
+    Requires the optional ``ijson`` package.
+
+    Args:
+        stream: A binary file-like object containing the JSON-RPC response.
+        list_name (str): The name of the table, e.g. ``'interface'`` for
+            ``TABLE_interface``/``ROW_interface``. A list of names selects a
+            nested table, e.g. ``['vrf', 'addrf', 'prefix']``.
+
+    Keyword Args:
+        command (str): The command that produced the response, used in errors.
+
+    Raises:
+        CLIError: If the response contains a JSON-RPC error.
+    """
+    import ijson
+    from ijson.common import ObjectBuilder
+
+    if not isinstance(list_name, list):
+        list_name = [list_name]
+
+    table_path = r'\.'.join(r'TABLE_{0}\.ROW_{0}(?:\.item)?'.format(re.escape(name)) for name in list_name)
+    row_re = re.compile(r'^(?:item\.)?result\.body\.%s$' % table_path)
+    error_re = re.compile(r'^(?:item\.)?error$')
+
+    builder = None
+    builder_prefix = None
+    is_error = False
+    for prefix, event, value in ijson.parse(stream, use_float=True):
+        if builder is None:
+            if event == u'start_map':
+                if row_re.match(prefix):
+                    is_error = False
+                elif error_re.match(prefix):
+                    is_error = True
+                else:
+                    continue
+
+                builder = ObjectBuilder()
+                builder_prefix = prefix
+                builder.event(event, value)
+            continue
+
+        builder.event(event, value)
+        if event == u'end_map' and prefix == builder_prefix:
+            if is_error:
+                error = builder.value
+                raise CLIError(command, error.get(u'data', {}).get(u'msg', 'Invalid command.'))
+
+            yield builder.value
+            builder = None
+
+
+_JSON_ESCAPES = {u'"': u'"', u'\\': u'\\', u'/': u'/', u'b': u'\b', u'f': u'\f', u'n': u'\n', u'r': u'\r', u't': u'\t'}
+_JSON_STRING_SPECIAL_RE = re.compile(r'["\\]')
+_JSON_WHITESPACE = u' \t\r\n'
+
+
+def _decode_json_escape(text, pos):
+    """Decode the escape sequence starting at ``text[pos]``, a backslash.
 
-    return converted_list
\ No newline at end of file
+    Returns:
+        A tuple of the decoded text and the length of the escape, or None
+        if ``text`` ends before the escape does.
+    """
+    if pos + 1 >= len(text):
+        return None
+
+    kind = text[pos + 1]
+    if kind != u'u':
+        return _JSON_ESCAPES[kind], 2
+
+    if pos + 6 > len(text):
+        return None
+
+    code = int(text[pos + 2:pos + 6], 16)
+    if 0xd800 <= code < 0xdc00:
+        if pos + 12 > len(text):
+            return None
+        if text[pos + 6:pos + 8] == u'\\u':
+            low = int(text[pos + 8:pos + 12], 16)
+            if 0xdc00 <= low < 0xe000:
+                return chr(0x10000 + ((code - 0xd800) << 10) + (low - 0xdc00)), 12
+
+    return chr(code), 6
+
+
+def _escaped(text, start, pos):
+    backslashes = 0
+    while pos - backslashes > start and text[pos - backslashes - 1] == u'\\':
+        backslashes += 1
+
+    return backslashes % 2 == 1
+
+
+def _closing_quote(text, pos):
+    """Return the index of the quote ending the JSON string that continues at ``pos``, or None.
+    """
+    end = text.find(u'"', pos)
+    while end != -1 and _escaped(text, pos, end):
+        end = text.find(u'"', end + 1)
+
+    return end if end != -1 else None
+
+
+def _complete_escapes_end(text, pos):
+    """Return where the JSON string text from ``pos`` can be cut without
+    splitting an escape sequence.
+    """
+    index = text.find(u'\\', max(pos, len(text) - 12))
+    while index != -1:
+        if _escaped(text, pos, index):
+            index += 1
+        else:
+            escape = _decode_json_escape(text, index)
+            if escape is None:
+                return index
+            index += escape[1]
+        index = text.find(u'\\', index)
+
+    return len(text)
+
+
+def iter_text_from_stream(stream, command=None, chunk_size=65536):
+    """Yield the raw text output (``result.msg``) of a ``cli_ascii`` NX-API
+    response in pieces as it is read, without loading the whole response
+    into memory.
+
+    Unlike ``iter_list_from_stream`` this needs no optional packages.
+
+    Args:
+        stream: A binary file-like object containing the JSON-RPC response
+            for a single command.
+
+    Keyword Args:
+        command (str): The command that produced the response, used in errors.
+        chunk_size (int): The number of bytes read from ``stream`` at a time.
+
+    Raises:
+        CLIError: If the response contains a JSON-RPC error.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    head = []
+    stack = []
+    last_string = None
+    string_chars = None
+    emit = False
+    eof = False
+    text = u''
+    pos = 0
+
+    while True:
+        in_string = emit or string_chars is not None
+        if pos >= len(text) or (in_string and text[pos] == u'\\' and _decode_json_escape(text, pos) is None):
+            if eof:
+                break
+
+            data = stream.read(chunk_size)
+            eof = not data
+            new_text = decoder.decode(data, final=eof)
+            if head is not None:
+                head.append(new_text)
+            text = text[pos:] + new_text
+            pos = 0
+            continue
+
+        if emit:
+            end = _closing_quote(text, pos)
+            stop = end if end is not None else _complete_escapes_end(text, pos)
+            if stop > pos:
+                yield json.loads(u'"%s"' % text[pos:stop], strict=False)
+            if end is not None:
+                return
+            pos = stop
+            continue
+
+        if in_string:
+            pieces = []
+            while pos < len(text):
+                match = _JSON_STRING_SPECIAL_RE.search(text, pos)
+                end = match.start() if match else len(text)
+                pieces.append(text[pos:end])
+                pos = end
+                if match is None or text[end] == u'"':
+                    break
+
+                escape = _decode_json_escape(text, end)
+                if escape is None:
+                    break
+                pieces.append(escape[0])
+                pos += escape[1]
+
+            if len(string_chars) < 64:
+                string_chars.extend(pieces)
+            if pos < len(text) and text[pos] == u'"':
+                last_string = u''.join(string_chars)
+                string_chars = None
+                pos += 1
+            continue
+
+        char = text[pos]
+        pos += 1
+        if char in _JSON_WHITESPACE:
+            continue
+        elif char == u'{' or char == u'[':
+            stack.append([char, None])
+        elif char == u'}' or char == u']':
+            stack.pop()
+        elif char == u',' and stack and stack[-1][0] == u'{':
+            stack[-1][1] = None
+        elif char == u':':
+            stack[-1][1] = last_string
+        elif char == u'"':
+            keys = list(key for container, key in stack if container == u'{')
+            if keys == [u'result', u'msg']:
+                emit = True
+                head = None
+            else:
+                string_chars = []
+
+    response = json.loads(u''.join(head)) if head and u''.join(head).strip() else {}
+    if isinstance(response, list):
+        response = response[0] if response else {}
+
+    error = response.get(u'error')
+    if error:
+        raise CLIError(command, error.get(u'data', {}).get(u'msg', 'Invalid command.'))
+
+
+def converted_list_from_table(table, list_name, key_map, fill_in=False, whitelist=[], blacklist=[], host=None):
+    with instrumentation.span('converters.converted_list_from_table', host=host, list_name=list_name) as span:
+        from_table_list = list_from_table(table, list_name)
+        converted_list = convert_list_by_key(from_table_list,
+                                             key_map,
+                                             fill_in=fill_in,
+                                             whitelist=whitelist,
+                                             blacklist=blacklist)
+        span.set('rows', len(converted_list))
+
+    return converted_list
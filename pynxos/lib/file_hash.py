@@ -0,0 +1,127 @@
+from collections import OrderedDict
+import hashlib
+import mmap
+import os
+import threading
+
+MD5_CACHE_DIR_ENV = 'PYNXOS_MD5_CACHE_DIR'
+
+# The most file versions whose md5 sums are kept in memory. The least
+# recently used sum is evicted first.
+MD5_CACHE_MAXSIZE = 1024
+
+_md5_cache = OrderedDict()
+_md5_locks = {}
+_md5_cache_lock = threading.Lock()
+
+
+def _cache_key(path):
+    stat = os.stat(path)
+    mtime = getattr(stat, 'st_mtime_ns', stat.st_mtime)
+    return (os.path.realpath(path), stat.st_size, mtime, stat.st_ino)
+
+
+def _cache_file(cache_dir, key):
+    name = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, name + '.md5')
+
+
+def _read_cache_file(cache_dir, key):
+    try:
+        with open(_cache_file(cache_dir, key)) as f:
+            return f.read().strip() or None
+    except (IOError, OSError):
+        return None
+
+
+def _write_cache_file(cache_dir, key, digest):
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+
+        path = _cache_file(cache_dir, key)
+        tmp_path = '%s.%d.%d' % (path, os.getpid(), threading.current_thread().ident)
+        with open(tmp_path, 'w') as f:
+            f.write(digest)
+        os.rename(tmp_path, path)
+    except (IOError, OSError):
+        pass
+
+
+def _compute_md5(path, blocksize):
+    m = hashlib.md5()
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return m.hexdigest()
+
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            view = memoryview(mapped)
+            try:
+                for offset in range(0, len(mapped), blocksize):
+                    m.update(view[offset:offset + blocksize])
+            finally:
+                view.release()
+        finally:
+            mapped.close()
+
+    return m.hexdigest()
+
+
+def md5sum(path, blocksize=2**20, cache_dir=None):
+    """Return the md5 sum of a local file, computing it at most once per file version.
+
+    Results are cached in memory, keyed on the file's real path, size, mtime
+    and inode, so modifying or replacing the file invalidates its entry.
+    At most ``MD5_CACHE_MAXSIZE`` sums are kept, least recently used first out.
+    Concurrent callers for the same file wait for a single computation.
+    The file is read through ``mmap`` to avoid copying it into Python buffers.
+
+    Args:
+        path (str): The local file path.
+
+    Keyword Args:
+        blocksize (int): How many bytes to hash at a time.
+        cache_dir (str): A directory used to share results between processes.
+            Defaults to the ``PYNXOS_MD5_CACHE_DIR`` environment variable;
+            if neither is set, results are only cached in memory.
+    """
+    key = _cache_key(path)
+    cache_dir = cache_dir or os.environ.get(MD5_CACHE_DIR_ENV)
+
+    with _md5_cache_lock:
+        digest = _md5_cache.get(key)
+        if digest is not None:
+            _md5_cache[key] = _md5_cache.pop(key)
+            return digest
+        key_lock = _md5_locks.setdefault(key, threading.Lock())
+
+    with key_lock:
+        try:
+            with _md5_cache_lock:
+                digest = _md5_cache.get(key)
+            if digest is None and cache_dir:
+                digest = _read_cache_file(cache_dir, key)
+
+            if digest is None:
+                digest = _compute_md5(path, blocksize)
+                if cache_dir:
+                    _write_cache_file(cache_dir, key, digest)
+
+            with _md5_cache_lock:
+                _md5_cache.pop(key, None)
+                _md5_cache[key] = digest
+                while len(_md5_cache) > MD5_CACHE_MAXSIZE:
+                    _md5_cache.popitem(last=False)
+        finally:
+            with _md5_cache_lock:
+                _md5_locks.pop(key, None)
+
+    return digest
+
+
+def clear_md5_cache():
+    """Forget every md5 sum cached in memory by this process.
+    """
+    with _md5_cache_lock:
+        _md5_cache.clear()
@@ -0,0 +1,141 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Durations are measured on a monotonic clock, so adjusting the wall
+# clock (e.g. by NTP) mid-operation doesn't skew them.
+_monotonic = getattr(time, 'monotonic', time.time)
+
+_hooks = []
+
+
+class Span(object):
+    """A timed operation, passed to every registered hook when it ends.
+
+    A hook that raises is logged and skipped, so it can't hide the
+    operation's own error or stop the other hooks.
+
+    Attributes:
+        name (str): The operation, e.g. ``'rpc.send_request'``.
+        attributes (dict): Details such as ``host``, ``commands``,
+            ``bytes_sent`` and per-phase times in seconds.
+        start (float): The start time, as seconds since the epoch.
+        duration (float): Seconds the operation took.
+        error (Exception): The exception raised by the operation, if any.
+    """
+    recording = True
+
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = attributes
+        self.start = None
+        self.duration = None
+        self.error = None
+        self._started = None
+
+    def __enter__(self):
+        self.start = time.time()
+        self._started = _monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.duration = _monotonic() - self._started
+        self.error = exc_value
+        for hook in list(_hooks):
+            try:
+                hook(self)
+            except Exception:
+                logger.exception('Instrumentation hook %r failed on span %s', hook, self.name)
+
+    def set(self, key, value):
+        self.attributes[key] = value
+
+    def __repr__(self):
+        return '<Span %s %.6fs %r>' % (self.name, self.duration or 0, self.attributes)
+
+
+class _NoopSpan(object):
+    recording = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    def set(self, key, value):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name, **attributes):
+    """Return a context manager timing an operation.
+
+    When no hooks are registered this returns a shared no-op object, so
+    instrumented code paths cost one list check.
+    """
+    if not _hooks:
+        return _NOOP_SPAN
+
+    return Span(name, attributes)
+
+
+def add_hook(hook):
+    """Register a callable to be called with every finished ``Span``.
+    """
+    if hook not in _hooks:
+        _hooks.append(hook)
+
+
+def remove_hook(hook):
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+class MetricsHook(object):
+    """A hook aggregating counts, errors, bytes and time per host and operation.
+
+    Example:
+        metrics = MetricsHook()
+        add_hook(metrics)
+        ...
+        metrics.metrics['n9k1']['rpc.send_request']['errors']
+    """
+    def __init__(self):
+        self.metrics = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, span):
+        host = span.attributes.get('host')
+        with self._lock:
+            counters = self.metrics.setdefault(host, {}).setdefault(span.name, dict(
+                count=0, errors=0, duration=0.0, bytes_sent=0, bytes_received=0))
+            counters['count'] += 1
+            counters['duration'] += span.duration
+            counters['bytes_sent'] += span.attributes.get('bytes_sent', 0)
+            counters['bytes_received'] += span.attributes.get('bytes_received', 0)
+            if span.error is not None:
+                counters['errors'] += 1
+
+
+class OpenTelemetryHook(object):
+    """A hook exporting every span to an OpenTelemetry tracer.
+
+    Args:
+        tracer: An ``opentelemetry.trace.Tracer``.
+    """
+    def __init__(self, tracer):
+        self.tracer = tracer
+
+    def __call__(self, span):
+        start_ns = int(span.start * 1e9)
+        attributes = dict((key, value) for key, value in span.attributes.items()
+                          if isinstance(value, (bool, int, float, str)))
+        otel_span = self.tracer.start_span(span.name, start_time=start_ns, attributes=attributes)
+        if span.error is not None:
+            otel_span.record_exception(span.error)
+        otel_span.end(end_time=start_ns + int(span.duration * 1e9))
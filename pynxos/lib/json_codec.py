@@ -0,0 +1,77 @@
+import json
+
+from pynxos.errors import NXOSError
+
+
+class JSONCodec(object):
+    """A named pair of JSON encode/decode functions.
+
+    ``dumps`` may return ``str`` or ``bytes``; ``loads`` must accept ``bytes``
+    so responses can be decoded without building ``response.text``.
+    """
+    def __init__(self, name, dumps, loads):
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+    def __repr__(self):
+        return '<JSONCodec %s>' % self.name
+
+
+def _orjson_codec():
+    import orjson
+    return JSONCodec('orjson', orjson.dumps, orjson.loads)
+
+
+def _ujson_codec():
+    import ujson
+    return JSONCodec('ujson', ujson.dumps, ujson.loads)
+
+
+def _simdjson_codec():
+    import simdjson
+    return JSONCodec('simdjson', json.dumps, simdjson.loads)
+
+
+def _stdlib_codec():
+    return JSONCodec('json', json.dumps, json.loads)
+
+
+CODEC_LOADERS = {
+    'orjson': _orjson_codec,
+    'ujson': _ujson_codec,
+    'simdjson': _simdjson_codec,
+    'json': _stdlib_codec,
+}
+
+CODEC_PREFERENCE = ['orjson', 'ujson', 'simdjson', 'json']
+
+
+def get_codec(name=None):
+    """Return a JSON codec.
+
+    Args:
+        name (str): One of ``'orjson'``, ``'ujson'``, ``'simdjson'`` or ``'json'``.
+            If None, the fastest installed codec is returned, falling back
+            to the standard library.
+
+    Raises:
+        NXOSError: If the named codec is unknown or not installed.
+    """
+    if name is None:
+        for candidate in CODEC_PREFERENCE:
+            try:
+                return CODEC_LOADERS[candidate]()
+            except ImportError:
+                continue
+
+    if name not in CODEC_LOADERS:
+        raise NXOSError('\'%s\' is an unknown JSON codec.' % name)
+
+    try:
+        return CODEC_LOADERS[name]()
+    except ImportError:
+        raise NXOSError('The \'%s\' JSON codec is not installed.' % name)
+
+
+default_codec = get_codec()
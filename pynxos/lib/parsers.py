@@ -0,0 +1,280 @@
+"""Parsers for raw-text command outputs.
+
+Each parser takes the output of one command and returns a typed result.
+Parsers are registered against a regular expression matching the command,
+so ``parse`` can be applied to every output of a batched ``show_list``.
+"""
+import re
+
+from pynxos.errors import ParserNotFoundError
+
+INSTALL_PENDING = 'pending'
+INSTALL_IN_PROGRESS = 'in_progress'
+INSTALL_RELOADING = 'reloading'
+INSTALL_UNREACHABLE = 'unreachable'
+INSTALL_SUCCESS = 'success'
+INSTALL_FAILED = 'failed'
+
+INSTALL_LAST_LOG_HEADER = u'This is the log of last installation.'
+
+_BOOT_NEXT_RELOAD_HEADER = u'Boot Variables on next reload'
+_BOOT_VARIABLE_RE = re.compile(r'^(kickstart|system|NXOS) variable = (?:[\w-]+:/*)?(\S+)', re.MULTILINE)
+_BOOT_VARIABLE_KEYS = {u'kickstart': 'kick', u'system': 'sys', u'NXOS': 'sys'}
+
+_DIR_ENTRY_RE = re.compile(r'^\s*(\d+)\s+(\w{3}\s+\d+\s+\d{2}:\d{2}:\d{2}\s+\d{4})\s+(.+?)\s*$', re.MULTILINE)
+_DIR_USAGE_RE = re.compile(r'^\s*(\d+) bytes (used|free|total)', re.MULTILINE)
+_DIR_MISSING_RE = re.compile(r'No such file', re.IGNORECASE)
+
+_MD5SUM_RE = re.compile(r'\b([0-9a-fA-F]{32})\b')
+
+_INSTALL_STEP_RESULT_RE = re.compile(r'^\s*(?:--\s*)?(SUCCESS|FAIL(?:ED|URE)?)\b(.*)$')
+_INSTALL_COMPATIBILITY_ROW_RE = re.compile(r'^\s*(\d+)\s+(yes|no)\s+(\S+)\s+(\S+)\s*(.*?)\s*$')
+_INSTALL_UPGRADE_ROW_RE = re.compile(r'^\s*(\d+)\s+(\S+)\s+(\S+)\s+(\S+)\s+(yes|no)\s*$')
+_INSTALL_SUCCESS_RE = re.compile(r'Install has been successful|upgrade successful', re.IGNORECASE)
+_INSTALL_FAILED_RE = re.compile(r'Install has failed|Installation failed|Pre-upgrade check failed|'
+                                r'Install all currently is not supported|aborted', re.IGNORECASE)
+_INSTALL_RELOADING_RE = re.compile(r'switch will reboot|Rebooting the switch', re.IGNORECASE)
+_INSTALL_DISRUPTIVE_RE = re.compile(r'will be reloaded for disruptive upgrade', re.IGNORECASE)
+
+
+class InstallStatus(object):
+    """A snapshot of an ``install all`` run, parsed from ``show install all status``.
+
+    Attributes:
+        text (str): The raw status output.
+        state (str): One of ``'pending'``, ``'in_progress'``, ``'reloading'``,
+            ``'unreachable'``, ``'success'`` or ``'failed'``.
+        steps (list): ``(step, result)`` tuples, e.g.
+            ``('Verifying image type.', 'SUCCESS')``, in order.
+        compatibility (list): Dictionaries with ``module``, ``bootable``,
+            ``impact``, ``install_type`` and ``reason`` keys.
+        upgrades (list): Dictionaries with ``module``, ``image``,
+            ``running_version``, ``new_version`` and ``upgrade_required`` keys.
+        disruptive (bool): Whether the install reloads the switch.
+        finished (bool): Whether the output is the log of a finished install.
+    """
+    def __init__(self, text, state, steps=None, compatibility=None, upgrades=None, disruptive=False,
+                 finished=False):
+        self.text = text
+        self.state = state
+        self.steps = steps or []
+        self.compatibility = compatibility or []
+        self.upgrades = upgrades or []
+        self.disruptive = disruptive
+        self.finished = finished
+
+    @property
+    def done(self):
+        return self.state in (INSTALL_SUCCESS, INSTALL_FAILED)
+
+    @property
+    def completed_steps(self):
+        return len(self.steps)
+
+    @property
+    def message(self):
+        """The last line of the status output.
+        """
+        lines = list(line.strip() for line in (self.text or u'').splitlines() if line.strip())
+        return lines[-1] if lines else u''
+
+    def __repr__(self):
+        return '<InstallStatus %s %d steps>' % (self.state, len(self.steps))
+
+
+def parse_install_status(text):
+    """Parse ``show install all status`` output.
+
+    Returns:
+        InstallStatus
+    """
+    steps = []
+    compatibility = []
+    upgrades = []
+    failed = False
+    step = None
+
+    for line in text.splitlines():
+        result_match = _INSTALL_STEP_RESULT_RE.match(line)
+        if result_match:
+            result = result_match.group(1)
+            steps.append((step, result))
+            step = None
+            if result != u'SUCCESS':
+                failed = True
+            continue
+
+        row_match = _INSTALL_COMPATIBILITY_ROW_RE.match(line)
+        if row_match:
+            compatibility.append(dict(zip(('module', 'bootable', 'impact', 'install_type', 'reason'),
+                                          row_match.groups())))
+            continue
+
+        row_match = _INSTALL_UPGRADE_ROW_RE.match(line)
+        if row_match:
+            upgrades.append(dict(zip(('module', 'image', 'running_version', 'new_version', 'upgrade_required'),
+                                     row_match.groups())))
+            continue
+
+        if line.strip():
+            step = line.strip()
+
+    finished = text.lstrip().startswith(INSTALL_LAST_LOG_HEADER)
+    reloading = _INSTALL_RELOADING_RE.search(text) is not None
+
+    if failed or _INSTALL_FAILED_RE.search(text):
+        state = INSTALL_FAILED
+    elif _INSTALL_SUCCESS_RE.search(text) or (finished and reloading):
+        state = INSTALL_SUCCESS
+    elif reloading:
+        state = INSTALL_RELOADING
+    else:
+        state = INSTALL_IN_PROGRESS
+
+    return InstallStatus(text, state, steps=steps, compatibility=compatibility, upgrades=upgrades,
+                         disruptive=_INSTALL_DISRUPTIVE_RE.search(text) is not None, finished=finished)
+
+
+class BootVariables(object):
+    """Boot images parsed from ``show boot``.
+
+    Each dictionary maps ``'sys'`` and, on platforms that use one,
+    ``'kick'`` to an image file name without its file system.
+
+    Attributes:
+        current (dict): The images the device booted from.
+        next_reload (dict): The images the device will boot from next.
+    """
+    def __init__(self, current, next_reload):
+        self.current = current
+        self.next_reload = next_reload
+
+    def __repr__(self):
+        return '<BootVariables %r>' % self.next_reload
+
+
+class DirectoryEntry(object):
+    """A file or directory listed by ``dir``.
+
+    Attributes:
+        name (str): The name, with a trailing ``/`` for directories.
+        size (int): The size in bytes.
+        modified (str): The modification time as printed by the device.
+    """
+    def __init__(self, name, size, modified):
+        self.name = name
+        self.size = size
+        self.modified = modified
+
+    @property
+    def is_dir(self):
+        return self.name.endswith(u'/')
+
+    def __repr__(self):
+        return '<DirectoryEntry %s %d>' % (self.name, self.size)
+
+
+class DirectoryListing(object):
+    """A ``dir`` listing of a file system or path.
+
+    Attributes:
+        entries (dict): ``DirectoryEntry`` objects keyed by name.
+        bytes_used (int): Bytes used on the file system, or None if not shown.
+        bytes_free (int): Bytes free on the file system, or None if not shown.
+        bytes_total (int): The size of the file system, or None if not shown.
+        missing (bool): Whether the device reported that the path doesn't exist.
+    """
+    def __init__(self, entries, bytes_used=None, bytes_free=None, bytes_total=None, missing=False):
+        self.entries = entries
+        self.bytes_used = bytes_used
+        self.bytes_free = bytes_free
+        self.bytes_total = bytes_total
+        self.missing = missing
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def __repr__(self):
+        return '<DirectoryListing %d entries, %s bytes free>' % (len(self.entries), self.bytes_free)
+
+
+def parse_show_boot(text):
+    """Parse ``show boot`` output.
+
+    Returns:
+        BootVariables
+    """
+    current_text, _, next_text = text.partition(_BOOT_NEXT_RELOAD_HEADER)
+
+    def variables(section):
+        return dict((_BOOT_VARIABLE_KEYS[kind], name) for kind, name in _BOOT_VARIABLE_RE.findall(section))
+
+    return BootVariables(variables(current_text), variables(next_text))
+
+
+def parse_dir(text):
+    """Parse ``dir [<file system>[<path>]]`` output.
+
+    Returns:
+        DirectoryListing
+    """
+    entries = dict((name, DirectoryEntry(name, int(size), modified))
+                   for size, modified, name in _DIR_ENTRY_RE.findall(text))
+    usage = dict((kind, int(size)) for size, kind in _DIR_USAGE_RE.findall(text))
+
+    return DirectoryListing(entries, bytes_used=usage.get('used'), bytes_free=usage.get('free'),
+                            bytes_total=usage.get('total'), missing=_DIR_MISSING_RE.search(text) is not None)
+
+
+def parse_md5sum(output):
+    """Parse ``show file <path> md5sum`` output, structured or raw text.
+
+    Returns:
+        The lowercase hex digest, or None if the output doesn't contain one.
+    """
+    if isinstance(output, dict):
+        output = output.get(u'file_content_md5sum', u'')
+
+    match = _MD5SUM_RE.search(output or u'')
+    return match.group(1).lower() if match else None
+
+
+_parsers = []
+
+
+def register_parser(command_pattern, parser):
+    """Register a parser for commands matching a regular expression.
+
+    Parsers registered later take precedence, so built-in parsers can be overridden.
+
+    Args:
+        command_pattern (str): Matched against the whole command.
+        parser (callable): Takes a command output and returns the parsed result.
+    """
+    _parsers.insert(0, (re.compile(r'(?:%s)\Z' % command_pattern), parser))
+
+
+def get_parser(command):
+    """Return the parser registered for a command.
+
+    Raises:
+        ParserNotFoundError: If no parser matches the command.
+    """
+    command = command.strip()
+    for pattern, parser in _parsers:
+        if pattern.match(command):
+            return parser
+
+    raise ParserNotFoundError(command)
+
+
+def parse(command, output):
+    """Parse a command output with the parser registered for the command.
+    """
+    return get_parser(command)(output)
+
+
+register_parser(r'show boot', parse_show_boot)
+register_parser(r'dir(?:\s+\S+)?', parse_dir)
+register_parser(r'show file \S+ md5sum', parse_md5sum)
+register_parser(r'show install all status', parse_install_status)
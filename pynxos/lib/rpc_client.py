@@ -1,14 +1,99 @@
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 import json
+import re
+import threading
 
 from builtins import range
 from pynxos.errors import NXOSError
+from pynxos.lib import instrumentation
+from pynxos.lib.json_codec import JSONCodec, default_codec, get_codec
 
 # requests.packages.urllib3.disable_warnings()
 
+# Configuration commands that enter a sub-mode. The commands after one of
+# these, up to the next one or an ``end``, run in that sub-mode.
+CONFIG_MODE_RE = re.compile(r'^(?:interface|vlan|vrf context|router|route-map|ip access-list|'
+                            r'ipv6 access-list|mac access-list|object-group|class-map|policy-map|'
+                            r'key chain|line|role name|vpc domain|track|monitor session|'
+                            r'event manager applet|aaa group server|spanning-tree mst configuration)\b')
+
+
+def _mode_blocks(commands):
+    """Group commands so that each sub-mode command stays with the command
+    that entered its mode.
+    """
+    blocks = []
+    in_mode = False
+    for command in commands:
+        stripped = command.strip()
+        enters_mode = CONFIG_MODE_RE.match(stripped) is not None
+        if enters_mode or not in_mode:
+            blocks.append([])
+        blocks[-1].append(command)
+
+        if enters_mode:
+            in_mode = True
+        elif stripped == u'end':
+            in_mode = False
+
+    return blocks
+
+
+def _command_bytes(command, method, id_num):
+    payload = dict(jsonrpc=u'2.0', method=method, params=dict(cmd=command, version=1), id=id_num)
+    return len(json.dumps(payload)) + 1
+
+
+def chunk_commands(commands, method=u'cli', max_commands=None, max_bytes=None):
+    """Split a list of commands into batches that each fit in one request.
+
+    Each request starts from the top-level configuration context, so a
+    command that enters a sub-mode (see ``CONFIG_MODE_RE``) and the
+    commands under it, e.g. ``interface`` and its ``description``, are
+    always kept in the same batch.
+
+    Args:
+        commands (list): The commands to split, in order.
+
+    Keyword Args:
+        method (str): The JSON-RPC method the commands will be sent with.
+        max_commands (int): The maximum number of commands per batch.
+        max_bytes (int): The maximum encoded payload size per batch. A single
+            command or mode block larger than the limits is still sent,
+            in a batch of its own.
+
+    Returns:
+        A list of command lists which, concatenated, equal ``commands``.
+    """
+    if not max_commands and not max_bytes:
+        return [commands]
+
+    chunks = []
+    chunk = []
+    chunk_bytes = 2
+    for block in _mode_blocks(commands):
+        block_bytes = sum(_command_bytes(command, method, len(chunk) + i + 1) for i, command in enumerate(block))
+        if chunk and ((max_commands and len(chunk) + len(block) > max_commands)
+                      or (max_bytes and chunk_bytes + block_bytes > max_bytes)):
+            chunks.append(chunk)
+            chunk = []
+            chunk_bytes = 2
+            block_bytes = sum(_command_bytes(command, method, i + 1) for i, command in enumerate(block))
+
+        chunk.extend(block)
+        chunk_bytes += block_bytes
+
+    if chunk or not chunks:
+        chunks.append(chunk)
+
+    return chunks
+
+
 class RPCClient(object):
-    def __init__(self, host, username, password, transport=u'http', port=None, verify=True):
+    def __init__(self, host, username, password, transport=u'http', port=None, verify=True,
+                 pool_connections=1, pool_maxsize=10, max_retries=0, keep_alive=True, codec=None):
         if transport not in ['http', 'https']:
             raise NXOSError('\'%s\' is an invalid transport.' % transport)
 
@@ -18,12 +103,74 @@ class RPCClient(object):
             elif transport == 'https':
                 port = 443
 
+        self.host = host
         self.url = u'%s://%s:%s/ins' % (transport, host, port)
         self.headers = {u'content-type': u'application/json-rpc'}
         self.username = username
         self.password = password
         self.verify = verify
 
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.keep_alive = keep_alive
+
+        if codec is None:
+            codec = default_codec
+        elif not isinstance(codec, JSONCodec):
+            codec = get_codec(codec)
+        self.codec = codec
+
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """Return the ``requests.Session`` used for every request to this host.
+
+        The session is created on first use, so a client that never sends a
+        request never opens a connection pool. Creation is locked, so threads
+        sharing a client also share one pool. ``max_retries`` can be an
+        ``int`` (connection errors only, which is safe for non-idempotent
+        config commands) or a ``urllib3`` ``Retry`` object.
+        """
+        session = self._session
+        if session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._new_session()
+                session = self._session
+
+        return session
+
+    def _new_session(self):
+        session = requests.Session()
+        session.auth = HTTPBasicAuth(self.username, self.password)
+        session.verify = self.verify
+        session.headers.update(self.headers)
+        if not self.keep_alive:
+            session.headers[u'connection'] = u'close'
+
+        adapter = HTTPAdapter(pool_connections=self.pool_connections,
+                              pool_maxsize=self.pool_maxsize,
+                              max_retries=self.max_retries)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        return session
+
+    def close(self):
+        """Release the pooled connections held by this client.
+
+        The client can still be used afterwards; a new session is
+        created on the next request.
+        """
+        with self._session_lock:
+            session, self._session = self._session, None
+
+        if session is not None:
+            session.close()
+
     def _build_payload(self, commands, method, rpc_version=u'2.0'):
         payload_list = []
 
@@ -40,17 +187,50 @@ class RPCClient(object):
         return payload_list
 
     def send_request(self, commands, method=u'cli', timeout=30):
+        timeout=int(timeout)
+        with instrumentation.span('rpc.send_request', host=self.host, method=method,
+                                  commands=len(commands)) as span:
+            encode_start = instrumentation._monotonic()
+            payload_list = self._build_payload(commands, method)
+            data = self.codec.dumps(payload_list)
+
+            request_start = instrumentation._monotonic()
+            response = self.session.post(self.url,
+                                         timeout=timeout,
+                                         data=data)
+            content = response.content
+
+            decode_start = instrumentation._monotonic()
+            response_list = self.codec.loads(content)
+
+            if span.recording:
+                span.set('status_code', response.status_code)
+                span.set('bytes_sent', len(data))
+                span.set('bytes_received', len(content))
+                span.set('encode_time', request_start - encode_start)
+                span.set('request_time', decode_start - request_start)
+                span.set('time_to_headers', response.elapsed.total_seconds())
+                span.set('decode_time', instrumentation._monotonic() - decode_start)
+
+        return self._process_response(commands, response_list)
+
+    def send_request_stream(self, commands, method=u'cli', timeout=30):
+        """Send commands and return the response without reading its body.
+
+        The caller is responsible for consuming ``response.raw`` and for
+        closing the response, which returns its connection to the pool.
+        """
         timeout=int(timeout)
         payload_list = self._build_payload(commands, method)
-        response = requests.post(self.url,
-                                 timeout=timeout,
-                                 data=json.dumps(payload_list),
-                                 headers=self.headers,
-                                 auth=HTTPBasicAuth(self.username, self.password),
-                                 verify=self.verify)
+        response = self.session.post(self.url,
+                                     timeout=timeout,
+                                     data=self.codec.dumps(payload_list),
+                                     stream=True)
+        response.raw.decode_content = True
 
-        response_list = json.loads(response.text)
+        return response
 
+    def _process_response(self, commands, response_list):
         if isinstance(response_list, dict):
             response_list = [response_list]
 
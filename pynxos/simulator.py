@@ -0,0 +1,275 @@
+"""A local NX-API stand-in for load and benchmark testing.
+
+The simulator serves JSON-RPC on ``/ins`` and replays recorded responses
+from a fixtures directory laid out like ``test/unit/mocks``: a
+``send_request`` folder for structured (``cli``) output and a
+``send_request_raw`` folder for raw text (``cli_ascii``) output. Each
+fixture is named after its commands, joined with ``__``, with spaces and
+slashes replaced by underscores, and holds a list of JSON-RPC responses.
+
+Example:
+    with NXAPISimulator('test/unit/mocks', latency=0.05) as sim:
+        device = Device('127.0.0.1', 'user', 'pass', port=sim.port)
+        device.show('show version')
+"""
+import copy
+import json
+import os
+import random
+import socket
+import threading
+import time
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+METHOD_FOLDERS = {
+    u'cli': 'send_request',
+    u'cli_ascii': 'send_request_raw',
+}
+
+INVALID_COMMAND_ERROR = {
+    u'code': -32602,
+    u'message': u'Invalid params',
+    u'data': {u'msg': u'% Invalid command\n'},
+}
+
+SIMULATED_ERROR = {
+    u'code': -32603,
+    u'message': u'Internal error',
+    u'data': {u'msg': u'Simulated error\n'},
+}
+
+
+def fixture_name(commands):
+    return '__'.join(commands).replace(' ', '_').replace('/', '_')
+
+
+def _multiply_rows(data, multiplier):
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if key.startswith(u'ROW_') and isinstance(value, list):
+                data[key] = [_multiply_rows(copy.deepcopy(row), multiplier) for row in value] * multiplier
+            else:
+                data[key] = _multiply_rows(value, multiplier)
+    elif isinstance(data, list):
+        return [_multiply_rows(item, multiplier) for item in data]
+
+    return data
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 1024
+
+
+class _NXAPIRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.server.simulator._count('connections')
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json-rpc')
+        self.send_header('Content-Length', str(len(body)))
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        simulator = self.server.simulator
+        length = int(self.headers.get('Content-Length') or 0)
+        request_body = self.rfile.read(length)
+
+        if self.path != '/ins':
+            self._send(404, b'')
+            return
+
+        try:
+            payload_list = json.loads(request_body.decode('utf-8'))
+        except ValueError:
+            self._send(400, b'')
+            return
+
+        if isinstance(payload_list, dict):
+            payload_list = [payload_list]
+
+        response_list = simulator.respond(payload_list)
+        if len(response_list) == 1:
+            response_list = response_list[0]
+
+        self._send(200, json.dumps(response_list).encode('utf-8'))
+
+
+class NXAPISimulator(object):
+    """Serve recorded NX-API responses over HTTP.
+
+    Args:
+        fixtures_dir (str): The directory holding the ``send_request`` and
+            ``send_request_raw`` fixture folders.
+
+    Keyword Args:
+        host (str): The address to listen on.
+        port (int): The port to listen on. 0 picks a free port.
+        latency (float): Seconds to wait before answering each request.
+        error_rate (float): The probability, from 0 to 1, that a command is
+            answered with a JSON-RPC error instead of its fixture.
+        size_multiplier (int): Repeat every ``ROW_`` list this many times,
+            to simulate larger tables.
+        unknown_result: If a command has no fixture, it is answered with
+            this result. If None, an "Invalid command" error is returned.
+        seed: Seed for the random number generator used by ``error_rate``.
+
+    Attributes:
+        stats (dict): Counts of ``connections``, ``requests`` and ``commands`` served.
+    """
+    def __init__(self, fixtures_dir, host='127.0.0.1', port=0, latency=0.0, error_rate=0.0,
+                 size_multiplier=1, unknown_result=None, seed=None):
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.error_rate = error_rate
+        self.size_multiplier = size_multiplier
+        self.unknown_result = unknown_result
+
+        self.stats = dict(connections=0, requests=0, commands=0)
+        self._stats_lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._fixtures = {}
+        self._thread = None
+
+        self.server = _ThreadingHTTPServer((host, port), _NXAPIRequestHandler)
+        self.server.simulator = self
+        self.host, self.port = self.server.server_address[:2]
+
+    @property
+    def url(self):
+        return 'http://%s:%s/ins' % (self.host, self.port)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        """Start serving in a background thread.
+        """
+        self._thread = threading.Thread(target=self.server.serve_forever, kwargs=dict(poll_interval=0.05))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stop serving and close the listening socket.
+        """
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def _load_fixture(self, method, commands):
+        folder = METHOD_FOLDERS.get(method, METHOD_FOLDERS[u'cli'])
+        key = (folder, fixture_name(commands))
+        if key not in self._fixtures:
+            path = os.path.join(self.fixtures_dir, folder, key[1] + '.json')
+            try:
+                with open(path) as f:
+                    fixture = json.load(f)
+            except IOError:
+                fixture = None
+
+            if isinstance(fixture, dict):
+                fixture = [fixture]
+            if fixture is not None and self.size_multiplier > 1:
+                fixture = _multiply_rows(fixture, self.size_multiplier)
+
+            self._fixtures[key] = fixture
+
+        return self._fixtures[key]
+
+    def _fixture_responses(self, method, commands):
+        fixture = self._load_fixture(method, commands)
+        if fixture is not None and len(fixture) == len(commands):
+            return fixture
+
+        responses = []
+        for command in commands:
+            fixture = self._load_fixture(method, [command])
+            if fixture:
+                responses.append(fixture[0])
+            elif self.unknown_result is not None:
+                responses.append({u'result': self.unknown_result})
+            else:
+                responses.append({u'error': INVALID_COMMAND_ERROR})
+
+        return responses
+
+    def respond(self, payload_list):
+        """Return the JSON-RPC responses for a list of JSON-RPC requests.
+        """
+        self._count('requests')
+        self._count('commands', len(payload_list))
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        method = payload_list[0].get(u'method', u'cli') if payload_list else u'cli'
+        commands = [payload.get(u'params', {}).get(u'cmd') for payload in payload_list]
+
+        response_list = []
+        for payload, fixture_response in zip(payload_list, self._fixture_responses(method, commands)):
+            response = dict(jsonrpc=u'2.0', id=payload.get(u'id'))
+            if self.error_rate and self._random.random() < self.error_rate:
+                response[u'error'] = SIMULATED_ERROR
+            elif u'error' in fixture_response:
+                response[u'error'] = fixture_response[u'error']
+            else:
+                response[u'result'] = fixture_response.get(u'result')
+
+            response_list.append(response)
+
+        return response_list
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Serve recorded NX-API responses on /ins.')
+    parser.add_argument('fixtures_dir')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--size-multiplier', type=int, default=1)
+    args = parser.parse_args()
+
+    simulator = NXAPISimulator(args.fixtures_dir, host=args.host, port=args.port, latency=args.latency,
+                               error_rate=args.error_rate, size_multiplier=args.size_multiplier)
+    print('Serving NX-API on %s' % simulator.url)
+    try:
+        simulator.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.server.server_close()
+
+
+if __name__ == '__main__':
+    main()
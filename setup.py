@@ -8,5 +8,7 @@ setup(name='pynxos',
       author_email='ntc@networktocode.com',
       url='https://github.com/networktocode/pynxos/',
       license='Apache',
-      install_requires=['requests>=2.7.0', 'future', 'scp']
+      install_requires=['requests>=2.7.0', 'future', 'scp', 'futures; python_version < "3.2"'],
+      extras_require={'async': ['aiohttp>=3.0'],
+                      'streaming': ['ijson>=3.1']}
       )
@@ -0,0 +1,59 @@
+"""Compare the available JSON codecs on the recorded NX-API fixtures.
+
+Run from the repository root with
+``PYTHONPATH=. python test/benchmark/bench_json_codecs.py``.
+"""
+import glob
+import os
+import timeit
+
+from pynxos.errors import NXOSError
+from pynxos.lib.json_codec import CODEC_PREFERENCE, get_codec
+
+CURRNENT_DIR = os.path.dirname(os.path.realpath(__file__))
+MOCKS_DIR = os.path.join(CURRNENT_DIR, '..', 'unit', 'mocks')
+
+
+def load_fixtures():
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(MOCKS_DIR, '*', '*.json'))):
+        with open(path, 'rb') as f:
+            fixtures.append(f.read())
+
+    return fixtures
+
+
+def bench_codec(codec, fixtures, number):
+    decoded = [codec.loads(body) for body in fixtures]
+
+    def decode():
+        for body in fixtures:
+            codec.loads(body)
+
+    def encode():
+        for data in decoded:
+            codec.dumps(data)
+
+    return (min(timeit.repeat(decode, number=number, repeat=3)) / number,
+            min(timeit.repeat(encode, number=number, repeat=3)) / number)
+
+
+def main(number=200):
+    fixtures = load_fixtures()
+    total_bytes = sum(len(body) for body in fixtures)
+    print('%d fixtures, %d bytes, %d iterations' % (len(fixtures), total_bytes, number))
+    print('%-10s %14s %14s' % ('codec', 'decode (us)', 'encode (us)'))
+
+    for name in CODEC_PREFERENCE:
+        try:
+            codec = get_codec(name)
+        except NXOSError:
+            print('%-10s %14s %14s' % (name, 'n/a', 'n/a'))
+            continue
+
+        decode_time, encode_time = bench_codec(codec, fixtures, number)
+        print('%-10s %14.1f %14.1f' % (name, decode_time * 1e6, encode_time * 1e6))
+
+
+if __name__ == '__main__':
+    main()
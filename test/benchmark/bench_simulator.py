@@ -0,0 +1,55 @@
+"""Measure Device and Fleet throughput against the local NX-API simulator.
+
+Run from the repository root with
+``PYTHONPATH=. python test/benchmark/bench_simulator.py``.
+"""
+import os
+import time
+
+from pynxos.device import Device
+from pynxos.fleet import Fleet
+from pynxos.simulator import NXAPISimulator
+
+CURRNENT_DIR = os.path.dirname(os.path.realpath(__file__))
+MOCKS_DIR = os.path.join(CURRNENT_DIR, '..', 'unit', 'mocks')
+
+
+def bench_device(simulator, keep_alive, number):
+    device = Device(simulator.host, 'user', 'pass', port=simulator.port, keep_alive=keep_alive)
+    connections = simulator.stats['connections']
+
+    start = time.time()
+    for _ in range(number):
+        device.show('show version')
+    elapsed = time.time() - start
+    device.close()
+
+    return number / elapsed, simulator.stats['connections'] - connections
+
+
+def bench_fleet(simulator, devices, max_workers):
+    inventory = [dict(host=simulator.host, port=simulator.port)] * devices
+    with Fleet(inventory, username='user', password='pass', max_workers=max_workers) as fleet:
+        start = time.time()
+        results = list(fleet.facts())
+        elapsed = time.time() - start
+
+    return elapsed, sum(1 for r in results if r.ok)
+
+
+def main(number=500):
+    with NXAPISimulator(MOCKS_DIR) as simulator:
+        print('Device.show, %d calls' % number)
+        for keep_alive in (True, False):
+            rate, connections = bench_device(simulator, keep_alive, number)
+            print('  keep_alive=%-5s %8.0f req/s %6d connections' % (keep_alive, rate, connections))
+
+    with NXAPISimulator(MOCKS_DIR, latency=0.05) as simulator:
+        print('Fleet.facts, 100 devices, 50 ms latency')
+        for max_workers in (1, 10, 50):
+            elapsed, ok = bench_fleet(simulator, 100, max_workers)
+            print('  max_workers=%-3d %8.2f s %6d ok' % (max_workers, elapsed, ok))
+
+
+if __name__ == '__main__':
+    main()
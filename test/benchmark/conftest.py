@@ -0,0 +1,74 @@
+"""Benchmarks for the request/response hot path.
+
+They need ``pytest-benchmark`` and only run when asked for explicitly,
+so the unit test run stays fast::
+
+    pytest test/benchmark --benchmark-only
+
+Each benchmark also checks its mean time against a generous absolute
+limit in ``THRESHOLDS`` so large regressions fail outright. For finer,
+machine-specific tracking, save a baseline and compare against it::
+
+    pytest test/benchmark --benchmark-only --benchmark-autosave
+    pytest test/benchmark --benchmark-only --benchmark-compare --benchmark-compare-fail=mean:20%
+"""
+import os
+
+import pytest
+
+CURRNENT_DIR = os.path.dirname(os.path.realpath(__file__))
+
+# Maximum mean time, in seconds, per benchmark (keyed by the benchmark
+# group). These are several times the expected time on a laptop and only
+# catch gross regressions. ``import_time`` excludes interpreter start-up
+# and is tighter: about twice the import cost without paramiko and scp.
+THRESHOLDS = {
+    'build_payload': 0.05,
+    'send_request_decode': 0.01,
+    'cli_command': 0.05,
+    'converted_list_from_table': 1.0,
+    'local_md5': 0.5,
+    'local_md5_cached': 0.001,
+    'import_time': 0.2,
+}
+
+
+def pytest_collection_modifyitems(config, items):
+    try:
+        benchmark_only = config.getoption('benchmark_only')
+    except ValueError:
+        benchmark_only = False
+
+    if benchmark_only:
+        return
+
+    skip = pytest.mark.skip(reason='benchmarks only run with --benchmark-only')
+    for item in items:
+        if os.path.realpath(str(item.fspath)).startswith(CURRNENT_DIR + os.sep):
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def thresholds():
+    """The ``THRESHOLDS`` table, for benchmarks that check their own timings.
+    """
+    return THRESHOLDS
+
+
+@pytest.fixture
+def check_threshold(benchmark):
+    """Run a benchmark and fail if its mean time exceeds the group's threshold.
+    """
+    def run(group, scale, func, *args, **kwargs):
+        benchmark.group = group
+        result = benchmark(func, *args, **kwargs)
+
+        stats = benchmark.stats
+        if stats is not None:
+            mean = stats.stats.mean
+            limit = THRESHOLDS[group] * scale
+            assert mean <= limit, '%s took %.6fs on average, more than the %.6fs limit' % (group, mean, limit)
+
+        return result
+
+    return run
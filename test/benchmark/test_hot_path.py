@@ -0,0 +1,100 @@
+import os
+import json
+import tempfile
+
+import mock
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from pynxos.device import Device
+from pynxos.features.file_copy import FileCopy
+from pynxos.lib import converted_list_from_table
+from pynxos.lib.data_model import key_maps
+from pynxos.lib.file_hash import clear_md5_cache
+from pynxos.lib.rpc_client import RPCClient
+
+CURRNENT_DIR = os.path.dirname(os.path.realpath(__file__))
+MOCKS_DIR = os.path.join(CURRNENT_DIR, '..', 'unit', 'mocks')
+
+
+def load_fixture(folder, name):
+    with open(os.path.join(MOCKS_DIR, folder, name + '.json'), 'rb') as f:
+        return f.read()
+
+
+def interface_table(rows):
+    body = json.loads(load_fixture('send_request', 'show_interface_status'))[0]['result']['body']
+    template = body['TABLE_interface']['ROW_interface']
+    row_list = [dict(template[i % len(template)], interface='Ethernet1/%d' % i) for i in range(rows)]
+    return {'TABLE_interface': {'ROW_interface': row_list}}
+
+
+class StaticRPC(object):
+    def __init__(self, response_list):
+        self.response_list = response_list
+
+    def send_request(self, commands, method=u'cli', timeout=30):
+        return self.response_list
+
+
+@pytest.mark.parametrize('commands', [1, 100, 5000])
+def test_build_payload(check_threshold, commands):
+    rpc = RPCClient('host', 'user', 'pass')
+    command_list = ['interface ethernet 1/%d' % i for i in range(commands)]
+
+    check_threshold('build_payload', commands / 5000.0 or 1, rpc._build_payload, command_list, u'cli')
+
+
+@pytest.mark.parametrize('fixture', ['show_version', 'show_interface_status', 'show_vlan'])
+def test_send_request_decode(check_threshold, fixture):
+    rpc = RPCClient('host', 'user', 'pass')
+    response = mock.Mock(content=load_fixture('send_request', fixture))
+    command = fixture.replace('_', ' ')
+
+    with mock.patch.object(rpc.session, 'post', return_value=response):
+        check_threshold('send_request_decode', 1, rpc.send_request, [command])
+
+
+@pytest.mark.parametrize('commands', [1, 1000])
+def test_cli_command(check_threshold, commands):
+    with mock.patch('pynxos.device.RPCClient'):
+        device = Device('host', 'user', 'pass')
+    command_list = ['interface ethernet 1/%d' % i for i in range(commands)]
+    device.rpc = StaticRPC([{'result': None, 'command': c, 'id': i} for i, c in enumerate(command_list)])
+
+    check_threshold('cli_command', max(commands / 1000.0, 0.01), device._cli_command, command_list)
+
+
+@pytest.mark.parametrize('rows', [100, 1000, 10000, 100000])
+def test_converted_list_from_table(check_threshold, rows):
+    table = interface_table(rows)
+
+    result = check_threshold('converted_list_from_table', rows / 100000.0,
+                             converted_list_from_table, table, u'interface', key_maps.INTERFACE_KEY_MAP, fill_in=True)
+    assert len(result) == rows
+
+
+@pytest.fixture(scope='module')
+def local_file():
+    with tempfile.NamedTemporaryFile() as f:
+        f.write(os.urandom(64 * 2**20))
+        f.flush()
+        yield f.name
+
+
+def test_local_md5(check_threshold, local_file):
+    fc = FileCopy(None, local_file)
+
+    def uncached_md5():
+        clear_md5_cache()
+        return fc.get_local_md5()
+
+    check_threshold('local_md5', 1, uncached_md5)
+
+
+def test_local_md5_cached(check_threshold, local_file):
+    fc = FileCopy(None, local_file)
+    fc.get_local_md5()
+
+    check_threshold('local_md5_cached', 1, fc.get_local_md5)
@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+CURRNENT_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.join(CURRNENT_DIR, '..', '..')
+
+# Times the import statement alone, so interpreter start-up doesn't count,
+# and lists the file transfer modules it pulled in.
+IMPORT_CODE = ('import sys, time\n'
+               'start = time.time()\n'
+               'import %s\n'
+               'print(time.time() - start)\n'
+               'print(",".join(sorted(set(sys.modules) & set(["paramiko", "scp"]))))\n')
+
+
+def import_in_subprocess(module):
+    output = subprocess.check_output([sys.executable, '-c', IMPORT_CODE % module], cwd=ROOT_DIR)
+    seconds, loaded = output.decode('utf-8').split('\n')[:2]
+    return float(seconds), [name for name in loaded.split(',') if name]
+
+
+@pytest.mark.parametrize('module', ['pynxos.device', 'pynxos.fleet'])
+def test_import_time(thresholds, benchmark, module):
+    # Importing the file transfer stack (paramiko, scp) roughly doubles the
+    # import time, so it must stay out until a file is actually copied.
+    benchmark.extra_info['module'] = module
+    benchmark.group = 'import_time'
+
+    durations = []
+
+    def run():
+        seconds, loaded = import_in_subprocess(module)
+        durations.append(seconds)
+        return loaded
+
+    loaded = benchmark(run)
+    assert loaded == [], 'importing %s loaded %s' % (module, ', '.join(loaded))
+
+    mean = sum(durations) / len(durations)
+    limit = thresholds['import_time']
+    assert mean <= limit, 'importing %s took %.6fs on average, more than the %.6fs limit' % (module, mean, limit)
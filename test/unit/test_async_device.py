@@ -0,0 +1,121 @@
+import asyncio
+import unittest
+import mock
+import json
+import time
+
+import aiohttp
+
+from mocks import send_request
+
+from pynxos.async_device import AsyncDevice
+from pynxos.device import Device
+from pynxos.lib.async_rpc_client import AsyncRPCClient
+from pynxos.errors import CLIError
+
+
+class AsyncDeviceTestCase(unittest.IsolatedAsyncioTestCase):
+
+    @mock.patch('pynxos.async_device.AsyncRPCClient')
+    def setUp(self, mock_rpc):
+        self.device = AsyncDevice('host', 'user', 'pass')
+        self.rpc = mock_rpc
+        self.send_request = mock_rpc.return_value.send_request = mock.AsyncMock(side_effect=send_request)
+        mock_rpc.return_value.close = mock.AsyncMock()
+
+    async def test_show(self):
+        result = await self.device.show('sh clock')
+
+        self.assertEqual(result, {'simple_time': '18:06:31.021 UTC Tue Mar 22 2016\n'})
+        self.send_request.assert_called_with(['sh clock'], method=u'cli', timeout=30)
+
+    async def test_show_list_raw_text(self):
+        result = await self.device.show_list(['sh clock', 'sh hostname'], raw_text=True)
+
+        self.assertEqual(result, ['18:55:38.720 UTC Tue Mar 22 2016\n', 'N9K2.ntc.com \n'])
+        self.send_request.assert_called_with(['sh clock', 'sh hostname'], method=u'cli_ascii', timeout=30)
+
+    async def test_config_list(self):
+        result = await self.device.config_list(['int ethernet 1/1', 'no shutdown'])
+
+        self.assertEqual(result, [None, None])
+
+    async def test_config_error(self):
+        self.send_request.side_effect = None
+        self.send_request.return_value = [{'error': {'data': {'msg': 'bad'}}, 'command': 'foo'}]
+
+        with self.assertRaises(CLIError):
+            await self.device.config('foo')
+
+    async def test_reboot(self):
+        self.send_request.side_effect = [[{'result': None}], asyncio.TimeoutError()]
+
+        await self.device.reboot(confirm=True)
+
+        self.send_request.assert_called_with(['reload'], method=u'cli', timeout=5)
+        self.rpc.return_value.close.assert_called_with()
+
+    @mock.patch('pynxos.async_device.asyncio.sleep', new_callable=mock.AsyncMock)
+    async def test_wait_for_reload(self, mock_sleep):
+        self.send_request.side_effect = [asyncio.TimeoutError(), aiohttp.ClientConnectionError(),
+                                         send_request(['show version'])]
+
+        await self.device.wait_for_reload(since=time.time() - 10 ** 7, interval=5)
+
+        self.send_request.assert_called_with(['show version'], method=u'cli', timeout=10)
+        self.assertEqual([c[0][0] for c in mock_sleep.call_args_list], [5, 10])
+
+    @mock.patch('pynxos.device.RPCClient')
+    async def test_facts(self, mock_rpc):
+        mock_rpc.return_value.send_request.side_effect = send_request
+        expected = Device('host', 'user', 'pass').facts
+
+        facts = await self.device.facts()
+
+        self.assertEqual(facts, expected)
+        self.assertEqual(facts['hostname'], 'N9K2')
+
+    async def test_config_list_drops_cached_facts(self):
+        await self.device.facts()
+        await self.device.config_list(['int ethernet 1/1', 'no shutdown'])
+        await self.device.facts()
+
+        self.assertEqual(self.send_request.call_count, 3)
+
+    async def test_context_manager(self):
+        async with self.device:
+            pass
+
+        self.rpc.return_value.close.assert_called_with()
+
+
+class AsyncRPCClientTestCase(unittest.IsolatedAsyncioTestCase):
+
+    async def test_send_request(self):
+        rpc = AsyncRPCClient('host', 'user', 'pass', max_concurrency=2)
+        response = mock.MagicMock()
+        response.__aenter__.return_value.read = mock.AsyncMock(
+            return_value=json.dumps({'jsonrpc': '2.0', 'result': None, 'id': 1}).encode('utf-8'))
+
+        async with rpc:
+            with mock.patch.object(rpc.session, 'post', return_value=response) as mock_post:
+                result = await rpc.send_request(['no shutdown'])
+
+        self.assertEqual(result, [{'jsonrpc': '2.0', 'result': None, 'id': 1, 'command': 'no shutdown'}])
+        self.assertEqual(mock_post.call_args[0], ('http://host:80/ins',))
+        self.assertIsNone(rpc._session)
+
+    def test_ssl_verify(self):
+        self.assertIsNone(AsyncRPCClient('host', 'user', 'pass', transport='https')._ssl())
+        self.assertIs(AsyncRPCClient('host', 'user', 'pass', transport='https', verify=False)._ssl(), False)
+
+    @mock.patch('pynxos.lib.async_rpc_client.ssl.create_default_context')
+    def test_ssl_ca_bundle(self, mock_context):
+        rpc = AsyncRPCClient('host', 'user', 'pass', transport='https', verify='/etc/ssl/ca.pem')
+
+        self.assertIs(rpc._ssl(), mock_context.return_value)
+        mock_context.assert_called_with(cafile='/etc/ssl/ca.pem')
+
+    def test_send_request_stream_not_supported(self):
+        with self.assertRaises(NotImplementedError):
+            AsyncRPCClient('host', 'user', 'pass').send_request_stream(['show vlan'])
@@ -0,0 +1,72 @@
+import unittest
+import mock
+
+from pynxos.lib.cache import ResponseCache
+
+
+class ResponseCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = ResponseCache(maxsize=2, default_ttl=10, ttls={'show version': None})
+
+    def test_get_missing(self):
+        self.assertIsNone(self.cache.get(('host', 'show vlan', False)))
+
+    def test_set_get_returns_copy(self):
+        key = ('host', 'show vlan', False)
+        self.cache.set(key, {'a': [1]})
+        result = self.cache.get(key)
+        result['a'].append(2)
+
+        self.assertEqual(self.cache.get(key), {'a': [1]})
+
+    @mock.patch('pynxos.lib.cache.time.time')
+    def test_ttl(self, mock_time):
+        mock_time.return_value = 100
+        self.cache.set(('host', 'show vlan', False), 'vlans')
+        self.cache.set(('host', 'show version', False), 'version')
+
+        mock_time.return_value = 111
+        self.assertIsNone(self.cache.get(('host', 'show vlan', False)))
+        self.assertEqual(self.cache.get(('host', 'show version', False)), 'version')
+
+    def test_lru_eviction(self):
+        self.cache.set(('host', 'a', False), 'a')
+        self.cache.set(('host', 'b', False), 'b')
+        self.cache.get(('host', 'a', False))
+        self.cache.set(('host', 'c', False), 'c')
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNone(self.cache.get(('host', 'b', False)))
+        self.assertEqual(self.cache.get(('host', 'a', False)), 'a')
+
+    def test_invalidate_host(self):
+        self.cache.set(('host1', 'a', False), 'a')
+        self.cache.set(('host2', 'a', False), 'a')
+        self.cache.invalidate('host1')
+
+        self.assertIsNone(self.cache.get(('host1', 'a', False)))
+        self.assertEqual(self.cache.get(('host2', 'a', False)), 'a')
+
+        self.cache.invalidate()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_set_after_invalidate_is_dropped(self):
+        generation = self.cache.generation('host1')
+        other_generation = self.cache.generation('host2')
+        self.cache.invalidate('host1')
+        self.cache.set(('host1', 'a', False), 'stale', generation=generation)
+        self.cache.set(('host2', 'a', False), 'a', generation=other_generation)
+
+        self.assertIsNone(self.cache.get(('host1', 'a', False)))
+        self.assertEqual(self.cache.get(('host2', 'a', False)), 'a')
+
+        self.cache.set(('host1', 'a', False), 'fresh', generation=self.cache.generation('host1'))
+        self.assertEqual(self.cache.get(('host1', 'a', False)), 'fresh')
+
+    def test_set_after_invalidate_all_is_dropped(self):
+        generation = self.cache.generation('host')
+        self.cache.invalidate()
+        self.cache.set(('host', 'a', False), 'stale', generation=generation)
+
+        self.assertEqual(len(self.cache), 0)
@@ -0,0 +1,57 @@
+import shutil
+import tempfile
+import unittest
+
+from pynxos.lib.config_store import ConfigStore, config_digest
+
+CONFIG = '!Command: show running-config\n!Time: Tue Mar 22 21:23:11 2016\nhostname N9K2\nvlan 1-20\n'
+LATER_CONFIG = CONFIG.replace('21:23:11', '22:00:00')
+CHANGED_CONFIG = LATER_CONFIG.replace('vlan 1-20', 'vlan 1-30')
+
+
+class ConfigStoreTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = ConfigStore(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_digest_ignores_time(self):
+        self.assertEqual(config_digest(CONFIG), config_digest(LATER_CONFIG))
+        self.assertNotEqual(config_digest(CONFIG), config_digest(CHANGED_CONFIG))
+
+    def test_first_save(self):
+        result = self.store.save('n9k1', CONFIG, marker='m1')
+
+        self.assertTrue(result.changed)
+        self.assertIsNone(result.diff)
+        self.assertEqual(self.store.get(result.digest), CONFIG)
+        self.assertEqual(self.store.latest('n9k1')['marker'], 'm1')
+
+    def test_unchanged_save(self):
+        first = self.store.save('n9k1', CONFIG, marker='m1')
+        second = self.store.save('n9k1', LATER_CONFIG, marker='m2')
+
+        self.assertFalse(second.changed)
+        self.assertEqual(second.digest, first.digest)
+        self.assertEqual(len(self.store.versions('n9k1')), 1)
+        self.assertEqual(self.store.latest('n9k1')['marker'], 'm2')
+
+    def test_changed_save_stores_diff(self):
+        self.store.save('n9k1', CONFIG)
+        result = self.store.save('n9k1', CHANGED_CONFIG)
+
+        self.assertTrue(result.changed)
+        self.assertIn('-vlan 1-20', result.diff)
+        self.assertIn('+vlan 1-30', result.diff)
+        self.assertEqual(self.store.get_diff('n9k1', result.digest), result.diff)
+        self.assertEqual(len(self.store.versions('n9k1')), 2)
+
+    def test_hosts_share_objects(self):
+        first = self.store.save('n9k1', CONFIG)
+        second = self.store.save('n9k2', CONFIG)
+
+        self.assertEqual(first.digest, second.digest)
+        self.assertIsNone(self.store.latest('n9k3'))
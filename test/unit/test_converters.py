@@ -0,0 +1,112 @@
+import unittest
+import os
+import io
+import json
+
+from pynxos.lib import KeyMapConverter, convert_dict_by_key, list_from_table, iter_list_from_stream, iter_text_from_stream
+from pynxos.errors import CLIError
+
+CURRNENT_DIR = os.path.dirname(os.path.realpath(__file__))
+
+
+def mock_stream(filename):
+    with open(os.path.join(CURRNENT_DIR, 'mocks', 'send_request', filename), 'rb') as f:
+        return io.BytesIO(f.read())
+
+
+KEY_MAP = {'id': 'vlanid', 'name': 'vlanname', 'missing': 'not_there'}
+
+ROWS = [
+    {'vlanid': '1', 'vlanname': 'default', 'state': 'active', 'shut': 'noshutdown'},
+    {'vlanid': '2', 'state': 'suspend'},
+]
+
+
+class KeyMapConverterTestCase(unittest.TestCase):
+
+    def test_matches_convert_dict_by_key(self):
+        options = [dict(),
+                   dict(fill_in=True),
+                   dict(fill_in=True, whitelist=['state', 'vlanid']),
+                   dict(fill_in=True, blacklist=['shut'])]
+
+        for kwargs in options:
+            converter = KeyMapConverter(KEY_MAP, **kwargs)
+            expected = [convert_dict_by_key(row, KEY_MAP, **kwargs) for row in ROWS]
+
+            self.assertEqual(converter.convert_list(ROWS), expected)
+
+    def test_convert_columns(self):
+        converter = KeyMapConverter(KEY_MAP, fill_in=True, whitelist=['state'])
+
+        self.assertEqual(converter.convert_columns(ROWS), {
+            'id': ['1', '2'],
+            'name': ['default', None],
+            'missing': [None, None],
+            'state': ['active', 'suspend'],
+        })
+
+
+class IterListFromStreamTestCase(unittest.TestCase):
+
+    def test_matches_list_from_table(self):
+        with open(os.path.join(CURRNENT_DIR, 'mocks', 'send_request', 'show_interface_status.json')) as f:
+            table = json.load(f)[0]['result']['body']
+
+        rows = list(iter_list_from_stream(mock_stream('show_interface_status.json'), 'interface'))
+
+        self.assertEqual(rows, list_from_table(table, 'interface'))
+
+    def test_single_row(self):
+        stream = io.BytesIO(b'{"result": {"body": {"TABLE_vlan": {"ROW_vlan": {"id": 1}}}}}')
+
+        self.assertEqual(list(iter_list_from_stream(stream, 'vlan')), [{'id': 1}])
+
+    def test_nested_table(self):
+        body = {'TABLE_vrf': {'ROW_vrf': [
+            {'vrf': 'a', 'TABLE_prefix': {'ROW_prefix': [{'p': 1}, {'p': 2}]}},
+            {'vrf': 'b', 'TABLE_prefix': {'ROW_prefix': {'p': 3}}},
+        ]}}
+        stream = io.BytesIO(json.dumps({'result': {'body': body}}).encode('utf-8'))
+
+        rows = list(iter_list_from_stream(stream, ['vrf', 'prefix']))
+
+        self.assertEqual(rows, [{'p': 1}, {'p': 2}, {'p': 3}])
+
+    def test_error(self):
+        stream = io.BytesIO(b'{"error": {"code": -32602, "data": {"msg": "% Invalid command"}}}')
+
+        with self.assertRaises(CLIError) as cm:
+            list(iter_list_from_stream(stream, 'vlan', command='show foo'))
+
+        self.assertEqual(cm.exception.command, 'show foo')
+        self.assertEqual(cm.exception.message, '% Invalid command')
+
+
+class IterTextFromStreamTestCase(unittest.TestCase):
+
+    def test_matches_json_loads(self):
+        text = u'hostname N9K2\n  description "uplink" \\ caf\u00e9 \U0001F600\tend\n' * 50
+        for response in [dict(jsonrpc=u'2.0', result=dict(msg=text), id=1),
+                         [dict(jsonrpc=u'2.0', result=dict(msg=text), id=1)]]:
+            for ensure_ascii in (True, False):
+                data = json.dumps(response, ensure_ascii=ensure_ascii).encode('utf-8')
+                for chunk_size in (1, 5, 13, 65536):
+                    pieces = list(iter_text_from_stream(io.BytesIO(data), chunk_size=chunk_size))
+                    self.assertEqual(u''.join(pieces), text)
+
+    def test_fixture(self):
+        with open(os.path.join(CURRNENT_DIR, 'mocks', 'send_request_raw', 'show_running-config.json'), 'rb') as f:
+            data = f.read()
+
+        expected = json.loads(data.decode('utf-8'))[0]['result']['msg']
+        self.assertEqual(u''.join(iter_text_from_stream(io.BytesIO(data), chunk_size=100)), expected)
+
+    def test_error(self):
+        stream = io.BytesIO(b'{"jsonrpc": "2.0", "error": {"code": -32602, "data": {"msg": "% Invalid command"}}, "id": 1}')
+
+        with self.assertRaises(CLIError) as cm:
+            list(iter_text_from_stream(stream, command='show foo', chunk_size=7))
+
+        self.assertEqual(cm.exception.command, 'show foo')
+        self.assertEqual(cm.exception.message, '% Invalid command')
@@ -2,11 +2,28 @@ import unittest
 import mock
 import os
 import json
+import io
+import gzip
+import hashlib
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 from tempfile import NamedTemporaryFile
 
+import requests
+
 from mocks import send_request
 
-from pynxos.device import Device, RebootSignal, CLIError
+from pynxos.device import Device, RebootSignal, CLIError, NXOSError
+from pynxos.errors import FeatureNotFoundError, ParserNotFoundError, ReloadTimeoutError
+from pynxos.features import FEATURES, register_feature
+from pynxos.features.base_feature import BaseFeature
+from pynxos.features.vlans import Vlans
+from pynxos.lib.cache import ResponseCache
+from pynxos.lib.config_store import BackupResult
 
 CURRNENT_DIR = os.path.dirname(os.path.realpath(__file__))
 
@@ -27,7 +44,18 @@ class TestDevice(unittest.TestCase):
         self.assertEqual(self.device.transport, 'http')
         self.assertEqual(self.device.timeout, 30)
 
-        self.rpc.assert_called_with('host', 'user', 'pass', transport='http', port=None)
+        self.rpc.assert_called_with('host', 'user', 'pass', transport='http', port=None, verify=True,
+                                    pool_maxsize=10, max_retries=0, keep_alive=True)
+
+    def test_close(self):
+        self.device.close()
+        self.rpc.return_value.close.assert_called_with()
+
+    def test_context_manager(self):
+        with self.device as device:
+            self.assertIs(device, self.device)
+
+        self.rpc.return_value.close.assert_called_with()
 
     def test_show(self):
         result = self.device.show('sh clock')
@@ -46,6 +74,89 @@ class TestDevice(unittest.TestCase):
         self.assertEqual(result, expected)
         self.send_request.assert_called_with(['sh clock'], method=u'cli', timeout=30)
 
+    def test_show_cached(self):
+        self.device.cache = ResponseCache()
+        self.device.show('sh clock')
+        result = self.device.show('sh clock')
+
+        self.assertEqual(result, {'simple_time': '18:06:31.021 UTC Tue Mar 22 2016\n'})
+        self.assertEqual(self.send_request.call_count, 1)
+
+        self.device.show('sh clock', use_cache=False)
+        self.assertEqual(self.send_request.call_count, 2)
+
+    def test_config_invalidates_cache(self):
+        self.device.cache = ResponseCache()
+        self.device.show('sh clock')
+        self.device.config('int ethernet 1/1')
+        self.device.show('sh clock')
+
+        self.assertEqual(self.send_request.call_count, 3)
+
+    def test_show_during_config_is_not_cached(self):
+        self.device.cache = ResponseCache()
+
+        def show_while_configuring(commands, **kwargs):
+            if commands == ['int ethernet 1/1']:
+                self.device.show('sh clock')
+            return send_request(commands, **kwargs)
+
+        self.send_request.side_effect = show_while_configuring
+        self.device.config('int ethernet 1/1')
+
+        self.assertEqual(len(self.device.cache), 0)
+
+    def test_show_racing_config_is_not_cached(self):
+        self.device.cache = ResponseCache()
+        show_sent = threading.Event()
+        config_done = threading.Event()
+        hostname = {'v': 'old'}
+
+        def slow_send_request(commands, method='cli', timeout=30):
+            if commands == ['show hostname']:
+                body = dict(hostname)
+                show_sent.set()
+                config_done.wait(5)
+                return [{'result': {'body': body}, 'command': commands[0]}]
+
+            hostname['v'] = 'new'
+            return [{'result': None, 'command': commands[0]}]
+
+        self.send_request.side_effect = slow_send_request
+        show_thread = threading.Thread(target=self.device.show, args=('show hostname',))
+        show_thread.start()
+        show_sent.wait(5)
+
+        self.device.config('hostname new')
+        config_done.set()
+        show_thread.join(5)
+
+        self.assertEqual(self.device.show('show hostname'), {'v': 'new'})
+        self.assertEqual(self.send_request.call_count, 3)
+
+    def test_config_error_invalidates_cache(self):
+        self.device.cache = ResponseCache()
+
+        def show_then_fail(commands, **kwargs):
+            if commands == ['int ethernet 1/1']:
+                self.device.show('sh clock')
+                raise CLIError('int ethernet 1/1', 'Invalid command')
+            return send_request(commands, **kwargs)
+
+        self.send_request.side_effect = show_then_fail
+        with self.assertRaises(CLIError):
+            self.device.config('int ethernet 1/1')
+
+        self.assertEqual(len(self.device.cache), 0)
+
+    def test_show_list_bypasses_cache(self):
+        self.device.cache = ResponseCache()
+        self.device.show_list(['sh clock'])
+        self.device.show_list(['sh clock'])
+
+        self.assertEqual(self.send_request.call_count, 2)
+        self.assertEqual(len(self.device.cache), 0)
+
     def test_show_raw_text(self):
         result = self.device.show('sh clock', raw_text=True)
         expected = '18:29:19.583 UTC Tue Mar 22 2016\n'
@@ -67,6 +178,17 @@ class TestDevice(unittest.TestCase):
         self.assertEqual(result, expected)
         self.send_request.assert_called_with(['sh clock', 'sh hostname'], method=u'cli_ascii', timeout=30)
 
+    def test_show_iter(self):
+        response = self.rpc.return_value.send_request_stream.return_value
+        with open(os.path.join(CURRNENT_DIR, 'mocks', 'send_request', 'show_vlan.json'), 'rb') as f:
+            response.raw = io.BytesIO(f.read())
+
+        result = list(self.device.show_iter('show vlan', 'vlanbrief'))
+
+        self.assertEqual(result, self.device.show('show vlan')['TABLE_vlanbrief']['ROW_vlanbrief'])
+        self.rpc.return_value.send_request_stream.assert_called_with(['show vlan'], timeout=30)
+        response.close.assert_called_with()
+
     def test_config(self):
         result = self.device.config('int ethernet 1/1')
         expected = None
@@ -81,6 +203,47 @@ class TestDevice(unittest.TestCase):
         self.assertEqual(result, expected)
         self.send_request.assert_called_with(['int ethernet 1/1', 'no shutdown'], method=u'cli', timeout=30)
 
+    def _echo_send_request(self, commands, method='cli', timeout=30):
+        response_list = []
+        for command in commands:
+            if command == 'bad':
+                response_list.append({'error': {'data': {'msg': 'Syntax error'}}, 'command': command})
+            else:
+                response_list.append({'result': {'msg': command}, 'command': command})
+        return response_list
+
+    def test_config_list_batched(self):
+        self.send_request.side_effect = self._echo_send_request
+        self.device.max_commands = 2
+
+        result = self.device.config_list(['a', 'b', 'c', 'd', 'e'])
+
+        self.assertEqual(result, [{'msg': c} for c in ['a', 'b', 'c', 'd', 'e']])
+        self.assertEqual(self.send_request.call_args_list,
+                         [mock.call(['a', 'b'], method=u'cli', timeout=30),
+                          mock.call(['c', 'd'], method=u'cli', timeout=30),
+                          mock.call(['e'], method=u'cli', timeout=30)])
+
+    def test_config_list_batched_keeps_sub_modes(self):
+        self.send_request.side_effect = self._echo_send_request
+        self.device.max_commands = 3
+
+        self.device.config_list(['interface e1/1', 'description a', 'interface e1/2', 'description b'])
+
+        self.assertEqual(self.send_request.call_args_list,
+                         [mock.call(['interface e1/1', 'description a'], method=u'cli', timeout=30),
+                          mock.call(['interface e1/2', 'description b'], method=u'cli', timeout=30)])
+
+    def test_config_list_batched_error(self):
+        self.send_request.side_effect = self._echo_send_request
+        self.device.max_commands = 2
+
+        with self.assertRaises(CLIError) as cm:
+            self.device.config_list(['a', 'b', 'bad', 'c', 'd', 'e'])
+
+        self.assertEqual(cm.exception.command, 'bad')
+        self.assertEqual(self.send_request.call_count, 2)
+
     def test_save(self):
         result = self.device.save()
         expected = True
@@ -95,35 +258,97 @@ class TestDevice(unittest.TestCase):
         self.assertEqual(result, expected)
         self.send_request.assert_called_with([u'copy run abc'], method=u'cli_ascii', timeout=30)
 
-    @mock.patch('pynxos.device.FileCopy')
-    def test_file_copy_remote_exists(self, mock_fc):
-        mock_fc.return_value.remote_file_exists.return_value = True
-        result = self.device.file_copy_remote_exists('source', dest='dest')
+    def test_file_copy_remote_exists(self):
+        mock_fc = mock.Mock()
+        with mock.patch.dict(FEATURES, file_copy=mock_fc):
+            mock_fc.return_value.file_already_exists.return_value = True
+            result = self.device.file_copy_remote_exists('source', dest='dest')
+
+            self.assertEqual(result, True)
+            mock_fc.assert_called_with(self.device, 'source', dst='dest', file_system='bootflash:')
+
+    def test_file_copy_remote_doesnt_exist(self):
+        mock_fc = mock.Mock()
+        with mock.patch.dict(FEATURES, file_copy=mock_fc):
+            mock_fc.return_value.file_already_exists.return_value = False
+            result = self.device.file_copy_remote_exists('source', dest='dest')
+
+            self.assertEqual(result, False)
+            mock_fc.assert_called_with(self.device, 'source', dst='dest', file_system='bootflash:')
+
+    def test_file_copy(self):
+        mock_fc = mock.Mock()
+        with mock.patch.dict(FEATURES, file_copy=mock_fc):
+            result = self.device.file_copy('source', dest='dest')
 
-        self.assertEqual(result, True)
-        mock_fc.assert_called_with(self.device, 'source', dst='dest', file_system='bootflash:')
+            mock_fc.assert_called_with(self.device, 'source', dst='dest', file_system='bootflash:')
+            mock_fc.return_value.send.assert_called_with()
 
-    @mock.patch('pynxos.device.FileCopy')
-    def test_file_copy_remote_doesnt_exist(self, mock_fc):
-        mock_fc.return_value.remote_file_exists.return_value = False
-        result = self.device.file_copy_remote_exists('source', dest='dest')
+    def test_sync_files(self):
+        mock_fs = mock.Mock()
+        with mock.patch.dict(FEATURES, file_sync=mock_fs):
+            result = self.device.sync_files('/path/to/images', window_size=2**24)
 
-        self.assertEqual(result, False)
-        mock_fc.assert_called_with(self.device, 'source', dst='dest', file_system='bootflash:')
+            self.assertEqual(result, mock_fs.return_value.sync.return_value)
+            mock_fs.assert_called_with(self.device, '/path/to/images', file_system='bootflash:', window_size=2**24)
 
-    @mock.patch('pynxos.device.FileCopy')
-    def test_file_copy(self, mock_fc):
-        result = self.device.file_copy('source', dest='dest')
+    def test_collect_files(self):
+        mock_fc = mock.Mock()
+        with mock.patch.dict(FEATURES, file_collector=mock_fc):
+            result = self.device.collect_files(['core/1.gz'], directory='/tmp/cores', file_system='logflash:')
 
-        mock_fc.assert_called_with(self.device, 'source', dst='dest', file_system='bootflash:')
-        mock_fc.return_value.send.assert_called_with()
+            self.assertEqual(result, mock_fc.return_value.collect.return_value)
+            mock_fc.assert_called_with(self.device, ['core/1.gz'], directory='/tmp/cores', file_system='logflash:')
 
     @mock.patch.object(Device, 'show')
     def test_reboot(self, mock_show):
         self.device.reboot(confirm=True)
 
         mock_show.assert_any_call('terminal dont-ask')
-        mock_show.assert_any_call('reload')
+        mock_show.assert_any_call('reload', timeout=5)
+
+    @mock.patch.object(Device, 'show')
+    def test_reboot_from_thread(self, mock_show):
+        def show(command, **kwargs):
+            if command == 'reload':
+                raise requests.exceptions.ReadTimeout()
+
+        mock_show.side_effect = show
+        errors = []
+
+        def reboot():
+            try:
+                self.device.reboot(confirm=True)
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=reboot)
+        thread.start()
+        thread.join()
+
+        self.assertEqual(errors, [])
+        self.rpc.return_value.close.assert_called_with()
+
+    @mock.patch('pynxos.device.time.sleep')
+    @mock.patch.object(Device, 'show')
+    def test_wait_for_reload(self, mock_show, mock_sleep):
+        def show_version(uptime_secs):
+            return dict(kern_uptm_days=0, kern_uptm_hrs=0, kern_uptm_mins=0, kern_uptm_secs=uptime_secs)
+
+        mock_show.side_effect = [requests.exceptions.ConnectionError(), show_version(5000), show_version(30)]
+
+        self.device.wait_for_reload(since=time.time() - 100, interval=5, max_interval=8)
+
+        mock_show.assert_called_with('show version', use_cache=False, timeout=10)
+        self.assertEqual([c[0][0] for c in mock_sleep.call_args_list], [5, 8])
+
+    @mock.patch('pynxos.device.time.sleep')
+    @mock.patch.object(Device, 'show')
+    def test_wait_for_reload_timeout(self, mock_show, mock_sleep):
+        mock_show.side_effect = requests.exceptions.ConnectionError()
+
+        with self.assertRaises(ReloadTimeoutError):
+            self.device.wait_for_reload(timeout=0)
 
     @mock.patch.object(Device, 'show')
     def test_set_boot_options(self, mock_show):
@@ -140,14 +365,12 @@ class TestDevice(unittest.TestCase):
         expected = {'sys': 'nxos.7.0.3.I2.1.bin', 'status': 'This is the log of last installation.\nVerifying image bootflash:/nxos.7.0.3.I2.1.bin for boot variable "nxos".\n -- SUCCESS\nVerifying image type.\n -- SUCCESS\nPreparing "nxos" version info using image bootflash:/nxos.7.0.3.I2.1.bin.\n -- SUCCESS\nPreparing "bios" version info using image bootflash:/nxos.7.0.3.I2.1.bin.\n -- SUCCESS\nPerforming module support checks.\n -- SUCCESS\nNotifying services about system upgrade.\n -- SUCCESS\nCompatibility check is done:\nModule  bootable          Impact  Install-type  Reason\n------  --------  --------------  ------------  ------\n     1       yes      disruptive         reset  Reset due to single supervisor\nImages will be upgraded according to following table:\nModule       Image                  Running-Version(pri:alt)           New-Version  Upg-Required\n------  ----------  ----------------------------------------  --------------------  ------------\n     1        nxos                               6.1(2)I3(1)           7.0(3)I2(1)           yes\n     1        bios     v07.15(06/29/2014):v07.06(03/02/2014)    v07.34(08/11/2015)           yes\nSwitch will be reloaded for disruptive upgrade.\nInstall is in progress, please wait.\nPerforming runtime checks.\n -- SUCCESS\nSetting boot variables.\n -- SUCCESS\nPerforming configuration copy.\n -- SUCCESS\nModule 1: Refreshing compact flash and upgrading bios/loader/bootrom.\nWarning: please do not remove or power off the module at this time.\n -- SUCCESS\nFinishing the upgrade, switch will reboot in 10 seconds.\n'}
 
         self.assertEqual(result, expected)
-        self.send_request.assert_called_with(['show install all status'], method=u'cli_ascii', timeout=30)
+        self.send_request.assert_called_once_with(['show boot', 'show install all status'], method=u'cli_ascii', timeout=30)
 
     def test_get_boot_options_kickstart(self):
         def special_send_request(commands, method='cli', timeout=30.0):
-            if commands == ['show boot']:
-                return json.load(open(os.path.join(CURRNENT_DIR, 'mocks', 'send_request_raw', 'show_boot_kick.json')))
-            elif commands == ['show install all status']:
-                return json.load(open(os.path.join(CURRNENT_DIR, 'mocks', 'send_request_raw', 'show_install_all_status_kick.json')))
+            if commands == ['show boot', 'show install all status']:
+                return json.load(open(os.path.join(CURRNENT_DIR, 'mocks', 'send_request_raw', 'show_boot__show_install_all_status_kick.json')))
 
         self.send_request.side_effect = special_send_request
 
@@ -155,7 +378,20 @@ class TestDevice(unittest.TestCase):
         expected = {'sys': 'n5000-uk9.7.2.1.N1.1.bin', 'status': 'This is the log of last installation.\nContinuing with installation process, please wait.\nThe login will be disabled until the installation is completed.\nPerforming supervisor state verification. \nSUCCESS\nSupervisor non-disruptive upgrade successful.\nInstall has been successful.\n', 'kick': 'n5000-uk9-kickstart.7.2.1.N1.1.bin'}
 
         self.assertEqual(result, expected)
-        self.send_request.assert_called_with(['show install all status'], method=u'cli_ascii', timeout=30)
+        self.send_request.assert_called_once_with(['show boot', 'show install all status'], method=u'cli_ascii', timeout=30)
+
+    def test_show_parsed(self):
+        boot_variables, install_status = self.device.show_parsed(['show boot', 'show install all status'])
+
+        self.assertEqual(boot_variables.next_reload, {'sys': 'nxos.7.0.3.I2.1.bin'})
+        self.assertEqual(install_status.state, 'success')
+        self.send_request.assert_called_once_with(['show boot', 'show install all status'], method=u'cli_ascii', timeout=30)
+
+    def test_show_parsed_no_parser(self):
+        with self.assertRaises(ParserNotFoundError):
+            self.device.show_parsed(['show boot', 'show clock'])
+
+        self.assertFalse(self.send_request.called)
 
     @mock.patch.object(Device, 'show')
     def test_rollback(self, mock_show):
@@ -182,6 +418,79 @@ class TestDevice(unittest.TestCase):
 
         self.assertEqual(contents, expected)
 
+    def test_download_running_config(self):
+        response = self.rpc.return_value.send_request_stream.return_value
+        with open(os.path.join(CURRNENT_DIR, 'mocks', 'send_request_raw', 'show_running-config.json'), 'rb') as f:
+            response.raw = io.BytesIO(f.read())
+        expected = self.device.running_config.encode('utf-8')
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(temp_dir, 'n9k.cfg.gz')
+            digest = self.device.download_running_config(filename, compress=True, chunk_size=100)
+
+            with gzip.open(filename, 'rb') as f:
+                self.assertEqual(f.read(), expected)
+            self.assertEqual(os.listdir(temp_dir), ['n9k.cfg.gz'])
+        finally:
+            shutil.rmtree(temp_dir)
+
+        self.assertEqual(digest, hashlib.sha256(expected).hexdigest())
+        self.rpc.return_value.send_request_stream.assert_called_with(['show running-config'], method=u'cli_ascii',
+                                                                     timeout=30)
+        response.close.assert_called_with()
+
+    def test_download_running_config_error(self):
+        response = self.rpc.return_value.send_request_stream.return_value
+        response.raw = io.BytesIO(b'{"jsonrpc": "2.0", "error": {"code": -32602, "data": {"msg": "% Denied"}}, "id": 1}')
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            with self.assertRaises(CLIError):
+                self.device.download_running_config(os.path.join(temp_dir, 'n9k.cfg'))
+
+            self.assertEqual(os.listdir(temp_dir), [])
+        finally:
+            shutil.rmtree(temp_dir)
+
+    @mock.patch.object(Device, 'show')
+    def test_incremental_backup_skips_unchanged(self, mock_show):
+        mock_show.return_value = '!Running configuration last done at: Tue Mar 22 21:20:00 2016\n'
+        store = mock.Mock()
+        store.latest.return_value = dict(digest='abc', marker='Tue Mar 22 21:20:00 2016')
+
+        result = self.device.incremental_backup(store)
+
+        mock_show.assert_called_once_with('show running-config | include last.done.at', raw_text=True,
+                                          use_cache=False)
+        self.assertFalse(result.downloaded)
+        self.assertEqual(result.digest, 'abc')
+        self.assertFalse(store.save.called)
+
+    @mock.patch.object(Device, 'show')
+    def test_incremental_backup_downloads_changed(self, mock_show):
+        mock_show.side_effect = ['!Running configuration last done at: Wed Mar 23 09:00:00 2016\n', 'hostname N9K2\n']
+        store = mock.Mock()
+        store.latest.return_value = dict(digest='abc', marker='Tue Mar 22 21:20:00 2016')
+        store.save.return_value = BackupResult('host', 'def', changed=True, downloaded=True)
+
+        result = self.device.incremental_backup(store)
+
+        mock_show.assert_called_with('show running-config', raw_text=True, use_cache=False)
+        store.save.assert_called_once_with('host', 'hostname N9K2\n', marker='Wed Mar 23 09:00:00 2016')
+        self.assertIs(result, store.save.return_value)
+
+    @mock.patch.object(Device, 'show')
+    def test_incremental_backup_without_marker(self, mock_show):
+        mock_show.side_effect = [CLIError('show running-config | include last.done.at', 'Invalid command'),
+                                 'hostname N9K2\n']
+        store = mock.Mock()
+        store.latest.return_value = dict(digest='abc', marker=None)
+
+        self.device.incremental_backup(store)
+
+        store.save.assert_called_once_with('host', 'hostname N9K2\n', marker=None)
+
     def test_facts(self):
         self.assertEqual(hasattr(self.device, '_facts'), False)
 
@@ -190,6 +499,99 @@ class TestDevice(unittest.TestCase):
         self.assertEqual(self.device.facts, expected)
         self.assertEqual(hasattr(self.device, '_facts'), True) # caching test
         self.assertEqual(self.device.facts, expected) # caching test
+        self.send_request.assert_called_once_with(['show version', 'show interface status', 'show vlan'],
+                                                  method=u'cli', timeout=30)
+
+    def test_get_facts_fields(self):
+        result = self.device.get_facts(fields=['hostname', 'os_version'])
+
+        self.assertEqual(result, {'hostname': 'N9K2', 'os_version': '7.0(3)I2(1)'})
+        self.send_request.assert_called_once_with(['show version'], method=u'cli', timeout=30)
+        self.assertEqual(hasattr(self.device, '_facts'), False)
+
+    def test_get_facts_from_cache(self):
+        facts = self.device.facts
+        result = self.device.get_facts(fields=['vlans', 'fqdn'])
+
+        self.assertEqual(result, {'vlans': facts['vlans'], 'fqdn': 'N/A'})
+        self.assertEqual(self.send_request.call_count, 1)
+
+    def test_get_facts_unknown_field(self):
+        with self.assertRaises(NXOSError):
+            self.device.get_facts(fields=['hostname', 'color'])
+
+    def test_get_facts_chunked(self):
+        self.device.max_commands = 1
+        facts = self.device.facts
+
+        self.assertEqual(facts['hostname'], 'N9K2')
+        self.assertEqual(self.send_request.call_args_list, [
+            mock.call(['show version'], method=u'cli', timeout=30),
+            mock.call(['show interface status'], method=u'cli', timeout=30),
+            mock.call(['show vlan'], method=u'cli', timeout=30),
+        ])
+
+    def test_get_facts_interface_error(self):
+        self.send_request.side_effect = None
+        self.send_request.return_value = [{'command': 'show interface status', 'error': {'message': 'Invalid'}}]
+
+        self.assertEqual(self.device.get_facts(fields=['interfaces']), {'interfaces': []})
+
+    def test_feature_is_cached(self):
+        vlans = self.device.feature('vlans')
+
+        self.assertIsInstance(vlans, Vlans)
+        self.assertIs(self.device.feature('vlans'), vlans)
+
+    def test_feature_not_found(self):
+        with self.assertRaises(FeatureNotFoundError):
+            self.device.feature('not_a_feature')
+
+    def test_register_feature(self):
+        class Clock(BaseFeature):
+            show_commands = ['sh clock']
+
+            def get_all(self):
+                return self._show('sh clock')
+
+        register_feature('clock', Clock)
+        try:
+            features = self.device.load_features(['vlans', 'clock'])
+        finally:
+            del FEATURES['clock']
+
+        self.send_request.assert_called_once_with(['show vlan', 'sh clock'], method=u'cli', timeout=30)
+        self.assertEqual(features[1].get_all(), {'simple_time': '18:06:31.021 UTC Tue Mar 22 2016\n'})
+        self.assertEqual(features[0].get_list()[:3], ['1', '2', '3'])
+        self.assertEqual(self.send_request.call_count, 1)
+
+    def test_load_features_invalidated_by_config(self):
+        vlans = self.device.load_features(['vlans'])[0]
+        self.device.config('int ethernet 1/1')
+        vlans.get_list()
+
+        self.assertEqual(self.send_request.call_args, mock.call(['show vlan'], method=u'cli', timeout=30))
+        self.assertEqual(self.send_request.call_count, 3)
+
+    @mock.patch('pynxos.features._iter_entry_points')
+    def test_feature_from_entry_point(self, mock_entry_points):
+        entry_point = mock.Mock()
+        entry_point.name = 'plugin_vlans'
+        entry_point.load.return_value = Vlans
+        mock_entry_points.return_value = [entry_point]
+
+        with mock.patch('pynxos.features._entry_points_loaded', False):
+            try:
+                self.assertIsInstance(self.device.feature('plugin_vlans'), Vlans)
+            finally:
+                del FEATURES['plugin_vlans']
+
+    def test_import_does_not_load_file_copy(self):
+        code = 'import sys, pynxos.device, pynxos.fleet; print(sorted(set(sys.modules) & {"paramiko", "scp"}))'
+        root = os.path.join(CURRNENT_DIR, '..', '..')
+        output = subprocess.check_output([sys.executable, '-c', code], cwd=root)
+
+        self.assertEqual(output.strip(), b'[]')
 
 
 if __name__ == '__main__':
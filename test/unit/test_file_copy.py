@@ -1,8 +1,12 @@
+import hashlib
+import os
+import shutil
 import unittest
 import mock
-from tempfile import NamedTemporaryFile
+from tempfile import NamedTemporaryFile, mkdtemp
 
-from pynxos.features.file_copy import FileCopy, FileTransferError
+from pynxos.features.file_copy import FileCollector, FileCopy, FileSync, FileTransferError
+from pynxos.lib.parsers import parse_dir
 
 class FileCopyTestCase(unittest.TestCase):
 
@@ -234,5 +238,299 @@ class FileCopyTestCase(unittest.TestCase):
         mock_SCP.return_value.close.assert_called_with()
 
 
+    @mock.patch('pynxos.features.file_copy.paramiko')
+    @mock.patch('pynxos.features.file_copy.SCPClient')
+    @mock.patch.object(FileCopy, 'local_file_exists')
+    @mock.patch.object(FileCopy, 'enough_space')
+    def test_send_file_tuned(self, mock_enough_space, mock_local_file_exists, mock_SCP, mock_paramiko):
+        mock_local_file_exists.return_value = True
+        mock_enough_space.return_value = True
+        progress = mock.Mock()
+        fc = FileCopy(self.device, '/path/to/source_file', window_size=2**24, buffer_size=2**20, progress=progress)
+
+        fc.send()
+
+        mock_transport = mock_paramiko.SSHClient.return_value.get_transport.return_value
+        self.assertEqual(mock_transport.default_window_size, 2**24)
+        mock_SCP.assert_called_with(mock_transport, buff_size=2**20, progress=progress)
+        mock_paramiko.SSHClient.return_value.close.assert_called_with()
+
+    @mock.patch('pynxos.features.file_copy.paramiko')
+    @mock.patch('pynxos.features.file_copy.SCPClient')
+    @mock.patch.object(FileCopy, 'file_already_exists')
+    @mock.patch.object(FileCopy, 'enough_space')
+    def test_send_file_resume(self, mock_enough_space, mock_already_exists, mock_SCP, mock_paramiko):
+        mock_enough_space.return_value = True
+        mock_already_exists.return_value = True
+        progress = mock.Mock()
+
+        with NamedTemporaryFile() as local_file:
+            local_file.write(b'0123456789')
+            local_file.flush()
+
+            mock_sftp = mock_paramiko.SSHClient.return_value.open_sftp.return_value
+            mock_sftp.stat.return_value.st_size = 4
+            fc = FileCopy(self.device, local_file.name, dst='image.bin', buffer_size=4, progress=progress)
+
+            fc.send(resume=True)
+
+        mock_sftp.open.assert_called_with('bootflash:image.bin', 'ab')
+        mock_remote_file = mock_sftp.open.return_value
+        self.assertEqual(mock_remote_file.write.call_args_list, [mock.call(b'4567'), mock.call(b'89')])
+        progress.assert_called_with('image.bin', 10, 10)
+        self.assertFalse(mock_SCP.called)
+        mock_sftp.close.assert_called_with()
+
+    @mock.patch('pynxos.features.file_copy.paramiko')
+    @mock.patch.object(FileCopy, 'file_already_exists')
+    @mock.patch.object(FileCopy, 'enough_space')
+    def test_send_file_resume_md5_mismatch(self, mock_enough_space, mock_already_exists, mock_paramiko):
+        mock_enough_space.return_value = True
+        mock_already_exists.return_value = False
+
+        with NamedTemporaryFile() as local_file:
+            local_file.write(b'0123456789')
+            local_file.flush()
+
+            mock_sftp = mock_paramiko.SSHClient.return_value.open_sftp.return_value
+            mock_sftp.stat.side_effect = IOError
+            fc = FileCopy(self.device, local_file.name)
+
+            with self.assertRaises(FileTransferError):
+                fc.send(resume=True)
+
+        mock_sftp.open.assert_called_with('bootflash:' + fc.dst, 'wb')
+        self.assertEqual(mock_sftp.open.call_count, 1)
+
+    @mock.patch('pynxos.features.file_copy.paramiko')
+    @mock.patch.object(FileCopy, 'file_already_exists')
+    @mock.patch.object(FileCopy, 'enough_space')
+    def test_send_file_resume_partial_file_differs(self, mock_enough_space, mock_already_exists, mock_paramiko):
+        mock_enough_space.return_value = True
+        mock_already_exists.side_effect = [False, True]
+
+        with NamedTemporaryFile() as local_file:
+            local_file.write(b'0123456789')
+            local_file.flush()
+
+            mock_sftp = mock_paramiko.SSHClient.return_value.open_sftp.return_value
+            mock_sftp.stat.return_value.st_size = 4
+            fc = FileCopy(self.device, local_file.name, dst='image.bin', buffer_size=10)
+
+            fc.send(resume=True)
+
+        self.assertEqual(mock_sftp.open.call_args_list, [mock.call('bootflash:image.bin', 'ab'),
+                                                         mock.call('bootflash:image.bin', 'wb')])
+        mock_remote_file = mock_sftp.open.return_value
+        self.assertEqual(mock_remote_file.write.call_args_list, [mock.call(b'456789'), mock.call(b'0123456789')])
+        self.assertEqual(mock_already_exists.call_count, 2)
+
+    @mock.patch('pynxos.features.file_copy.paramiko')
+    @mock.patch.object(FileCopy, 'file_already_exists')
+    @mock.patch.object(FileCopy, 'enough_space')
+    def test_send_file_resume_reupload_mismatch(self, mock_enough_space, mock_already_exists, mock_paramiko):
+        mock_enough_space.return_value = True
+        mock_already_exists.return_value = False
+
+        with NamedTemporaryFile() as local_file:
+            local_file.write(b'0123456789')
+            local_file.flush()
+
+            mock_sftp = mock_paramiko.SSHClient.return_value.open_sftp.return_value
+            mock_sftp.stat.return_value.st_size = 10
+            fc = FileCopy(self.device, local_file.name, dst='image.bin')
+
+            with self.assertRaises(FileTransferError):
+                fc.send(resume=True)
+
+        mock_sftp.open.assert_called_with('bootflash:image.bin', 'wb')
+        self.assertEqual(mock_already_exists.call_count, 2)
+
+
+class FileSyncTestCase(unittest.TestCase):
+
+    @mock.patch('pynxos.device.Device', autospec=True)
+    def setUp(self, mock_device):
+        self.device = mock_device
+        self.device.host = 'host'
+        self.device.username = 'user'
+        self.device.password = 'pass'
+
+        self.local_dir = mkdtemp()
+        self.contents = {'same.bin': b'0123456789', 'edited.bin': b'abcdefghij',
+                         'resized.bin': b'0123', 'new.bin': b'xyz'}
+        for name, content in self.contents.items():
+            with open(os.path.join(self.local_dir, name), 'wb') as f:
+                f.write(content)
+
+        self.remote_md5s = {'same.bin': hashlib.md5(b'0123456789').hexdigest(),
+                            'edited.bin': hashlib.md5(b'ABCDEFGHIJ').hexdigest()}
+        dir_output = ('         10    Mar 23 00:48:15 2016  same.bin\n'
+                      '         10    Mar 23 00:48:15 2016  edited.bin\n'
+                      '          8    Mar 23 00:48:15 2016  resized.bin\n'
+                      'Usage for bootflash://sup-local\n'
+                      ' 2425630720 bytes used\n'
+                      '      1000 bytes free\n'
+                      '21865418752 bytes total\n')
+
+        def show_parsed(commands):
+            outputs = []
+            for command in commands:
+                if command.startswith('dir'):
+                    outputs.append(parse_dir(dir_output))
+                else:
+                    outputs.append(self.remote_md5s[command.split()[2][len('bootflash:'):]])
+            return outputs
+
+        self.device.show_parsed.side_effect = show_parsed
+
+    def tearDown(self):
+        shutil.rmtree(self.local_dir)
+
+    def test_manifest(self):
+        self.assertEqual(FileSync(self.device, self.local_dir).manifest,
+                         dict((name, os.path.join(self.local_dir, name)) for name in self.contents))
+        self.assertEqual(FileSync(self.device, ['/a/b.bin']).manifest, {'b.bin': '/a/b.bin'})
+        self.assertEqual(FileSync(self.device, {'c.bin': '/a/b.bin'}).manifest, {'c.bin': '/a/b.bin'})
+
+    def test_diff(self):
+        result = FileSync(self.device, self.local_dir).diff()
+
+        self.assertEqual(result, ['edited.bin', 'new.bin', 'resized.bin'])
+        self.assertEqual(self.device.show_parsed.call_args_list, [
+            mock.call(['dir bootflash:']),
+            mock.call(['show file bootflash:edited.bin md5sum', 'show file bootflash:same.bin md5sum']),
+        ])
+
+    def test_diff_local_file_missing(self):
+        with self.assertRaises(FileTransferError):
+            FileSync(self.device, ['/path/to/missing.bin']).diff()
+
+        self.assertFalse(self.device.show_parsed.called)
+
+    @mock.patch('pynxos.features.file_copy.paramiko')
+    @mock.patch('pynxos.features.file_copy.SCPClient')
+    def test_sync(self, mock_SCP, mock_paramiko):
+        def put(src, dst):
+            name = os.path.basename(src)
+            self.remote_md5s[name] = hashlib.md5(self.contents[name]).hexdigest()
+
+        mock_SCP.return_value.put.side_effect = put
+
+        result = FileSync(self.device, self.local_dir).sync()
+
+        self.assertEqual(result.transferred, ['edited.bin', 'new.bin', 'resized.bin'])
+        self.assertEqual(result.up_to_date, ['same.bin'])
+        self.assertEqual(mock_paramiko.SSHClient.call_count, 1)
+        self.assertEqual(mock_SCP.return_value.put.call_args_list, list(
+            mock.call(os.path.join(self.local_dir, name), 'bootflash:' + name)
+            for name in ['edited.bin', 'new.bin', 'resized.bin']))
+        self.assertEqual(self.device.show_parsed.call_count, 3)
+        mock_paramiko.SSHClient.return_value.close.assert_called_with()
+
+    @mock.patch('pynxos.features.file_copy.paramiko')
+    def test_sync_up_to_date(self, mock_paramiko):
+        result = FileSync(self.device, {'same.bin': os.path.join(self.local_dir, 'same.bin')}).sync()
+
+        self.assertEqual(result.transferred, [])
+        self.assertEqual(result.up_to_date, ['same.bin'])
+        self.assertEqual(self.device.show_parsed.call_count, 2)
+        self.assertFalse(mock_paramiko.SSHClient.called)
+
+    @mock.patch('pynxos.features.file_copy.paramiko')
+    @mock.patch('pynxos.features.file_copy.SCPClient')
+    def test_sync_md5_mismatch(self, mock_SCP, mock_paramiko):
+        with self.assertRaises(FileTransferError):
+            FileSync(self.device, {'edited.bin': os.path.join(self.local_dir, 'edited.bin')}).sync()
+
+    @mock.patch('pynxos.features.file_copy.paramiko')
+    def test_sync_not_enough_space(self, mock_paramiko):
+        with open(os.path.join(self.local_dir, 'new.bin'), 'wb') as f:
+            f.write(b'x' * 2000)
+
+        with self.assertRaises(FileTransferError):
+            FileSync(self.device, self.local_dir).sync()
+
+        self.assertFalse(mock_paramiko.SSHClient.called)
+
+
+class FileCollectorTestCase(unittest.TestCase):
+
+    @mock.patch('pynxos.device.Device', autospec=True)
+    def setUp(self, mock_device):
+        self.device = mock_device
+        self.device.host = 'host'
+        self.device.username = 'user'
+        self.device.password = 'pass'
+        self.local_dir = mkdtemp()
+
+        self.contents = {'core/1.gz': b'0123456789', 'tech.txt': b'abc'}
+        self.remote_md5s = dict((name, hashlib.md5(content).hexdigest()) for name, content in self.contents.items())
+        self.device.show_parsed.side_effect = lambda commands: list(
+            self.remote_md5s[command.split()[2][len('logflash:'):]] for command in commands)
+
+    def tearDown(self):
+        shutil.rmtree(self.local_dir)
+
+    def _mock_sftp(self, mock_paramiko):
+        mock_sftp = mock_paramiko.SSHClient.return_value.open_sftp.return_value
+
+        def open_remote(path, mode):
+            content = self.contents[path[len('logflash:'):]]
+            remote_file = mock.Mock()
+            remote_file.read.side_effect = [content[:4], content[4:], b'']
+            return remote_file
+
+        mock_sftp.open.side_effect = open_remote
+        mock_sftp.stat.side_effect = lambda path: mock.Mock(st_size=len(self.contents[path[len('logflash:'):]]))
+        return mock_sftp
+
+    @mock.patch('pynxos.features.file_copy.paramiko')
+    def test_collect(self, mock_paramiko):
+        mock_sftp = self._mock_sftp(mock_paramiko)
+        progress = mock.Mock()
+
+        collector = FileCollector(self.device, ['core/1.gz', 'tech.txt'], directory=self.local_dir,
+                                  file_system='logflash:', progress=progress)
+        result = collector.collect()
+
+        self.assertEqual(result.bytes_received, 13)
+        self.assertEqual(result.files, {'core/1.gz': os.path.join(self.local_dir, '1.gz'),
+                                        'tech.txt': os.path.join(self.local_dir, 'tech.txt')})
+        for name, local_path in result.files.items():
+            with open(local_path, 'rb') as f:
+                self.assertEqual(f.read(), self.contents[name])
+        self.assertEqual(sorted(os.listdir(self.local_dir)), ['1.gz', 'tech.txt'])
+
+        self.device.show_parsed.assert_called_once_with(
+            ['show file logflash:core/1.gz md5sum', 'show file logflash:tech.txt md5sum'])
+        self.assertEqual(mock_paramiko.SSHClient.call_count, 1)
+        self.assertEqual(mock_sftp.open.call_count, 2)
+        progress.assert_called_with('tech.txt', 3, 3)
+        mock_sftp.close.assert_called_with()
+        mock_paramiko.SSHClient.return_value.close.assert_called_with()
+
+    @mock.patch('pynxos.features.file_copy.paramiko')
+    def test_collect_md5_mismatch(self, mock_paramiko):
+        self._mock_sftp(mock_paramiko)
+        self.remote_md5s['tech.txt'] = hashlib.md5(b'abd').hexdigest()
+
+        collector = FileCollector(self.device, ['tech.txt'], directory=self.local_dir, file_system='logflash:')
+        with self.assertRaises(FileTransferError):
+            collector.collect()
+
+        self.assertEqual(os.listdir(self.local_dir), [])
+
+    @mock.patch('pynxos.features.file_copy.paramiko')
+    def test_collect_sftp_error(self, mock_paramiko):
+        mock_paramiko.SSHClient.return_value.open_sftp.side_effect = Exception
+
+        collector = FileCollector(self.device, ['tech.txt'], directory=self.local_dir, file_system='logflash:')
+        with self.assertRaises(FileTransferError):
+            collector.collect()
+
+        mock_paramiko.SSHClient.return_value.close.assert_called_with()
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,87 @@
+import unittest
+import mock
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+
+from pynxos.lib import file_hash
+from pynxos.lib.file_hash import md5sum, clear_md5_cache
+
+
+class MD5SumTestCase(unittest.TestCase):
+
+    def setUp(self):
+        clear_md5_cache()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'image.bin')
+        self.content = os.urandom(300000)
+        with open(self.path, 'wb') as f:
+            f.write(self.content)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_md5sum(self):
+        self.assertEqual(md5sum(self.path, blocksize=4096), hashlib.md5(self.content).hexdigest())
+
+    def test_empty_file(self):
+        path = os.path.join(self.tmp_dir, 'empty')
+        open(path, 'w').close()
+
+        self.assertEqual(md5sum(path), hashlib.md5(b'').hexdigest())
+
+    def test_cached(self):
+        with mock.patch.object(file_hash, '_compute_md5', wraps=file_hash._compute_md5) as mock_compute:
+            threads = [threading.Thread(target=md5sum, args=(self.path,)) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual(mock_compute.call_count, 1)
+
+    def test_modified_file_is_rehashed(self):
+        md5sum(self.path)
+        with open(self.path, 'ab') as f:
+            f.write(b'more')
+
+        self.assertEqual(md5sum(self.path), hashlib.md5(self.content + b'more').hexdigest())
+
+    @mock.patch.object(file_hash, 'MD5_CACHE_MAXSIZE', 2)
+    def test_cache_is_bounded(self):
+        paths = []
+        for name in ['a', 'b', 'c']:
+            path = os.path.join(self.tmp_dir, name)
+            with open(path, 'wb') as f:
+                f.write(name.encode('utf-8'))
+            paths.append(path)
+
+        md5sum(paths[0])
+        md5sum(paths[1])
+        md5sum(paths[0])
+        md5sum(paths[2])
+
+        self.assertEqual(len(file_hash._md5_cache), 2)
+        with mock.patch.object(file_hash, '_compute_md5', wraps=file_hash._compute_md5) as mock_compute:
+            md5sum(paths[0])
+            self.assertFalse(mock_compute.called)
+            md5sum(paths[1])
+            self.assertEqual(mock_compute.call_count, 1)
+
+    def test_failed_hash_releases_lock(self):
+        with mock.patch.object(file_hash, '_compute_md5', side_effect=IOError):
+            with self.assertRaises(IOError):
+                md5sum(self.path)
+
+        self.assertEqual(file_hash._md5_locks, {})
+
+    def test_cache_dir(self):
+        cache_dir = os.path.join(self.tmp_dir, 'cache')
+        expected = md5sum(self.path, cache_dir=cache_dir)
+        clear_md5_cache()
+
+        with mock.patch.object(file_hash, '_compute_md5') as mock_compute:
+            self.assertEqual(md5sum(self.path, cache_dir=cache_dir), expected)
+            self.assertFalse(mock_compute.called)
@@ -0,0 +1,155 @@
+import os
+import threading
+import time
+import unittest
+import mock
+
+from mocks import send_request
+
+from pynxos.errors import CLIError
+from pynxos.features import FEATURES
+from pynxos.fleet import Fleet, FleetResult
+
+
+class FleetTestCase(unittest.TestCase):
+
+    @mock.patch('pynxos.device.RPCClient')
+    def setUp(self, mock_rpc):
+        mock_rpc.return_value.send_request.side_effect = send_request
+        self.rpc = mock_rpc
+        self.fleet = Fleet(['n9k1', dict(host='n9k2', password='other')],
+                           username='user', password='pass', max_workers=2)
+
+    def test_init(self):
+        self.assertEqual([d.host for d in self.fleet.devices], ['n9k1', 'n9k2'])
+        self.assertEqual(self.fleet.devices[0].password, 'pass')
+        self.assertEqual(self.fleet.devices[1].password, 'other')
+        self.assertEqual(self.fleet.devices[1].username, 'user')
+
+    def test_init_with_device(self):
+        device = self.fleet.devices[0]
+        fleet = Fleet([device])
+
+        self.assertIs(fleet.devices[0], device)
+
+    def test_show(self):
+        results = sorted(self.fleet.show('sh clock'), key=lambda r: r.host)
+
+        self.assertEqual([r.host for r in results], ['n9k1', 'n9k2'])
+        for result in results:
+            self.assertTrue(result.ok)
+            self.assertEqual(result.result, {'simple_time': '18:06:31.021 UTC Tue Mar 22 2016\n'})
+            self.assertTrue(result.elapsed >= 0)
+
+    def test_config_list(self):
+        results = list(self.fleet.config_list(['int ethernet 1/1', 'no shutdown']))
+
+        self.assertEqual([r.result for r in results], [[None, None], [None, None]])
+
+    def test_operation_runs_without_iterating(self):
+        ran = []
+        done = threading.Event()
+
+        def record(device):
+            ran.append(device.host)
+            if len(ran) == 2:
+                done.set()
+
+        self.fleet.run(record)
+
+        self.assertTrue(done.wait(5))
+        self.assertEqual(sorted(ran), ['n9k1', 'n9k2'])
+
+    def test_errors_are_collected(self):
+        def fail_on_n9k2(device):
+            if device.host == 'n9k2':
+                raise CLIError('sh clock', 'Invalid command.')
+            return device.show('sh clock')
+
+        results = dict((r.host, r) for r in self.fleet.run(fail_on_n9k2))
+
+        self.assertTrue(results['n9k1'].ok)
+        self.assertFalse(results['n9k2'].ok)
+        self.assertIsInstance(results['n9k2'].error, CLIError)
+
+    def test_unexpected_errors_are_collected(self):
+        def fail_on_n9k2(device):
+            if device.host == 'n9k2':
+                raise KeyError('body')
+            return device.show('sh clock')
+
+        results = dict((r.host, r) for r in self.fleet.run(fail_on_n9k2))
+
+        self.assertTrue(results['n9k1'].ok)
+        self.assertIsInstance(results['n9k2'].error, KeyError)
+
+    def test_max_concurrency(self):
+        lock = threading.Lock()
+        running = [0, 0]
+
+        def operation(device):
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+
+        results = list(self.fleet._run(operation, (), {}, max_concurrency=1))
+
+        self.assertTrue(all(r.ok for r in results))
+        self.assertEqual(running[1], 1)
+
+    def test_facts(self):
+        for result in self.fleet.facts():
+            self.assertEqual(result.result['hostname'], 'N9K2')
+
+    def test_file_copy(self):
+        mock_fc = mock.Mock()
+        with mock.patch.dict(FEATURES, file_copy=mock_fc):
+            progress = mock.Mock()
+            results = list(self.fleet.file_copy('/path/to/image.bin', resume=True, progress=progress, buffer_size=1024))
+
+            self.assertTrue(all(r.ok for r in results))
+            self.assertEqual(mock_fc.call_count, 2)
+            mock_fc.return_value.transfer_file.assert_called_with(resume=True)
+
+            device_progress = mock_fc.call_args[1]['progress']
+            device_progress('image.bin', 10, 5)
+            progress.assert_called_with(mock_fc.call_args[0][0].host, 'image.bin', 10, 5)
+
+    def test_sync_files(self):
+        mock_fs = mock.Mock()
+        with mock.patch.dict(FEATURES, file_sync=mock_fs):
+            results = list(self.fleet.sync_files('/path/to/images', file_system='usb1:', buffer_size=1024))
+
+            self.assertTrue(all(r.ok for r in results))
+            self.assertEqual(mock_fs.call_count, 2)
+            self.assertEqual(mock_fs.call_args[0][1], '/path/to/images')
+            self.assertEqual(mock_fs.call_args[1]['file_system'], 'usb1:')
+            mock_fs.return_value.sync.assert_called_with()
+
+    def test_collect_files(self):
+        mock_fc = mock.Mock()
+        with mock.patch.dict(FEATURES, file_collector=mock_fc):
+            progress = mock.Mock()
+            results = list(self.fleet.collect_files(['tech.txt'], directory='/tmp/collect', max_concurrency=1,
+                                                    progress=progress))
+
+            self.assertTrue(all(r.ok for r in results))
+            self.assertEqual(sorted(call[1]['directory'] for call in mock_fc.call_args_list),
+                             sorted(os.path.join('/tmp/collect', device.host) for device in self.fleet.devices))
+            mock_fc.return_value.collect.assert_called_with()
+
+            device_progress = mock_fc.call_args[1]['progress']
+            device_progress('tech.txt', 10, 5)
+            progress.assert_called_with(mock_fc.call_args[0][0].host, 'tech.txt', 10, 5)
+
+    def test_close(self):
+        with self.fleet:
+            pass
+
+        self.rpc.return_value.close.assert_called_with()
+
+    def test_result_repr(self):
+        self.assertEqual(repr(FleetResult('n9k1', elapsed=1)), '<FleetResult n9k1 ok 1.000s>')
@@ -0,0 +1,150 @@
+import json
+import os
+import unittest
+import mock
+
+import requests
+
+from pynxos.device import Device
+from pynxos.errors import CLIError, InstallError
+from pynxos.fleet import Fleet
+from pynxos.install import InstallJob
+from pynxos.lib.parsers import parse_install_status
+
+CURRNENT_DIR = os.path.dirname(os.path.realpath(__file__))
+
+
+def raw_output(filename):
+    with open(os.path.join(CURRNENT_DIR, 'mocks', 'send_request_raw', filename)) as f:
+        return json.load(f)[0]['result']['msg']
+
+
+IN_PROGRESS = ('Verifying image bootflash:/nxos.7.0.3.I2.1.bin for boot variable "nxos".\n -- SUCCESS\n'
+               'Verifying image type.\n')
+RELOADING = IN_PROGRESS + (' -- SUCCESS\nSwitch will be reloaded for disruptive upgrade.\n'
+                           'Finishing the upgrade, switch will reboot in 10 seconds.\n')
+FAILED = IN_PROGRESS + ' -- FAIL. Return code 0x4045001F (image verification failed).\n'
+
+
+class ParseInstallStatusTestCase(unittest.TestCase):
+
+    def test_finished_disruptive(self):
+        status = parse_install_status(raw_output('show_install_all_status.json'))
+
+        self.assertEqual(status.state, 'success')
+        self.assertTrue(status.finished)
+        self.assertTrue(status.disruptive)
+        self.assertEqual(status.steps[1], ('Verifying image type.', 'SUCCESS'))
+        self.assertEqual(status.compatibility, [dict(module='1', bootable='yes', impact='disruptive',
+                                                     install_type='reset', reason='Reset due to single supervisor')])
+        self.assertEqual(status.upgrades[0], dict(module='1', image='nxos', running_version='6.1(2)I3(1)',
+                                                  new_version='7.0(3)I2(1)', upgrade_required='yes'))
+
+    def test_finished_non_disruptive(self):
+        status = parse_install_status(raw_output('show_install_all_status_kick.json'))
+
+        self.assertEqual(status.state, 'success')
+        self.assertFalse(status.disruptive)
+        self.assertEqual(status.message, 'Install has been successful.')
+
+    def test_running_states(self):
+        self.assertEqual(parse_install_status(IN_PROGRESS).state, 'in_progress')
+        self.assertEqual(parse_install_status(RELOADING).state, 'reloading')
+        self.assertEqual(parse_install_status(FAILED).state, 'failed')
+
+
+class InstallJobTestCase(unittest.TestCase):
+
+    @mock.patch('pynxos.device.RPCClient')
+    def setUp(self, mock_rpc):
+        self.device = Device('host', 'user', 'pass')
+        self.statuses = []
+
+        def show(command, raw_text=False, use_cache=True, timeout=None):
+            if command == 'show install all status':
+                status = self.statuses.pop(0)
+                if isinstance(status, Exception):
+                    raise status
+                return status
+            if command.startswith('install all'):
+                raise requests.exceptions.ReadTimeout()
+
+        patcher = mock.patch.object(Device, 'show', side_effect=show)
+        self.show = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = mock.patch('pynxos.install.time.sleep')
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_start(self):
+        self.statuses = [raw_output('show_install_all_status_kick.json')]
+
+        job = self.device.start_install('nxos.bin')
+
+        self.assertIsInstance(job, InstallJob)
+        self.show.assert_any_call('terminal dont-ask')
+        self.show.assert_called_with('install all nxos nxos.bin', raw_text=True, timeout=10)
+
+    def test_start_rejected(self):
+        self.statuses = [raw_output('show_install_all_status_kick.json')]
+        self.show.side_effect = [self.statuses[0], None, CLIError('install all nxos nxos.bin', 'Invalid image')]
+
+        with self.assertRaises(CLIError):
+            self.device.start_install('nxos.bin')
+
+    def test_wait_disruptive(self):
+        previous = raw_output('show_install_all_status_kick.json')
+        self.statuses = [previous, previous, IN_PROGRESS, RELOADING, requests.exceptions.ConnectionError(),
+                         raw_output('show_install_all_status.json')]
+        progress = mock.Mock()
+
+        result = self.device.start_install('nxos.bin').wait(interval=5, progress=progress)
+
+        self.assertTrue(result.success)
+        self.assertEqual([c[0][0].state for c in progress.call_args_list],
+                         ['pending', 'in_progress', 'reloading', 'unreachable', 'success'])
+        self.assertEqual(self.sleep.call_count, 4)
+
+    def test_wait_failed(self):
+        self.statuses = [raw_output('show_install_all_status_kick.json'), FAILED]
+
+        result = self.device.start_install('nxos.bin').wait()
+
+        self.assertFalse(result.success)
+        self.assertIsInstance(result.error, InstallError)
+        self.assertIs(result.error.result, result)
+
+    def test_wait_timeout(self):
+        self.statuses = [raw_output('show_install_all_status_kick.json'), IN_PROGRESS]
+
+        result = self.device.start_install('nxos.bin').wait(timeout=0)
+
+        self.assertFalse(result.success)
+        self.assertIn('timed out', result.error.message)
+
+
+class FleetUpgradeTestCase(unittest.TestCase):
+
+    @mock.patch('pynxos.device.RPCClient')
+    def test_upgrade(self, mock_rpc):
+        fleet = Fleet(['n9k1', 'n9k2', 'n9k3'], username='user', password='pass', max_workers=3)
+        jobs = {}
+
+        def start_install(device, image_name, kickstart=None):
+            job = jobs[device.host] = mock.Mock()
+            if device.host == 'n9k3':
+                job.wait.return_value.error = InstallError(device.host, 'Install has failed.')
+            else:
+                job.wait.return_value.error = None
+            return job
+
+        progress = mock.Mock()
+        with mock.patch.object(Device, 'start_install', autospec=True, side_effect=start_install):
+            results = sorted(fleet.upgrade('nxos.bin', max_concurrency=1, progress=progress), key=lambda r: r.host)
+
+        self.assertEqual([r.ok for r in results], [True, True, False])
+        self.assertIs(results[0].result, jobs['n9k1'].wait.return_value)
+        self.assertIsInstance(results[2].error, InstallError)
+        jobs['n9k1'].wait.call_args[1]['progress']('status')
+        progress.assert_called_with('n9k1', 'status')
@@ -0,0 +1,131 @@
+import unittest
+import mock
+import os
+
+from pynxos.device import Device
+from pynxos.errors import CLIError
+from pynxos.lib.instrumentation import MetricsHook, OpenTelemetryHook, add_hook, remove_hook, span
+from pynxos.lib.rpc_client import RPCClient
+from pynxos.simulator import NXAPISimulator
+
+CURRNENT_DIR = os.path.dirname(os.path.realpath(__file__))
+MOCKS_DIR = os.path.join(CURRNENT_DIR, 'mocks')
+
+
+class InstrumentationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.spans = []
+        add_hook(self.spans.append)
+
+    def tearDown(self):
+        remove_hook(self.spans.append)
+
+    def test_noop_when_disabled(self):
+        remove_hook(self.spans.append)
+
+        with span('test', host='h') as s:
+            s.set('key', 'value')
+
+        self.assertFalse(s.recording)
+        self.assertEqual(self.spans, [])
+
+    def test_span(self):
+        with self.assertRaises(ValueError):
+            with span('test', host='h') as s:
+                s.set('key', 'value')
+                raise ValueError
+
+        self.assertEqual(self.spans, [s])
+        self.assertEqual(s.attributes, {'host': 'h', 'key': 'value'})
+        self.assertIsInstance(s.error, ValueError)
+        self.assertTrue(s.duration >= 0)
+
+    def test_device_spans(self):
+        metrics = MetricsHook()
+        add_hook(metrics)
+        try:
+            with NXAPISimulator(MOCKS_DIR) as simulator:
+                with Device('127.0.0.1', 'user', 'pass', port=simulator.port) as device:
+                    device.get_facts(fields=['interfaces'])
+                    with self.assertRaises(CLIError):
+                        device.show('show nothing')
+        finally:
+            remove_hook(metrics)
+
+        names = [s.name for s in self.spans]
+        self.assertEqual(names, ['rpc.send_request', 'device.cli_command', 'converters.converted_list_from_table',
+                                 'rpc.send_request', 'device.cli_command'])
+
+        rpc_span = self.spans[0]
+        self.assertEqual(rpc_span.attributes['host'], '127.0.0.1')
+        self.assertEqual(rpc_span.attributes['commands'], 1)
+        self.assertTrue(rpc_span.attributes['bytes_received'] > rpc_span.attributes['bytes_sent'] > 0)
+        for phase in ['encode_time', 'request_time', 'decode_time']:
+            self.assertTrue(rpc_span.attributes[phase] >= 0)
+
+        self.assertEqual(self.spans[2].attributes['rows'], 74)
+
+        host_metrics = metrics.metrics['127.0.0.1']
+        self.assertEqual(host_metrics['rpc.send_request']['count'], 2)
+        self.assertEqual(host_metrics['device.cli_command']['count'], 2)
+        self.assertEqual(host_metrics['device.cli_command']['errors'], 1)
+        self.assertEqual(host_metrics['converters.converted_list_from_table']['count'], 1)
+        self.assertNotIn(None, metrics.metrics)
+
+    def test_failing_hook_is_ignored(self):
+        def failing_hook(span):
+            raise RuntimeError('metrics backend down')
+
+        add_hook(failing_hook)
+        try:
+            with self.assertRaises(ValueError):
+                with span('test', host='h'):
+                    raise ValueError
+        finally:
+            remove_hook(failing_hook)
+
+        self.assertEqual(len(self.spans), 1)
+        self.assertIsInstance(self.spans[0].error, ValueError)
+
+    @mock.patch('pynxos.lib.instrumentation.time')
+    def test_duration_ignores_wall_clock(self, mock_time):
+        mock_time.time.side_effect = [1000.0]
+        with mock.patch('pynxos.lib.instrumentation._monotonic', side_effect=[5.0, 5.25]):
+            with span('test', host='h') as s:
+                pass
+
+        self.assertEqual(s.start, 1000.0)
+        self.assertEqual(s.duration, 0.25)
+
+    @mock.patch('pynxos.lib.instrumentation.time')
+    def test_rpc_phases_ignore_wall_clock(self, mock_time):
+        mock_time.time.side_effect = [1000.0]
+        rpc = RPCClient('host', 'user', 'pass')
+        response = mock.Mock(content=b'{"jsonrpc": "2.0", "result": null, "id": 1}', status_code=200)
+        response.elapsed.total_seconds.return_value = 1.0
+
+        with mock.patch.object(rpc.session, 'post', return_value=response):
+            with mock.patch('pynxos.lib.instrumentation._monotonic', side_effect=[5.0, 5.5, 6.0, 8.0, 8.25, 9.0]):
+                rpc.send_request(['show version'])
+
+        rpc_span = self.spans[0]
+        self.assertEqual(rpc_span.attributes['encode_time'], 0.5)
+        self.assertEqual(rpc_span.attributes['request_time'], 2.0)
+        self.assertEqual(rpc_span.attributes['decode_time'], 0.25)
+        self.assertEqual(rpc_span.duration, 4.0)
+
+    def test_opentelemetry_hook(self):
+        tracer = mock.Mock()
+        hook = OpenTelemetryHook(tracer)
+        add_hook(hook)
+        try:
+            with span('test', host='h', data=[1]):
+                pass
+        finally:
+            remove_hook(hook)
+
+        args, kwargs = tracer.start_span.call_args
+        self.assertEqual(args, ('test',))
+        self.assertEqual(kwargs['attributes'], {'host': 'h'})
+        tracer.start_span.return_value.end.assert_called_with(end_time=mock.ANY)
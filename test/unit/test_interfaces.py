@@ -0,0 +1,151 @@
+import unittest
+import mock
+
+from mocks import send_request
+
+from pynxos.device import Device
+from pynxos.errors import CLIError
+from pynxos.features.interfaces import Interfaces, compress_interface_names
+
+
+COUNTERS_BODY = {
+    'TABLE_rx_counters': {
+        'ROW_rx_counters': [
+            {'interface_rx': 'Ethernet1/1', 'eth_inbytes': '100'},
+            {'interface_rx': 'Ethernet1/2', 'eth_inbytes': '200'},
+        ]
+    },
+    'TABLE_tx_counters': {
+        'ROW_tx_counters': [
+            {'interface_tx': 'Ethernet1/1', 'eth_outbytes': '300'},
+            {'interface_tx': 'Ethernet1/2', 'eth_outbytes': '400'},
+        ]
+    },
+}
+
+
+class CompressInterfaceNamesTestCase(unittest.TestCase):
+
+    def test_compress(self):
+        names = ['Ethernet1/1', 'Ethernet1/2', 'Ethernet1/3', 'Ethernet1/7', 'Ethernet2/1', 'mgmt0', 'port-channel']
+        self.assertEqual(compress_interface_names(names), 'Ethernet1/1-3,Ethernet1/7,Ethernet2/1,mgmt0,port-channel')
+
+
+class InterfacesTestCase(unittest.TestCase):
+
+    @mock.patch('pynxos.device.Device', autospec=True)
+    def setUp(self, mock_device):
+        self.device = mock_device
+        self.device.show.side_effect = lambda command: send_request(['show interface status'])[0]['result']['body']
+        self.interfaces = Interfaces(self.device)
+
+    def test_get_index(self):
+        index = self.interfaces.get_index()
+
+        self.assertEqual(index['mgmt0']['description'], 'out of band mgmt interface')
+        self.assertEqual(index['Ethernet1/1']['interface'], 'Ethernet1/1')
+        self.interfaces.get_index()
+        self.device.show.assert_called_once_with('show interface status')
+
+    def test_get_targeted(self):
+        self.device.show.side_effect = lambda command: {
+            'TABLE_interface': {'ROW_interface': {'interface': 'Ethernet1/1', 'state': 'connected'}}}
+
+        interface = self.interfaces.get('Ethernet1/1')
+
+        self.device.show.assert_called_with('show interface Ethernet1/1 status')
+        self.assertEqual(interface, {'interface': 'Ethernet1/1', 'state': 'connected'})
+
+    def test_get_uses_index(self):
+        self.interfaces.get_index()
+
+        self.assertEqual(self.interfaces.get('Ethernet1/2')['interface'], 'Ethernet1/2')
+        self.assertEqual(self.interfaces.get('Ethernet9/9'), {})
+        self.assertEqual(self.device.show.call_count, 1)
+
+    def test_get_missing(self):
+        self.device.show.side_effect = CLIError('show interface Ethernet9/9 status', 'Invalid range')
+
+        self.assertEqual(self.interfaces.get('Ethernet9/9'), {})
+
+    def test_invalidate_clears_index(self):
+        self.interfaces.get_index()
+        self.interfaces.invalidate()
+        self.interfaces.get_index()
+
+        self.assertEqual(self.device.show.call_count, 2)
+
+    @mock.patch('pynxos.lib.instrumentation._monotonic')
+    def test_index_expires(self, mock_monotonic):
+        mock_monotonic.return_value = 100.0
+        self.interfaces.get_index()
+
+        mock_monotonic.return_value = 129.0
+        self.interfaces.get('Ethernet1/1')
+        self.assertEqual(self.device.show.call_count, 1)
+
+        mock_monotonic.return_value = 131.0
+        self.interfaces.get('Ethernet1/1')
+        self.device.show.assert_called_with('show interface Ethernet1/1 status')
+
+        self.interfaces.get_index()
+        self.assertEqual(self.device.show.call_count, 3)
+
+    def test_refresh(self):
+        self.interfaces.get_index()
+        self.interfaces.get('Ethernet1/1', refresh=True)
+        self.device.show.assert_called_with('show interface Ethernet1/1 status')
+
+        self.interfaces.get_index(refresh=True)
+        self.assertEqual(self.device.show.call_count, 3)
+
+    def test_index_without_ttl(self):
+        self.interfaces.index_ttl = None
+        self.interfaces.get_index()
+
+        with mock.patch('pynxos.lib.instrumentation._monotonic', return_value=1e9):
+            self.interfaces.get_index()
+
+        self.assertEqual(self.device.show.call_count, 1)
+
+    def test_query_batches_views(self):
+        status_body = {'TABLE_interface': {'ROW_interface': [
+            {'interface': 'Ethernet1/1', 'state': 'connected', 'name': 'uplink'},
+            {'interface': 'Ethernet1/2', 'state': 'notconnect'},
+        ]}}
+        self.device._show_outputs.return_value = [status_body, COUNTERS_BODY]
+
+        result = self.interfaces.query(['Ethernet1/1', 'Ethernet1/2'], views=['status', 'counters'])
+
+        self.device._show_outputs.assert_called_once_with(
+            ['show interface Ethernet1/1-2 status', 'show interface Ethernet1/1-2 counters'])
+        self.assertEqual(result['Ethernet1/1'], {
+            'interface': 'Ethernet1/1', 'state': 'connected', 'description': 'uplink',
+            'eth_inbytes': '100', 'eth_outbytes': '300'})
+        self.assertEqual(result['Ethernet1/2']['eth_outbytes'], '400')
+
+    @mock.patch('pynxos.device.RPCClient')
+    def test_query_empty_view_keeps_positions(self, mock_rpc):
+        status_body = {'TABLE_interface': {'ROW_interface': [
+            {'interface': 'Ethernet1/1', 'state': 'connected'},
+        ]}}
+        mock_rpc.return_value.send_request.return_value = [
+            {'command': 'show interface Ethernet1/1 status', 'result': {'body': status_body}},
+            {'command': 'show interface Ethernet1/1 brief', 'result': None},
+            {'command': 'show interface Ethernet1/1 counters', 'result': {'body': COUNTERS_BODY}},
+        ]
+        interfaces = Interfaces(Device('host', 'user', 'pass'))
+
+        result = interfaces.query(['Ethernet1/1'], views=['status', 'brief', 'counters'])
+
+        self.assertEqual(result['Ethernet1/1'], {
+            'interface': 'Ethernet1/1', 'state': 'connected', 'eth_inbytes': '100', 'eth_outbytes': '300'})
+        self.assertEqual(sorted(result), ['Ethernet1/1', 'Ethernet1/2'])
+
+    def test_get_counters(self):
+        self.device._show_outputs.return_value = [COUNTERS_BODY]
+
+        counters = self.interfaces.get_counters()
+
+        self.device._show_outputs.assert_called_once_with(['show interface counters'])
+        self.assertEqual(sorted(counters), ['Ethernet1/1', 'Ethernet1/2'])
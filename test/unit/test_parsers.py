@@ -0,0 +1,93 @@
+import json
+import os
+import unittest
+
+from pynxos.errors import ParserNotFoundError
+from pynxos.lib import parsers
+from pynxos.lib.parsers import InstallStatus, get_parser, parse, parse_dir, parse_md5sum, parse_show_boot
+
+CURRNENT_DIR = os.path.dirname(os.path.realpath(__file__))
+
+
+def raw_output(filename):
+    with open(os.path.join(CURRNENT_DIR, 'mocks', 'send_request_raw', filename)) as f:
+        return json.load(f)[0]['result']['msg']
+
+
+DIR_OUTPUT = ('       4096    Mar 22 20:37:35 2016  scripts/\n'
+              '          5    Mar 23 00:48:15 2016  smallfile\n'
+              '  351669248    Mar 22 20:12:42 2016  nxos.7.0.3.I2.1.bin\n'
+              '\n'
+              'Usage for bootflash://sup-local\n'
+              ' 2425630720 bytes used\n'
+              '19439788032 bytes free\n'
+              '21865418752 bytes total\n')
+
+
+class ParsersTestCase(unittest.TestCase):
+
+    def test_parse_show_boot(self):
+        boot_variables = parse_show_boot(raw_output('show_boot.json'))
+
+        self.assertEqual(boot_variables.current, {'sys': 'nxos.7.0.3.I2.1.bin'})
+        self.assertEqual(boot_variables.next_reload, {'sys': 'nxos.7.0.3.I2.1.bin'})
+
+    def test_parse_show_boot_kickstart(self):
+        boot_variables = parse_show_boot(raw_output('show_boot_kick.json'))
+
+        self.assertEqual(boot_variables.next_reload, {'sys': 'n5000-uk9.7.2.1.N1.1.bin',
+                                                      'kick': 'n5000-uk9-kickstart.7.2.1.N1.1.bin'})
+
+    def test_parse_dir(self):
+        listing = parse_dir(DIR_OUTPUT)
+
+        self.assertEqual(sorted(listing.entries), ['nxos.7.0.3.I2.1.bin', 'scripts/', 'smallfile'])
+        self.assertIn('smallfile', listing)
+        self.assertEqual(listing.entries['nxos.7.0.3.I2.1.bin'].size, 351669248)
+        self.assertEqual(listing.entries['smallfile'].modified, 'Mar 23 00:48:15 2016')
+        self.assertTrue(listing.entries['scripts/'].is_dir)
+        self.assertEqual(listing.bytes_used, 2425630720)
+        self.assertEqual(listing.bytes_free, 19439788032)
+        self.assertEqual(listing.bytes_total, 21865418752)
+        self.assertFalse(listing.missing)
+
+    def test_parse_dir_missing(self):
+        listing = parse_dir('No such file or directory\n')
+
+        self.assertTrue(listing.missing)
+        self.assertEqual(listing.entries, {})
+        self.assertIsNone(listing.bytes_free)
+
+    def test_parse_md5sum(self):
+        self.assertEqual(parse_md5sum('B211E79FBAEDE5859ED2192B0FC5F1D5\n'), 'b211e79fbaede5859ed2192b0fc5f1d5')
+        self.assertEqual(parse_md5sum({'file_content_md5sum': 'b211e79fbaede5859ed2192b0fc5f1d5\n'}),
+                         'b211e79fbaede5859ed2192b0fc5f1d5')
+        self.assertIsNone(parse_md5sum(''))
+
+    def test_parse_dispatches_on_command(self):
+        self.assertIs(get_parser('show boot'), parse_show_boot)
+        self.assertIs(get_parser('dir bootflash:'), parse_dir)
+        self.assertIs(get_parser('dir'), parse_dir)
+        self.assertIs(get_parser('show file bootflash:nxos.bin md5sum'), parse_md5sum)
+        self.assertIsInstance(parse('show install all status', raw_output('show_install_all_status.json')),
+                              InstallStatus)
+
+    def test_get_parser_not_found(self):
+        with self.assertRaises(ParserNotFoundError):
+            get_parser('show boot detail')
+
+    def test_register_parser_overrides(self):
+        def parse_upper(text):
+            return text.upper()
+
+        parsers.register_parser(r'show boot', parse_upper)
+        try:
+            self.assertEqual(parse('show boot', 'abc'), 'ABC')
+        finally:
+            parsers._parsers.remove((parsers._parsers[0][0], parse_upper))
+
+        self.assertIs(get_parser('show boot'), parse_show_boot)
+
+
+if __name__ == "__main__":
+    unittest.main()
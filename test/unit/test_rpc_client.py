@@ -0,0 +1,150 @@
+import threading
+import time
+import unittest
+import mock
+import json
+
+from pynxos.lib.rpc_client import RPCClient, chunk_commands
+from pynxos.errors import NXOSError
+from pynxos.lib.json_codec import default_codec, get_codec
+
+
+class RPCClientTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.rpc = RPCClient('host', 'user', 'pass')
+
+    def test_init(self):
+        self.assertEqual(self.rpc.url, 'http://host:80/ins')
+        self.assertEqual(RPCClient('host', 'user', 'pass', transport='https').url, 'https://host:443/ins')
+
+    def test_invalid_transport(self):
+        with self.assertRaises(NXOSError):
+            RPCClient('host', 'user', 'pass', transport='ftp')
+
+    def test_session_is_reused(self):
+        session = self.rpc.session
+
+        self.assertIs(self.rpc.session, session)
+        self.assertEqual(session.auth.username, 'user')
+        self.assertEqual(session.headers['content-type'], 'application/json-rpc')
+
+    def test_session_created_once_across_threads(self):
+        created = []
+        start = threading.Event()
+
+        def slow_session():
+            created.append(1)
+            time.sleep(0.05)
+            return mock.Mock()
+
+        def get_session():
+            start.wait(5)
+            return self.rpc.session
+
+        with mock.patch('pynxos.lib.rpc_client.requests.Session', side_effect=slow_session):
+            threads = [threading.Thread(target=get_session) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            start.set()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(created), 1)
+
+    def test_session_pool_config(self):
+        rpc = RPCClient('host', 'user', 'pass', pool_maxsize=4, max_retries=3, keep_alive=False)
+        adapter = rpc.session.get_adapter('http://host:80/ins')
+
+        self.assertEqual(adapter._pool_maxsize, 4)
+        self.assertEqual(adapter.max_retries.total, 3)
+        self.assertEqual(rpc.session.headers['connection'], 'close')
+
+    def test_codec(self):
+        self.assertIs(self.rpc.codec, default_codec)
+        self.assertEqual(RPCClient('host', 'user', 'pass', codec='json').codec.name, 'json')
+
+        with self.assertRaises(NXOSError):
+            RPCClient('host', 'user', 'pass', codec='yaml')
+
+    def test_close(self):
+        session = self.rpc.session
+        with mock.patch.object(session, 'close') as mock_close:
+            self.rpc.close()
+            mock_close.assert_called_with()
+
+        self.assertIsNot(self.rpc.session, session)
+
+    def test_send_request(self):
+        response = mock.Mock(content=json.dumps({'jsonrpc': '2.0', 'result': None, 'id': 1}).encode('utf-8'))
+        with mock.patch.object(self.rpc.session, 'post', return_value=response) as mock_post:
+            result = self.rpc.send_request(['int ethernet 1/1'])
+
+        self.assertEqual(result, [{'jsonrpc': '2.0', 'result': None, 'id': 1, 'command': 'int ethernet 1/1'}])
+        args, kwargs = mock_post.call_args
+        self.assertEqual(args, ('http://host:80/ins',))
+        self.assertEqual(kwargs['timeout'], 30)
+        self.assertEqual(json.loads(kwargs['data'])[0]['params'], {'cmd': 'int ethernet 1/1', 'version': 1})
+
+
+class ChunkCommandsTestCase(unittest.TestCase):
+
+    def test_no_limits(self):
+        commands = ['a', 'b', 'c']
+        self.assertEqual(chunk_commands(commands), [commands])
+
+    def test_empty(self):
+        self.assertEqual(chunk_commands([], max_commands=2), [[]])
+
+    def test_max_commands(self):
+        self.assertEqual(chunk_commands(['a', 'b', 'c'], max_commands=2), [['a', 'b'], ['c']])
+
+    def test_max_bytes(self):
+        rpc = RPCClient('host', 'user', 'pass')
+        commands = ['vlan %d' % i for i in range(50)]
+        chunks = chunk_commands(commands, max_bytes=1000)
+
+        self.assertTrue(len(chunks) > 1)
+        self.assertEqual(sum(chunks, []), commands)
+        for chunk in chunks:
+            self.assertTrue(len(json.dumps(rpc._build_payload(chunk, 'cli'))) <= 1000)
+
+    def test_oversized_command(self):
+        self.assertEqual(chunk_commands(['a' * 100, 'b'], max_bytes=50), [['a' * 100], ['b']])
+
+    def test_mode_blocks_are_not_split(self):
+        commands = ['interface e1/1', 'description a', 'interface e1/2', 'description b']
+
+        self.assertEqual(chunk_commands(commands, max_commands=3),
+                         [['interface e1/1', 'description a'], ['interface e1/2', 'description b']])
+
+    def test_mode_block_max_bytes(self):
+        commands = ['vlan %d' % i if i % 2 == 0 else 'name vlan%d' % (i - 1) for i in range(40)]
+        chunks = chunk_commands(commands, max_bytes=1000)
+
+        self.assertTrue(len(chunks) > 1)
+        self.assertEqual(sum(chunks, []), commands)
+        for chunk in chunks:
+            self.assertTrue(chunk[0].startswith('vlan '))
+
+    def test_oversized_mode_block(self):
+        commands = ['hostname x', 'interface e1/1', 'description a', 'mtu 9000', 'end', 'hostname y']
+
+        self.assertEqual(chunk_commands(commands, max_commands=2),
+                         [['hostname x'], ['interface e1/1', 'description a', 'mtu 9000', 'end'], ['hostname y']])
+
+
+class JSONCodecTestCase(unittest.TestCase):
+
+    def test_codecs_round_trip(self):
+        payload = [{'jsonrpc': '2.0', 'method': 'cli', 'params': {'cmd': 'show version', 'version': 1}, 'id': 1}]
+        for name in ['orjson', 'ujson', 'simdjson', 'json']:
+            try:
+                codec = get_codec(name)
+            except NXOSError:
+                continue
+
+            encoded = codec.dumps(payload)
+            if not isinstance(encoded, bytes):
+                encoded = encoded.encode('utf-8')
+            self.assertEqual(codec.loads(encoded), payload)
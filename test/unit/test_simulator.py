@@ -0,0 +1,64 @@
+import unittest
+import os
+
+from pynxos.device import Device
+from pynxos.errors import CLIError
+from pynxos.simulator import NXAPISimulator
+
+CURRNENT_DIR = os.path.dirname(os.path.realpath(__file__))
+MOCKS_DIR = os.path.join(CURRNENT_DIR, 'mocks')
+
+
+class NXAPISimulatorTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.simulator = NXAPISimulator(MOCKS_DIR)
+        self.simulator.start()
+        self.device = Device('127.0.0.1', 'user', 'pass', port=self.simulator.port)
+
+    def tearDown(self):
+        self.device.close()
+        self.simulator.stop()
+
+    def test_show(self):
+        result = self.device.show('sh clock')
+
+        self.assertEqual(result, {'simple_time': '18:06:31.021 UTC Tue Mar 22 2016\n'})
+
+    def test_show_list_raw_text(self):
+        result = self.device.show_list(['sh clock', 'sh hostname'], raw_text=True)
+
+        self.assertEqual(result, ['18:55:38.720 UTC Tue Mar 22 2016\n', 'N9K2.ntc.com \n'])
+
+    def test_combined_from_single_fixtures(self):
+        result = self.device.show_list(['sh clock', 'show version'])
+
+        self.assertEqual(result[1]['host_name'], 'N9K2')
+
+    def test_fixture_error(self):
+        self.assertFalse(self.device.save(filename='abc'))
+
+    def test_unknown_command(self):
+        with self.assertRaises(CLIError):
+            self.device.show('show nothing')
+
+    def test_connection_reuse(self):
+        for _ in range(5):
+            self.device.show('sh clock')
+
+        self.assertEqual(self.simulator.stats['requests'], 5)
+        self.assertEqual(self.simulator.stats['connections'], 1)
+
+    def test_error_rate(self):
+        self.simulator.error_rate = 1
+
+        with self.assertRaises(CLIError):
+            self.device.show('sh clock')
+
+    def test_size_multiplier(self):
+        rows = len(self.device.facts['vlans'])
+        simulator = NXAPISimulator(MOCKS_DIR, size_multiplier=3)
+        with simulator:
+            device = Device('127.0.0.1', 'user', 'pass', port=simulator.port)
+            self.assertEqual(len(device.facts['vlans']), rows * 3)
+            device.close()
@@ -0,0 +1,76 @@
+import unittest
+import mock
+
+from mocks import send_request
+
+from pynxos.features.vlans import Vlans, VlanNotInRangeError, compress_vlan_ids, expand_vlan_ids
+
+
+class VlanRangeTestCase(unittest.TestCase):
+
+    def test_expand(self):
+        self.assertEqual(expand_vlan_ids('10-12,20'), [10, 11, 12, 20])
+        self.assertEqual(expand_vlan_ids(5), [5])
+        self.assertEqual(expand_vlan_ids([3, '1-2', 3]), [1, 2, 3])
+
+    def test_compress(self):
+        self.assertEqual(compress_vlan_ids(list(range(10, 201)) + [300]), '10-200,300')
+        self.assertEqual(compress_vlan_ids([5, 3, 4, 7]), '3-5,7')
+
+    def test_out_of_range(self):
+        with self.assertRaises(VlanNotInRangeError):
+            expand_vlan_ids('1-4000')
+
+
+class VlansTestCase(unittest.TestCase):
+
+    @mock.patch('pynxos.device.Device', autospec=True)
+    def setUp(self, mock_device):
+        self.device = mock_device
+        self.device.host = 'host'
+        self.device.show.side_effect = lambda command: send_request([command])[0]['result']['body']
+        self.vlans = Vlans(self.device)
+
+    def test_get_list(self):
+        self.assertEqual(self.vlans.get_list()[:4], ['1', '2', '3', '4'])
+        self.device.show.assert_called_with('show vlan')
+
+    def test_config(self):
+        self.vlans.config('10-20,30', name='users')
+
+        self.device.config_list.assert_called_with(['vlan 10-20,30', 'name users'])
+
+    def test_remove(self):
+        self.vlans.remove([10, 11, 12])
+
+        self.device.config.assert_called_with('no vlan 10-12')
+
+    def test_set_name(self):
+        self.vlans.set_name(10, default=True)
+
+        self.device.config_list.assert_called_with(['vlan 10', 'no name'])
+
+    def test_diff(self):
+        existing_name = self.vlans.get_all()[1]['name']
+        desired = {2: {'name': existing_name}, 3: {'name': 'renamed'}, 500: None, 501: None, 502: {'name': 'new'}}
+
+        commands = self.vlans.diff(desired)
+
+        self.assertEqual(commands, ['vlan 500-501', 'vlan 3', 'name renamed', 'vlan 502', 'name new'])
+
+    def test_diff_purge(self):
+        existing = [int(v) for v in self.vlans.get_list()]
+
+        commands = self.vlans.diff(existing[:5], purge=True)
+
+        self.assertEqual(commands, ['no vlan %s' % compress_vlan_ids(existing[5:])])
+
+    def test_sync_sends_one_request(self):
+        commands = self.vlans.sync(range(2000, 3000))
+
+        self.assertEqual(commands, ['vlan 2000-2999'])
+        self.device.config_list.assert_called_once_with(['vlan 2000-2999'])
+
+    def test_sync_no_changes(self):
+        self.assertEqual(self.vlans.sync('1-2'), [])
+        self.assertFalse(self.device.config_list.called)